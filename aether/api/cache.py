@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def result_key(route: str, body: bytes, profiles: str, day: Optional[str] = None) -> str:
+    """
+    Content address of a scoring response: the route, the request body, the
+    profile registry fingerprint and the as-of day (today, UTC, by default).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in (route, profiles, day or datetime.utcnow().date().isoformat()):
+        h.update(part.encode("utf-8") + b"\0")
+    h.update(body)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of rendered responses with a byte budget and a TTL.
+
+    Values are response bodies, so a hit costs a dict lookup. Entries older
+    than ``ttl`` seconds are dropped on access; the least recently used go
+    first once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20, ttl: float = 3600.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic())
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self.size -= len(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
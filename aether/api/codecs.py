@@ -0,0 +1,95 @@
+"""
+Request/response codecs for the scoring API.
+
+JSON goes through orjson when it is installed; ``application/msgpack``
+bodies and responses are available when msgpack is. Payloads may carry
+their mentions column-wise (``{"source": [...], "authority": [...]}``),
+which the columnar normalization path consumes without building a dict
+per mention.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional codec
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = {MSGPACK, "application/x-msgpack", "application/vnd.msgpack"}
+_JSON_TYPES = {JSON, "application/*", "*/*"}
+
+
+class UnsupportedMediaType(ValueError):
+    """The request body's codec is not available; the API answers 415."""
+
+
+def _media_type(header: Optional[str]) -> str:
+    return (header or "").split(";", 1)[0].strip().lower()
+
+
+def request_codec(content_type: Optional[str]) -> str:
+    # Anything that is not msgpack is read as JSON, as before
+    if _media_type(content_type) not in _MSGPACK_TYPES:
+        return JSON
+    if msgpack is None:
+        raise UnsupportedMediaType("msgpack support is not installed")
+    return MSGPACK
+
+
+def response_codec(accept: Optional[str]) -> str:
+    """The preferred of JSON and msgpack according to an Accept header."""
+    best, best_q = JSON, 0.0
+    for item in (accept or "").split(","):
+        media_type, _, params = item.partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in _MSGPACK_TYPES and msgpack is not None:
+            codec = MSGPACK
+        elif media_type in _JSON_TYPES:
+            codec = JSON
+        else:
+            continue
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+
+def loads(body: bytes, codec: str = JSON) -> Any:
+    if codec == MSGPACK:
+        return msgpack.unpackb(body, raw=False)
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def dumps(value: Any, codec: str = JSON) -> bytes:
+    if codec == MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: orjson rendering, stdlib json as fallback."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content, JSON)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+
+
+def _get_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def get_scoring_executor() -> str:
+    # process | thread | inline (on the event loop, for debugging only)
+    return os.environ.get("AETHER_SCORING_EXECUTOR", "process")
+
+
+def get_scoring_workers() -> int:
+    return max(_get_int("AETHER_SCORING_WORKERS", os.cpu_count() or 1), 1)
+
+
+def get_scoring_queue_size(workers: int) -> int:
+    # Scoring jobs queued or running before new ones get a 503
+    return max(_get_int("AETHER_SCORING_QUEUE", 4 * workers), 1)
+
+
+def get_inline_max_bytes() -> int:
+    # Bodies up to this size are scored on the event loop: cheaper than a
+    # hand-off to the pool, and never stuck behind large jobs
+    return _get_int("AETHER_SCORING_INLINE_BYTES", 16 * 1024)
+
+
+def get_batch_max_brands() -> int:
+    return _get_int("AETHER_BATCH_MAX_BRANDS", 10_000)
+
+
+def get_stream_feed_bytes() -> int:
+    # Body bytes buffered between decode steps of /geo/score:stream
+    return _get_int("AETHER_STREAM_FEED_BYTES", 1 << 20)
+
+
+def get_cache_max_bytes() -> int:
+    # 0 disables the result cache
+    return _get_int("AETHER_CACHE_MAX_BYTES", 64 * 2**20)
+
+
+def get_cache_ttl() -> int:
+    return _get_int("AETHER_CACHE_TTL", 3600)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from . import config
+
+
+class Overloaded(RuntimeError):
+    """Raised when the scoring queue is full; the API answers 503."""
+
+
+class ScoringExecutor:
+    """
+    Runs CPU-bound scoring off the event loop.
+
+    At most ``max_pending`` jobs may be queued or running at once; further
+    submissions fail fast with Overloaded instead of piling up behind a
+    pool that cannot keep up. Small jobs skip the pool altogether. The pool
+    is created on first use.
+    """
+
+    def __init__(
+        self,
+        kind: str = "process",
+        workers: int = 1,
+        max_pending: Optional[int] = None,
+        inline_max_bytes: int = 0,
+    ):
+        if kind not in ("process", "thread", "inline"):
+            raise ValueError(f"unknown scoring executor {kind!r}")
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending or 4 * workers
+        self.inline_max_bytes = inline_max_bytes
+        self.pending = 0
+        self.rejected = 0
+        self._pool: Optional[Executor] = None
+
+    @classmethod
+    def from_env(cls) -> "ScoringExecutor":
+        workers = config.get_scoring_workers()
+        return cls(
+            config.get_scoring_executor(),
+            workers,
+            config.get_scoring_queue_size(workers),
+            config.get_inline_max_bytes(),
+        )
+
+    def _get_pool(self) -> Optional[Executor]:
+        if self._pool is None and self.kind != "inline":
+            pool_cls = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+            self._pool = pool_cls(max_workers=self.workers)
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, size: Optional[int] = None, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)``; jobs of ``size`` <= ``inline_max_bytes`` run inline."""
+        if self.kind == "inline" or (size is not None and size <= self.inline_max_bytes):
+            return fn(*args, **kwargs)
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded(f"{self.pending} scoring jobs pending")
+        # Only touched from the event loop thread, so no lock is needed
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), functools.partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "inline_max_bytes": self.inline_max_bytes,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,75 @@
+"""
+Scoring jobs run by the ScoringExecutor.
+
+Jobs take the raw request body and return the encoded response, so that
+decoding, scoring and encoding all happen in the worker, never on the event
+loop, and only bytes cross the process boundary.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from aether.core.batch import compute_geo_scores_batch
+from aether.core.geo import compute_geo_score
+from . import codecs
+
+
+class BadRequest(ValueError):
+    """Invalid request body; the API answers 400 with the message."""
+
+
+def parse_body(body: bytes, codec: str = codecs.JSON) -> Dict[str, Any]:
+    try:
+        payload = codecs.loads(body, codec) if body else {}
+    except ValueError:
+        raise BadRequest(f"request body must be valid {codec}") from None
+    if not isinstance(payload, dict):
+        raise BadRequest("request body must be an object")
+    return payload
+
+
+def scoring_options(payload: Dict[str, Any], default_as_of: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    The as_of and profile of a request. Without an as_of the request is
+    scored at ``default_as_of`` (None: the current time).
+    """
+    as_of = payload.get("as_of")
+    if as_of is not None:
+        try:
+            as_of = datetime.fromisoformat(as_of)
+        except (TypeError, ValueError):
+            raise BadRequest("as_of must be an ISO 8601 timestamp") from None
+    return {"as_of": as_of or default_as_of, "profile": payload.get("profile")}
+
+
+def score_one(
+    body: bytes, codec: str = codecs.JSON, response: str = codecs.JSON, default_as_of: Optional[datetime] = None
+) -> bytes:
+    payload = parse_body(body, codec)
+    try:
+        result = compute_geo_score(payload.get("data", {}), **scoring_options(payload, default_as_of))
+    except ValueError as e:
+        # Unknown profiles, malformed timestamps or mention columns
+        raise BadRequest(str(e)) from None
+    return codecs.dumps(result, response)
+
+
+def score_batch(
+    body: bytes,
+    max_brands: int,
+    codec: str = codecs.JSON,
+    response: str = codecs.JSON,
+    default_as_of: Optional[datetime] = None,
+) -> bytes:
+    payload = parse_body(body, codec)
+    data = payload.get("data", [])
+    if not isinstance(data, list):
+        raise BadRequest("data must be a list of brand payloads")
+    if len(data) > max_brands:
+        raise BadRequest(f"at most {max_brands} brands per batch")
+    try:
+        results = compute_geo_scores_batch(data, **scoring_options(payload, default_as_of))
+    except ValueError as e:
+        raise BadRequest(str(e)) from None
+    return codecs.dumps({"results": results}, response)
@@ -1,14 +1,135 @@
-from fastapi import FastAPI
-from aether.core.geo import compute_geo_score
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, time
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from aether.core.profiles import ProfileError, get_profile, get_registry
+from aether.core.stream import StreamingScorer
+from . import codecs, config, jobs
+from .cache import ResultCache, result_key
+from .executor import Overloaded, ScoringExecutor
+from .upload import NDJSONDecoder
+
+scoring = ScoringExecutor.from_env()
+cache = ResultCache(config.get_cache_max_bytes(), config.get_cache_ttl())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    scoring.shutdown()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=codecs.ORJSONResponse)
+
+
+async def _score(fn, body, *args):
+    # Decoding, scoring and encoding all run in the executor, off the event loop
+    try:
+        return await scoring.run(fn, body, *args, size=len(body))
+    except Overloaded:
+        raise HTTPException(status_code=503, detail="scoring queue is full", headers={"Retry-After": "1"})
+    except jobs.BadRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip() for tag in header.split(",")}
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _negotiate(request: Request):
+    try:
+        codec = codecs.request_codec(request.headers.get("content-type"))
+    except codecs.UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    return codec, codecs.response_codec(request.headers.get("accept"))
+
+
+def _default_as_of(day=None):
+    # Requests without an as_of are scored at the start of the UTC day, on
+    # every route, so a response stays valid (and cacheable) all day
+    day = day or datetime.utcnow().date()
+    return datetime.combine(day, time.min)
+
+
+async def _cached_score(request: Request, fn, *args):
+    # Same body, codecs, profiles and as-of day => same response, so the key
+    # doubles as a strong ETag and conditional requests never touch the cache
+    codec, response = _negotiate(request)
+    body = await request.body()
+    route = f"{request.url.path} {codec} {response}"
+    day = datetime.utcnow().date()
+    key = result_key(route, body, get_registry().fingerprint(), day.isoformat())
+    headers = {"ETag": f'"{key}"'}
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    content = cache.get(key)
+    headers["X-Cache"] = "miss" if content is None else "hit"
+    if content is None:
+        content = await _score(fn, body, *args, codec, response, _default_as_of(day))
+        cache.put(key, content)
+    return Response(content, media_type=response, headers=headers)
 
-app = FastAPI()
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "scoring": scoring.stats(), "cache": cache.stats()}
 
 @app.post("/geo/score")
-async def geo_score(payload: dict):
-    data = payload.get("data", {})
-    result = compute_geo_score(data)
-    return result
+async def geo_score(request: Request):
+    return await _cached_score(request, jobs.score_one)
+
+@app.post("/geo/score:batch")
+async def geo_score_batch(request: Request):
+    return await _cached_score(request, jobs.score_batch, config.get_batch_max_brands())
+
+@app.post("/geo/score:stream")
+async def geo_score_stream(
+    request: Request,
+    brand: str = "UNKNOWN",
+    as_of: Optional[str] = None,
+    profile: Optional[str] = None,
+):
+    """
+    Score one brand from an NDJSON body, one mention per line, optionally
+    sent with ``Content-Encoding: gzip``. Mentions are folded into running
+    aggregates as the body arrives, so memory does not grow with its size.
+    """
+    try:
+        options = jobs.scoring_options({"as_of": as_of, "profile": profile}, _default_as_of())
+        get_profile(options["profile"])
+    except (jobs.BadRequest, ProfileError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = codecs.response_codec(request.headers.get("accept"))
+    scorer = StreamingScorer(brand, options["as_of"])
+
+    def add(mention):
+        # A malformed field is a 400, as it is for /geo/score
+        try:
+            scorer.add(mention)
+        except (TypeError, ValueError) as e:
+            raise jobs.BadRequest(f"mention {decoder.lines}: {e}") from None
+
+    gzip = request.headers.get("content-encoding", "").lower() == "gzip"
+    decoder = NDJSONDecoder(add, gzip=gzip)
+    buffer = bytearray()
+    try:
+        # Decode in a worker thread a few network chunks at a time
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= config.get_stream_feed_bytes():
+                await asyncio.to_thread(decoder.feed, bytes(buffer))
+                buffer.clear()
+        await asyncio.to_thread(decoder.feed, bytes(buffer))
+        decoder.close()
+        result = await asyncio.to_thread(scorer.score, options["profile"])
+        return Response(codecs.dumps(result, response), media_type=response)
+    except jobs.BadRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Callable, Optional
+
+from .jobs import BadRequest
+
+# Upper bound on inflated bytes produced per decompress() call
+_INFLATE_CHUNK = 1 << 20
+
+
+class NDJSONDecoder:
+    """
+    Incremental decoder for (optionally gzip-compressed) NDJSON.
+
+    ``feed`` accepts body chunks of any size and calls ``sink`` with every
+    complete JSON line; ``lines`` counts them. Only the current partial line
+    and one bounded inflate window are held in memory.
+    """
+
+    def __init__(self, sink: Callable[[Any], None], gzip: bool = False, max_line_bytes: int = 1 << 20):
+        self.sink = sink
+        self.max_line_bytes = max_line_bytes
+        self.lines = 0
+        self._inflate: Optional[Any] = self._new_inflate() if gzip else None
+        self._tail = b""
+
+    @staticmethod
+    def _new_inflate():
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def feed(self, data: bytes) -> None:
+        if self._inflate is None:
+            self._split(data)
+            return
+        while data:
+            try:
+                self._split(self._inflate.decompress(data, _INFLATE_CHUNK))
+            except zlib.error as e:
+                raise BadRequest(f"invalid gzip body: {e}") from None
+            if self._inflate.unconsumed_tail:
+                data = self._inflate.unconsumed_tail
+            elif self._inflate.eof and self._inflate.unused_data:
+                # Concatenated gzip members
+                data = self._inflate.unused_data
+                self._inflate = self._new_inflate()
+            else:
+                data = b""
+
+    def close(self) -> None:
+        if self._inflate is not None:
+            self._split(self._inflate.flush())
+            if not self._inflate.eof:
+                raise BadRequest("truncated gzip body")
+        if self._tail.strip():
+            self._emit(self._tail)
+        self._tail = b""
+
+    def _split(self, data: bytes) -> None:
+        if not data:
+            return
+        lines = (self._tail + data).split(b"\n")
+        self._tail = lines.pop()
+        if len(self._tail) > self.max_line_bytes:
+            raise BadRequest(f"mention {self.lines + 1} exceeds {self.max_line_bytes} bytes")
+        for line in lines:
+            if line.strip():
+                self._emit(line)
+
+    def _emit(self, line: bytes) -> None:
+        self.lines += 1
+        try:
+            value = json.loads(line)
+        except ValueError:
+            raise BadRequest(f"mention {self.lines}: invalid JSON") from None
+        if not isinstance(value, dict):
+            raise BadRequest(f"mention {self.lines}: expected a JSON object")
+        self.sink(value)
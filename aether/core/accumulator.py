@@ -0,0 +1,270 @@
+import math
+from collections import Counter
+from datetime import datetime
+
+from .interning import _hashable
+from .metrics import (
+    DECAY_LAMBDA,
+    presence_from_stats,
+    quality_from_stats,
+    diversity_from_stats,
+)
+from .normalizers import US_PER_DAY, normalize_input, to_epoch_us
+from .profiles import get_profile
+
+# Move the recency anchor forward before exp() can overflow a float64. It
+# only moves forward, so older mentions underflow to 0 (as in batch scoring)
+# instead of overflowing
+_MAX_ANCHOR_DRIFT = 3_000
+
+
+def _xlog2x(c):
+    return c * math.log2(c) if c > 0 else 0.0
+
+
+class CategoryCounter:
+    """
+    Counter that keeps sum(c * log2(c)) up to date, so the Shannon entropy of
+    its distribution is available in O(1) after every add/remove.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+        self._xlogx = 0.0
+
+    def add(self, value, n=1):
+        value = _hashable(value)
+        c = self.counts[value]
+        self._xlogx += _xlog2x(c + n) - _xlog2x(c)
+        self.counts[value] = c + n
+        self.total += n
+
+    def remove(self, value, n=1):
+        value = _hashable(value)
+        c = self.counts[value]
+        if c < n:
+            raise KeyError(value)
+        self._xlogx += _xlog2x(c - n) - _xlog2x(c)
+        if c == n:
+            del self.counts[value]
+        else:
+            self.counts[value] = c - n
+        self.total -= n
+
+    @property
+    def distinct(self):
+        return len(self.counts)
+
+    def entropy(self):
+        if self.total == 0:
+            return 0.0
+        # H = log2(N) - sum(c log2 c) / N, clamped against rounding drift
+        return max(math.log2(self.total) - self._xlogx / self.total, 0.0)
+
+
+class _PhaseSums:
+    """
+    Weights keyed by time of day (microseconds since UTC midnight), with
+    the total after any time of day in O(log) instead of a scan: a Fenwick
+    tree over whole seconds, plus the exact phases inside each second.
+    """
+
+    SLOTS = US_PER_DAY // 1_000_000
+
+    def __init__(self):
+        self.tree = [0.0] * (self.SLOTS + 1)
+        self.total = 0.0
+        self.exact = {}
+
+    def add(self, phase, weight, n):
+        slot = phase // 1_000_000
+        i = slot + 1
+        while i <= self.SLOTS:
+            self.tree[i] += weight
+            i += i & -i
+        self.total += weight
+        phases = self.exact.setdefault(slot, {})
+        w, count = phases.get(phase, (0.0, 0))
+        if count + n:
+            phases[phase] = (w + weight, count + n)
+        else:
+            del phases[phase]
+            if not phases:
+                del self.exact[slot]
+
+    def after(self, phase):
+        """Sum of the weights at times of day strictly after ``phase``."""
+        slot = phase // 1_000_000
+        through, i = 0.0, slot + 1
+        while i:
+            through += self.tree[i]
+            i -= i & -i
+        later = sum(w for q, (w, _) in self.exact.get(slot, {}).items() if q > phase)
+        return self.total - through + later
+
+    def scale(self, factor):
+        self.tree = [w * factor for w in self.tree]
+        self.total *= factor
+        for phases in self.exact.values():
+            for q, (w, n) in phases.items():
+                phases[q] = (w * factor, n)
+
+
+class GeoScoreAccumulator:
+    """
+    Running GEO score state for one brand.
+
+    ``add``/``remove`` update every aggregate in O(1) (O(len(surface_area)) for
+    the surface counters), and ``score`` combines them without touching the
+    mention history. Results match ``compute_geo_score`` over the same mentions
+    within float tolerance.
+
+    Recency is tracked in whole days, like the full recompute: a mention
+    ages ``floor((as_of - last_seen) / day)`` days. Mentions are summed on
+    the UTC day of their ``last_seen``, and the ones seen later in the day
+    than ``as_of``'s time of day, which count one day younger, are looked
+    up by time of day when scoring, so results are exact for any ``as_of``.
+    """
+
+    def __init__(self, brand="UNKNOWN", mentions=()):
+        self.brand = brand
+        self.count = 0
+        self.accuracy = 0.0
+        self.authority = 0.0
+        self.completeness = 0.0
+        self.sources = CategoryCounter()
+        self.surfaces = CategoryCounter()
+        self.topics = CategoryCounter()
+        self.personas = CategoryCounter()
+        self.ontologies = CategoryCounter()
+        self._anchor_day = None
+        self._recency = 0.0
+        self._phases = _PhaseSums()
+        for m in mentions:
+            self.add(m)
+
+    @classmethod
+    def from_payload(cls, raw_data):
+        return cls(raw_data.get("brand", "UNKNOWN"), raw_data.get("mentions", []))
+
+    # ---------------------------
+    # UPDATES
+    # ---------------------------
+
+    def add(self, mention):
+        self._apply(mention, 1)
+
+    def remove(self, mention):
+        self._apply(mention, -1)
+
+    def _apply(self, mention, sign):
+        m = normalize_input({"mentions": [mention]})["mentions"][0]
+        if sign < 0 and not self._contains(m):
+            raise KeyError("mention was never added to this accumulator")
+        update = CategoryCounter.add if sign > 0 else CategoryCounter.remove
+
+        update(self.sources, m["source"])
+        update(self.topics, tuple(m["surface_area"]))
+        update(self.personas, m["persona"])
+        update(self.ontologies, m["ontology"])
+        for s in m["surface_area"]:
+            update(self.surfaces, s)
+
+        self.count += sign
+        self.accuracy += sign * m["accuracy"]
+        self.authority += sign * m["authority"]
+        self.completeness += sign * m["completeness"]
+
+        day, phase = divmod(to_epoch_us(m["last_seen"]), US_PER_DAY)
+        if self._anchor_day is None:
+            self._anchor_day = day
+        elif day - self._anchor_day > _MAX_ANCHOR_DRIFT:
+            self._reanchor(day)
+        weight = sign * math.exp(DECAY_LAMBDA * (day - self._anchor_day))
+        self._recency += weight
+        self._phases.add(phase, weight, sign)
+
+        if self.count == 0:
+            self._anchor_day = None
+            self._recency = 0.0
+            self._phases = _PhaseSums()
+
+    def _contains(self, m):
+        surfaces = Counter(map(_hashable, m["surface_area"]))
+        return (
+            _hashable(m["source"]) in self.sources.counts and
+            _hashable(tuple(m["surface_area"])) in self.topics.counts and
+            _hashable(m["persona"]) in self.personas.counts and
+            _hashable(m["ontology"]) in self.ontologies.counts and
+            all(self.surfaces.counts[s] >= n for s, n in surfaces.items())
+        )
+
+    def _reanchor(self, day):
+        factor = math.exp(DECAY_LAMBDA * (self._anchor_day - day))
+        self._recency *= factor
+        self._phases.scale(factor)
+        self._anchor_day = day
+
+    # ---------------------------
+    # SCORING
+    # ---------------------------
+
+    def recency(self, as_of=None):
+        if self.count == 0:
+            return float("nan")
+        as_of_day, phase = divmod(to_epoch_us(as_of or datetime.utcnow()), US_PER_DAY)
+        # floor((as_of - t) / day) is one day less for mentions later in the day than as_of
+        total = self._recency + math.expm1(DECAY_LAMBDA) * self._phases.after(phase)
+        decay = math.exp(-DECAY_LAMBDA * (as_of_day - self._anchor_day))
+        return total * decay / self.count
+
+    def presence(self, as_of=None, profile=None):
+        return float(presence_from_stats(
+            self.count,
+            self.sources.distinct,
+            self.surfaces.distinct,
+            self.recency(as_of),
+            profile,
+        ))
+
+    def quality(self, profile=None):
+        if self.count == 0:
+            return float("nan")
+        return float(quality_from_stats(
+            self.accuracy / self.count,
+            self.authority / self.count,
+            self.completeness / self.count,
+            self.count,
+            profile,
+        ))
+
+    def diversity(self, profile=None):
+        return float(diversity_from_stats(
+            self.topics.entropy(),
+            self.personas.entropy(),
+            self.ontologies.entropy(),
+            profile,
+        ))
+
+    def score(self, as_of=None, profile=None):
+        profile = get_profile(profile)
+        presence = self.presence(as_of, profile)
+        quality = self.quality(profile)
+        diversity = self.diversity(profile)
+
+        weights = profile.components
+
+        final = (
+            weights["presence"] * presence +
+            weights["quality"] * quality +
+            weights["diversity"] * diversity
+        )
+
+        return {
+            "brand": self.brand,
+            "presence": presence,
+            "quality": quality,
+            "diversity": diversity,
+            "geo_score": final
+        }
@@ -0,0 +1,283 @@
+"""
+Memory-mapped on-disk mention archive for offline rescoring.
+
+Layout (little endian)::
+
+    b"AETHMA01"
+    row group 0: one 64-byte aligned block per MentionFrame column
+    row group 1: ...
+    footer: JSON (dictionaries, brand names, column offsets per row group)
+    footer length: uint64
+    b"AETHMA01"
+
+Every row group is the columnar image of a MentionFrame holding a run of
+whole brands, so the writer streams its input with bounded memory. Strings
+are dictionary-encoded once for the whole archive. The reader memory-maps the
+file and hands out MentionFrames whose columns are views into the map, so
+rescoring never parses JSON or copies mention data.
+
+    python -m aether.core.archive write mentions.jsonl -o mentions.aema
+    python -m aether.core.archive score mentions.aema -o scores.jsonl
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from .batch import score_frame
+from .interning import CategoryTable
+from .normalizers import FrameBuilder, MentionFrame
+
+MAGIC = b"AETHMA01"
+ALIGN = 64
+GROUP_MENTIONS = 1 << 20
+FIELDS = ("source", "persona", "ontology", "topic", "surface")
+_FOOTER_LEN = struct.Struct("<Q")
+
+
+def _dtype(name):
+    if name in MentionFrame.NUMERIC:
+        return np.dtype("<f4")
+    if name == "surface_counts":
+        return np.dtype("<u2")
+    if name == "last_seen_us":
+        return np.dtype("<i8")
+    return np.dtype("<i4")
+
+# ---------------------------
+# WRITER
+# ---------------------------
+
+class ArchiveWriter:
+    """
+    Streams brand payloads into an archive. Brands are buffered in a
+    FrameBuilder and flushed as a row group every ``group_mentions`` mentions.
+
+    Row groups go to ``path + ".partial"``, which ``close`` finishes and moves
+    over ``path``; ``abort`` (or leaving the ``with`` block on an exception)
+    deletes it, so ``path`` only ever holds a complete archive.
+    """
+
+    def __init__(self, path, group_mentions=GROUP_MENTIONS):
+        self.path = path
+        self.group_mentions = group_mentions
+        self.tables = {name: CategoryTable(name) for name in FIELDS}
+        self.groups = []
+        self._partial = path + ".partial"
+        self._file = open(self._partial, "wb")
+        self._file.write(MAGIC)
+        self._builder = self._new_builder()
+
+    def _new_builder(self):
+        return FrameBuilder(tables=self.tables)
+
+    def add(self, raw_data):
+        self._builder.add_brand(raw_data)
+        if len(self._builder.last_seen_us) >= self.group_mentions:
+            self._flush()
+
+    def _write_block(self, array):
+        pad = -self._file.tell() % ALIGN
+        self._file.write(b"\0" * pad)
+        offset = self._file.tell()
+        self._file.write(np.ascontiguousarray(array).tobytes())
+        return [offset, len(array)]
+
+    def _flush(self):
+        if not self._builder.brands:
+            return
+        frame = self._builder.build()
+        columns = {
+            name: self._write_block(getattr(frame, name).astype(_dtype(name), copy=False))
+            for name in MentionFrame.COLUMNS
+        }
+        columns["offsets"] = self._write_block(frame.offsets.astype("<i8", copy=False))
+        columns["surface_offsets"] = self._write_block(frame.surface_offsets.astype("<i8", copy=False))
+        self.groups.append({"brands": frame.brands, "columns": columns})
+        self._builder = self._new_builder()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        footer = {
+            "version": 1,
+            "written_at": datetime.utcnow().isoformat(),
+            "dictionaries": {
+                name: [list(v) if isinstance(v, tuple) else v for v in table.decode(range(len(table)))]
+                for name, table in self.tables.items()
+            },
+            "groups": self.groups,
+        }
+        data = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+        self._file.write(data)
+        self._file.write(_FOOTER_LEN.pack(len(data)))
+        self._file.write(MAGIC)
+        self._file.close()
+        os.replace(self._partial, self.path)
+
+    def abort(self):
+        """Discard everything written so far, leaving ``path`` untouched."""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.remove(self._partial)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_payloads(path):
+    """Brand payloads from a .jsonl file (streamed) or a .json object/list."""
+    if path.endswith(".jsonl") or path.endswith(".ndjson"):
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    with open(path, "r") as f:
+        data = json.load(f)
+    yield from (data if isinstance(data, list) else [data])
+
+
+def write_archive(path, payloads, group_mentions=GROUP_MENTIONS):
+    with ArchiveWriter(path, group_mentions) as writer:
+        for raw in payloads:
+            writer.add(raw)
+    return path
+
+# ---------------------------
+# READER
+# ---------------------------
+
+class MentionArchive:
+    """
+    Read-only, memory-mapped view of an archive.
+
+    ``group(g)`` and ``brand(i)`` return MentionFrames whose columns are
+    zero-copy views into the map. Codes index ``dictionaries[field]``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        size = len(self._map)
+        if size < 2 * len(MAGIC) + _FOOTER_LEN.size or bytes(self._map[:8]) != MAGIC or bytes(self._map[-8:]) != MAGIC:
+            raise ValueError(f"{path} is not a mention archive")
+        (footer_len,) = _FOOTER_LEN.unpack(bytes(self._map[-16:-8]))
+        footer = json.loads(bytes(self._map[size - 16 - footer_len:size - 16]))
+        if footer.get("version") != 1:
+            raise ValueError(f"unsupported archive version {footer.get('version')!r}")
+
+        self.dictionaries = footer["dictionaries"]
+        self.dictionaries["topic"] = [tuple(v) for v in self.dictionaries["topic"]]
+        self._groups = footer["groups"]
+        sizes = [len(g["brands"]) for g in self._groups]
+        self._group_starts = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self._group_starts[1:])
+        self.brands = [b for g in self._groups for b in g["brands"]]
+
+    def __len__(self):
+        return len(self.brands)
+
+    @property
+    def n_groups(self):
+        return len(self._groups)
+
+    def _column(self, spec, dtype):
+        offset, length = spec
+        return self._map[offset:offset + length * dtype.itemsize].view(dtype)
+
+    def group(self, g):
+        spec = self._groups[g]
+        cols = spec["columns"]
+        columns = {name: self._column(cols[name], _dtype(name)) for name in MentionFrame.COLUMNS}
+        return MentionFrame(
+            spec["brands"],
+            self._column(cols["offsets"], np.dtype("<i8")),
+            self._column(cols["surface_offsets"], np.dtype("<i8")),
+            columns,
+        )
+
+    def groups(self):
+        for g in range(self.n_groups):
+            yield self.group(g)
+
+    def brand(self, i):
+        g = int(np.searchsorted(self._group_starts, i, side="right")) - 1
+        if not 0 <= g < self.n_groups:
+            raise IndexError(i)
+        return self.group(g).brand(i - int(self._group_starts[g]))
+
+    def decode(self, field, codes):
+        values = self.dictionaries[field]
+        return [values[c] for c in codes]
+
+
+def score_archive(archive, as_of=None, profile=None, max_brands=10_000):
+    """
+    Yield compute_geo_score-shaped results for every brand in the archive, in
+    order, scoring up to ``max_brands`` brands per batch.
+    """
+    as_of = as_of or datetime.utcnow()
+    for frame in archive.groups():
+        for start in range(0, frame.n_brands, max_brands):
+            chunk = frame.slice(start, min(start + max_brands, frame.n_brands))
+            scores = score_frame(chunk, as_of=as_of, profile=profile)
+            for i, name in enumerate(chunk.brands):
+                yield {
+                    "brand": name,
+                    "presence": float(scores["presence"][i]),
+                    "quality": float(scores["quality"][i]),
+                    "diversity": float(scores["diversity"][i]),
+                    "geo_score": float(scores["geo_score"][i]),
+                }
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m aether.core.archive", description="Mention archive tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    write = sub.add_parser("write", help="convert JSON/JSONL brand payloads to an archive")
+    write.add_argument("inputs", nargs="+")
+    write.add_argument("-o", "--output", required=True)
+    write.add_argument("--group-mentions", type=int, default=GROUP_MENTIONS)
+
+    score = sub.add_parser("score", help="rescore every brand of an archive to JSONL")
+    score.add_argument("archive")
+    score.add_argument("-o", "--output", default="-")
+    score.add_argument("--as-of", type=datetime.fromisoformat)
+    score.add_argument("--profile")
+
+    args = parser.parse_args(argv)
+    if args.command == "write":
+        payloads = (raw for path in args.inputs for raw in iter_payloads(path))
+        write_archive(args.output, payloads, args.group_mentions)
+        return 0
+
+    archive = MentionArchive(args.archive)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in score_archive(archive, as_of=args.as_of, profile=args.profile):
+            out.write(json.dumps(result) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
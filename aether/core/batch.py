@@ -0,0 +1,159 @@
+import numpy as np
+from datetime import date, datetime
+
+from .metrics import (
+    DECAY_LAMBDA,
+    presence_from_stats,
+    quality_from_stats,
+    diversity_from_stats,
+)
+from .normalizers import US_PER_DAY, normalize_frames, to_epoch_us
+from .profiles import get_profile
+
+# ---------------------------
+# SEGMENTED REDUCTIONS
+# ---------------------------
+
+def _segment_mean(segments, values, counts):
+    sums = np.bincount(segments, weights=values, minlength=len(counts))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def _segment_keys(segments, codes):
+    # One int64 key per (segment, code) pair
+    cardinality = int(codes.max()) + 1
+    return segments * cardinality + codes, cardinality
+
+
+def _segment_distinct(segments, codes, n_segments):
+    if codes.size == 0:
+        return np.zeros(n_segments)
+    keys, cardinality = _segment_keys(segments, codes)
+    return np.bincount(np.unique(keys) // cardinality, minlength=n_segments).astype(np.float64)
+
+
+def _segment_entropy(segments, codes, counts):
+    n_segments = len(counts)
+    if codes.size == 0:
+        return np.zeros(n_segments)
+    keys, cardinality = _segment_keys(segments, codes)
+    keys, key_counts = np.unique(keys, return_counts=True)
+    owner = keys // cardinality
+    probs = key_counts / counts[owner]
+    terms = -probs * np.log2(probs + 1e-9)
+    return np.bincount(owner, weights=terms, minlength=n_segments)
+
+
+def _segment_recency(offsets, last_seen_us, as_of_us):
+    # Mean time decay per segment, one row per as_of
+    counts = np.diff(offsets)
+    n_segments = len(counts)
+    segments = np.repeat(np.arange(n_segments), counts)
+    nonempty = counts > 0
+    as_of_days, phases = np.divmod(as_of_us, US_PER_DAY)
+
+    sums = np.zeros((len(as_of_us), n_segments))
+    # Dates sharing a time of day share each mention's epoch-day bucket:
+    # floor((a * day + phase - t) / day) == a - ceil((t - phase) / day)
+    for phase in np.unique(phases):
+        rows = phases == phase
+        if not last_seen_us.size:
+            continue
+        bucket = -np.floor_divide(phase - last_seen_us, US_PER_DAY)
+        # Per-segment reference day keeps both exponentials in range
+        ref = np.zeros(n_segments, dtype=np.int64)
+        ref[nonempty] = np.maximum.reduceat(bucket, offsets[:-1][nonempty])
+        scaled = np.bincount(
+            segments,
+            weights=np.exp(DECAY_LAMBDA * (bucket - ref[segments])),
+            minlength=n_segments,
+        )
+        sums[rows] = scaled * np.exp(-DECAY_LAMBDA * (as_of_days[rows, None] - ref))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def score_frame(frame, as_of=None, profile=None):
+    """
+    Compute presence, quality, diversity and geo_score arrays, one entry per
+    brand of a MentionFrame.
+
+    ``as_of`` may also be a sequence of dates. Then presence and geo_score are
+    ``(len(as_of), n_brands)`` matrices: mention timestamps are bucketed into
+    epoch days once and only the per-brand recency factor is evaluated per
+    date.
+    """
+    profile = get_profile(profile)
+    offsets = frame.offsets
+    n_brands = len(offsets) - 1
+    counts = np.diff(offsets).astype(np.float64)
+    segments = np.repeat(np.arange(n_brands), np.diff(offsets))
+
+    series = as_of is not None and not isinstance(as_of, (date, str))
+    dates = list(as_of) if series else [as_of or datetime.utcnow()]
+    as_of_us = np.array([to_epoch_us(d) for d in dates], dtype=np.int64)
+
+    # Presence
+    recency = _segment_recency(offsets, frame.last_seen_us, as_of_us)
+    if not series:
+        recency = recency[0]
+    systems = _segment_distinct(segments, frame.source, n_brands)
+    surface_segments = np.repeat(segments, frame.surface_counts)
+    surfaces = _segment_distinct(surface_segments, frame.surface, n_brands)
+
+    presence = presence_from_stats(counts, systems, surfaces, recency, profile)
+
+    # Quality
+    quality = quality_from_stats(
+        _segment_mean(segments, frame.accuracy, counts),
+        _segment_mean(segments, frame.authority, counts),
+        _segment_mean(segments, frame.completeness, counts),
+        counts,
+        profile,
+    )
+
+    # Diversity
+    diversity = diversity_from_stats(
+        _segment_entropy(segments, frame.topic, counts),
+        _segment_entropy(segments, frame.persona, counts),
+        _segment_entropy(segments, frame.ontology, counts),
+        profile,
+    )
+
+    weights = profile.components
+    geo_score = (
+        weights["presence"] * presence +
+        weights["quality"] * quality +
+        weights["diversity"] * diversity
+    )
+
+    return {
+        "presence": presence,
+        "quality": quality,
+        "diversity": diversity,
+        "geo_score": geo_score,
+    }
+
+
+def compute_geo_scores_batch(brands, as_of=None, profile=None):
+    """
+    Score many raw brand payloads at once.
+
+    Equivalent to ``[compute_geo_score(b) for b in brands]`` within float
+    tolerance, but every metric is a segmented NumPy reduction over all
+    mentions instead of a Python loop per brand.
+    """
+    frame = normalize_frames(brands)
+    scores = score_frame(frame, as_of=as_of, profile=profile)
+    return [
+        {
+            "brand": name,
+            "presence": float(scores["presence"][i]),
+            "quality": float(scores["quality"][i]),
+            "diversity": float(scores["diversity"][i]),
+            "geo_score": float(scores["geo_score"][i]),
+        }
+        for i, name in enumerate(frame.brands)
+    ]
@@ -0,0 +1,209 @@
+"""
+Parallel bulk scoring of a JSONL file of brand payloads.
+
+    python -m aether.core.bulk brands.jsonl -o scores.jsonl
+    python -m aether.core.bulk brands.jsonl -o scores.csv --workers 16 --resume
+
+Input lines are read lazily and shipped in chunks to a process pool sized to
+the machine. At most ``2 * workers`` chunks are in flight, so memory stays
+bounded whatever the input size, and results are written in input order.
+``--offset N`` skips the first N payload lines (blank lines do not count)
+and, like any run without ``--resume``, overwrites the output file;
+``--resume`` also skips one payload per record already in the output file
+(written by an earlier run with the same ``--offset``), drops a partially
+written last record, and appends. A payload that cannot be parsed or scored
+becomes an error record rather than stopping the run.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from .batch import compute_geo_scores_batch
+
+FIELDS = ("brand", "presence", "quality", "diversity", "geo_score", "error")
+
+
+def score_lines(lines, as_of=None, profile=None):
+    """Score a chunk of raw JSONL lines; a bad line yields an error record."""
+    payloads, results = [], []
+    for line in lines:
+        try:
+            payloads.append(json.loads(line))
+            results.append(None)
+        except ValueError as e:
+            results.append({"brand": None, "error": f"invalid JSON: {e}"})
+    try:
+        scored = compute_geo_scores_batch(payloads, as_of=as_of, profile=profile)
+    except Exception:
+        # Valid JSON that cannot be scored: find it, and score the rest one by one
+        scored = [_score_one(payload, as_of, profile) for payload in payloads]
+    scored = iter(scored)
+    return [r if r is not None else next(scored) for r in results]
+
+
+def _score_one(payload, as_of, profile):
+    try:
+        return compute_geo_scores_batch([payload], as_of=as_of, profile=profile)[0]
+    except Exception as e:
+        brand = payload.get("brand") if isinstance(payload, dict) else None
+        return {"brand": brand, "error": f"invalid payload: {type(e).__name__}: {e}"}
+
+
+def _chunks(lines, size):
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _count_records(path, fmt):
+    # Records completed by an interrupted run; a torn last record is cut off.
+    # A CSV record may span lines (quoted newlines): it ends at a newline
+    # outside quotes, i.e. once its quote count is even.
+    if not os.path.exists(path):
+        return 0
+    n = end = pos = quotes = 0
+    blank = True
+    with open(path, "rb+") as f:
+        for line in f:
+            pos += len(line)
+            blank = blank and not line.strip()
+            if fmt == "csv":
+                quotes += line.count(b'"')
+            if not line.endswith(b"\n") or quotes % 2:
+                continue
+            n += not blank
+            end, quotes, blank = pos, 0, True
+        if end < pos:
+            f.truncate(end)
+    return max(n - 1, 0) if fmt == "csv" else n
+
+
+class _Writer:
+    def __init__(self, path, fmt, append):
+        self.fmt = fmt
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = sys.stdout if path == "-" else open(path, "a" if append else "w", newline="")
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+            if not exists:
+                self._csv.writeheader()
+
+    def write(self, records):
+        if self.fmt == "csv":
+            self._csv.writerows(records)
+        else:
+            self._file.writelines(json.dumps(r) + "\n" for r in records)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def bulk_score(
+    input_path,
+    output_path="-",
+    workers=None,
+    chunk_size=500,
+    fmt=None,
+    offset=0,
+    resume=False,
+    as_of=None,
+    profile=None,
+    progress=sys.stderr,
+    progress_interval=5.0,
+):
+    """
+    Score every payload of ``input_path`` into ``output_path`` and return the
+    number of records written.
+    """
+    fmt = fmt or ("csv" if str(output_path).endswith(".csv") else "jsonl")
+    if resume:
+        offset += _count_records(output_path, fmt)
+    workers = workers or os.cpu_count() or 1
+    # One as_of for the whole run so every chunk ages mentions identically
+    as_of = as_of or datetime.utcnow()
+
+    writer = _Writer(output_path, fmt, append=resume)
+    written = 0
+    started = last_report = time.monotonic()
+
+    def report(final=False):
+        elapsed = time.monotonic() - started
+        rate = written / elapsed if elapsed else 0.0
+        label = "done" if final else "progress"
+        print(f"[bulk] {label}: {written} brands (from line {offset}), {rate:.0f} brands/sec", file=progress)
+
+    try:
+        with open(input_path, "r") as f:
+            lines = islice((line for line in f if line.strip()), offset, None)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in _chunks(lines, chunk_size):
+                    pending.append(pool.submit(score_lines, chunk, as_of, profile))
+                    while len(pending) >= 2 * workers:
+                        records = pending.popleft().result()
+                        writer.write(records)
+                        written += len(records)
+                    if progress and time.monotonic() - last_report >= progress_interval:
+                        report()
+                        last_report = time.monotonic()
+                while pending:
+                    records = pending.popleft().result()
+                    writer.write(records)
+                    written += len(records)
+    finally:
+        writer.close()
+
+    if progress:
+        report(final=True)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m aether.core.bulk", description="Bulk GEO scoring of JSONL brand payloads")
+    parser.add_argument("input", help="JSONL file, one brand payload per line")
+    parser.add_argument("-o", "--output", default="-", help="output .jsonl or .csv (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"))
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="brands per worker task")
+    parser.add_argument("--offset", type=int, default=0, help="skip this many payload lines")
+    parser.add_argument(
+        "--resume", action="store_true", help="continue after the records already in --output (from --offset)"
+    )
+    parser.add_argument("--as-of", type=datetime.fromisoformat)
+    parser.add_argument("--profile")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.resume and args.output == "-":
+        parser.error("--resume needs --output")
+
+    bulk_score(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        fmt=args.format,
+        offset=args.offset,
+        resume=args.resume,
+        as_of=args.as_of,
+        profile=args.profile,
+        progress=None if args.quiet else sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
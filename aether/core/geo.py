@@ -1,27 +1,34 @@
-import yaml
-import os
 from .metrics import (
     compute_presence_score,
     compute_quality_score,
     compute_diversity_score
 )
-from .normalizers import normalize_input
+from .batch import score_frame
+from .normalizers import mention_rows, normalize_frame
+from .profiles import get_profile
+from .sketches import BrandSketch
 
 
-def load_weights():
-    path = os.path.join(os.path.dirname(__file__), "weights.yaml")
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+def load_weights(profile=None):
+    return get_profile(profile).as_weights()
 
 
-def compute_geo_score(raw_data):
-    data = normalize_input(raw_data)
+def compute_geo_score(raw_data, as_of=None, profile=None, sketch=False):
+    profile = get_profile(profile)
+    if sketch:
+        # One streaming pass, no normalized copy of the mention list
+        brand = raw_data.get("brand", "UNKNOWN")
+        mentions = mention_rows(raw_data.get("mentions", []))
+        data = BrandSketch.from_mentions(mentions, as_of=as_of)
+    else:
+        data = normalize_frame(raw_data)
+        brand = data.brands[0]
 
-    presence = compute_presence_score(data)
-    quality = compute_quality_score(data)
-    diversity = compute_diversity_score(data)
+    presence = compute_presence_score(data, as_of=as_of, profile=profile, sketch=sketch)
+    quality = compute_quality_score(data, profile=profile, sketch=sketch)
+    diversity = compute_diversity_score(data, profile=profile, sketch=sketch)
 
-    weights = load_weights()
+    weights = profile.components
 
     final = (
         weights["presence"] * presence +
@@ -30,9 +37,37 @@ def compute_geo_score(raw_data):
     )
 
     return {
-        "brand": data["brand"],
+        "brand": brand,
         "presence": presence,
         "quality": quality,
         "diversity": diversity,
         "geo_score": final
     }
+
+
+def compute_geo_score_series(raw_data, as_of_dates, profile=None):
+    """
+    Score one brand as of every date in ``as_of_dates`` in a single pass.
+
+    Timestamps are parsed once and only the recency factor is evaluated per
+    date; the recency-free terms are computed once. Each entry matches
+    ``compute_geo_score(raw_data, as_of=d)`` plus an ``as_of`` key.
+    """
+    as_of_dates = list(as_of_dates)
+    frame = normalize_frame(raw_data)
+    scores = score_frame(frame, as_of=as_of_dates, profile=profile)
+    brand = frame.brands[0]
+    quality = float(scores["quality"][0])
+    diversity = float(scores["diversity"][0])
+
+    return [
+        {
+            "brand": brand,
+            "as_of": d.isoformat() if hasattr(d, "isoformat") else str(d),
+            "presence": float(scores["presence"][i, 0]),
+            "quality": quality,
+            "diversity": diversity,
+            "geo_score": float(scores["geo_score"][i, 0]),
+        }
+        for i, d in enumerate(as_of_dates)
+    ]
@@ -0,0 +1,100 @@
+"""
+Process-wide dictionary encoding for categorical mention fields.
+
+Each field gets a ``CategoryTable`` that maps values to dense integer codes.
+Tables only grow, so a code stays valid for the life of the process and each
+distinct persona/ontology/topic/... is hashed into a table once, not once per
+scoring call. Request bodies can carry any number of distinct values, so a
+shared table stops growing at ``SHARED_TABLE_LIMIT`` values; callers then
+code into a table of their own (see ``shared_or_private``).
+"""
+import threading
+
+import numpy as np
+
+
+def _hashable(value):
+    # Unhashable values (a list-valued persona, a nested surface_area) are
+    # categories too: they count by their string form
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return str(value)
+
+
+class CategoryTable:
+    def __init__(self, name):
+        self.name = name
+        self._codes = {}
+        self._values = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def code(self, value):
+        try:
+            code = self._codes.get(value)
+        except TypeError:
+            value = _hashable(value)
+            code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self._values)
+                    self._values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def encode(self, values):
+        values = values if isinstance(values, list) else list(values)
+        # Known values are looked up without a Python-level call each
+        try:
+            codes = list(map(self._codes.get, values))
+        except TypeError:
+            return np.array([self.code(v) for v in values], dtype=np.int64)
+        if None in codes:
+            codes = [self.code(v) if c is None else c for c, v in zip(codes, values)]
+        return np.array(codes, dtype=np.int64)
+
+    def value(self, code):
+        return self._values[code]
+
+    def decode(self, codes):
+        return [self._values[c] for c in codes]
+
+
+# Distinct values a shared table takes before callers get private tables
+SHARED_TABLE_LIMIT = 1 << 16
+
+SOURCES = CategoryTable("source")
+SURFACES = CategoryTable("surface")
+TOPICS = CategoryTable("topic")
+PERSONAS = CategoryTable("persona")
+ONTOLOGIES = CategoryTable("ontology")
+
+
+def shared_or_private(table):
+    """
+    ``table`` while it holds fewer than ``SHARED_TABLE_LIMIT`` values, else a
+    new empty table of the same name for the caller to code one call's
+    values into; codes only need to be consistent within a call.
+    """
+    return table if len(table) < SHARED_TABLE_LIMIT else CategoryTable(table.name)
+
+
+def code_counts(codes):
+    """
+    Occurrence counts of the distinct codes in ``codes`` (order unspecified).
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    if codes.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    lo, hi = codes.min(), codes.max()
+    # bincount is O(code range); fall back to a sort for sparse code ranges
+    if hi - lo < 8 * codes.size + 1024:
+        counts = np.bincount(codes - lo)
+        return counts[counts > 0]
+    return np.unique(codes, return_counts=True)[1]
@@ -1,84 +1,161 @@
 import numpy as np
 from datetime import datetime
 
+from .interning import ONTOLOGIES, PERSONAS, TOPICS, _hashable, code_counts, shared_or_private
+from .normalizers import US_PER_DAY, MentionFrame, to_epoch_us
+from .profiles import get_profile
 
-def time_decay(timestamp, lambda_=0.07):
+DECAY_LAMBDA = 0.07
+
+
+def time_decay(timestamp, lambda_=DECAY_LAMBDA, as_of=None):
     if isinstance(timestamp, str):
         timestamp = datetime.fromisoformat(timestamp)
-    days = (datetime.utcnow() - timestamp).days
+    days = ((as_of or datetime.utcnow()) - timestamp).days
     return np.exp(-lambda_ * days)
 
+
+def _sketch(data, as_of=None):
+    # Sketch mode: one streaming pass into bounded-memory summaries
+    from .sketches import BrandSketch
+    if isinstance(data, BrandSketch):
+        return data
+    return BrandSketch.from_mentions(data["mentions"], as_of=as_of)
+
 # ---------------------------
 # PRESENCE METRICS
 # ---------------------------
 
-def compute_presence_score(data):
+def presence_from_stats(freq, systems, surfaces, recency, profile=None):
+    # Scalars or arrays; shared by the exact, batch, incremental and sketch paths
+    w = get_profile(profile).presence_weights
+    presence = (
+        w["frequency"] * np.tanh(freq / 10) +
+        w["systems"] * np.tanh(systems / 5) +
+        w["surfaces"] * np.tanh(surfaces / 20) +
+        w["recency"] * recency
+    )
+    return np.clip(presence, 0, 1)
+
+
+def compute_presence_score(data, as_of=None, profile=None, sketch=False):
+    if sketch:
+        s = _sketch(data, as_of)
+        return float(presence_from_stats(
+            s.count, s.sources.estimate(), s.surfaces.estimate(), s.recency(), profile
+        ))
+
+    if isinstance(data, MentionFrame):
+        as_of_us = to_epoch_us(as_of or datetime.utcnow())
+        days = np.floor_divide(as_of_us - data.last_seen_us, US_PER_DAY)
+        recency = np.mean(np.exp(-DECAY_LAMBDA * days))
+        return float(presence_from_stats(
+            len(data), code_counts(data.source).size, code_counts(data.surface).size, recency, profile
+        ))
+
     mentions = data["mentions"]
 
     freq = len(mentions)
     systems = len(set(m["source"] for m in mentions))
     surfaces = len(set(s for m in mentions for s in m.get("surface_area", [])))
 
-    recency = np.mean([time_decay(m["last_seen"]) for m in mentions])
-
-    # Weighted sum
-    presence = (
-        0.4 * np.tanh(freq / 10) +
-        0.3 * np.tanh(systems / 5) +
-        0.2 * np.tanh(surfaces / 20) +
-        0.1 * recency
-    )
+    as_of = as_of or datetime.utcnow()
+    recency = np.mean([time_decay(m["last_seen"], as_of=as_of) for m in mentions])
 
-    return float(np.clip(presence, 0, 1))
+    return float(presence_from_stats(freq, systems, surfaces, recency, profile))
 
 # ---------------------------
 # QUALITY METRICS
 # ---------------------------
 
-def compute_quality_score(data):
+def quality_from_stats(acc, auth, comp, count, profile=None):
+    redundancy_penalty = 1 - np.tanh(count / 40)
+
+    w = get_profile(profile).quality_weights
+    quality = (
+        w["accuracy"] * acc +
+        w["authority"] * auth +
+        w["completeness"] * comp +
+        w["redundancy"] * redundancy_penalty
+    )
+    return np.clip(quality, 0, 1)
+
+
+def compute_quality_score(data, profile=None, sketch=False):
+    if sketch:
+        s = _sketch(data)
+        return float(quality_from_stats(*s.quality_means(), s.count, profile))
+
+    if isinstance(data, MentionFrame):
+        return float(quality_from_stats(
+            np.mean(data.accuracy, dtype=np.float64),
+            np.mean(data.authority, dtype=np.float64),
+            np.mean(data.completeness, dtype=np.float64),
+            len(data),
+            profile,
+        ))
+
     mentions = data["mentions"]
 
     acc = np.mean([m.get("accuracy", 0.5) for m in mentions])
     auth = np.mean([m.get("authority", 0.5) for m in mentions])
     comp = np.mean([m.get("completeness", 0.5) for m in mentions])
 
-    redundancy_penalty = 1 - np.tanh(len(mentions) / 40)
-
-    quality = (
-        0.35 * acc +
-        0.35 * auth +
-        0.25 * comp -
-        0.05 * redundancy_penalty
-    )
-
-    return float(np.clip(quality, 0, 1))
+    return float(quality_from_stats(acc, auth, comp, len(mentions), profile))
 
 # ---------------------------
 # DIVERSITY METRICS
 # ---------------------------
 
 def entropy(values):
-    # Convert values to strings to handle non-homogeneous sequences
-    string_vals = [str(v) for v in values]
-    vals, counts = np.unique(string_vals, return_counts=True)
+    # Integer category codes (see interning.py) are counted directly; other
+    # values are dictionary-encoded for this call only
+    if not (isinstance(values, np.ndarray) and values.dtype.kind in "iu"):
+        local = {}
+        values = np.fromiter(
+            (local.setdefault(_hashable(v), len(local)) for v in values), dtype=np.int64
+        )
+    return entropy_from_counts(code_counts(values))
+
+
+def entropy_from_counts(counts):
+    counts = counts[counts > 0]
+    if counts.size == 0:
+        return 0.0
     probs = counts / counts.sum()
     return -np.sum(probs * np.log2(probs + 1e-9))
 
-def compute_diversity_score(data):
+
+def diversity_from_stats(topic_entropy, persona_var, ontology_spread, profile=None):
+    w = get_profile(profile).diversity_weights
+    diversity = (
+        w["topics"] * np.tanh(topic_entropy) +
+        w["personas"] * np.tanh(persona_var) +
+        w["ontologies"] * np.tanh(ontology_spread)
+    )
+    return np.clip(diversity, 0, 1)
+
+
+def compute_diversity_score(data, profile=None, sketch=False):
+    if sketch:
+        s = _sketch(data)
+        return float(diversity_from_stats(
+            s.topics.entropy(), s.personas.entropy(), s.ontologies.entropy(), profile
+        ))
+
+    if isinstance(data, MentionFrame):
+        return float(diversity_from_stats(
+            entropy(data.topic), entropy(data.persona), entropy(data.ontology), profile
+        ))
+
     mentions = data["mentions"]
 
-    topics = [tuple(m.get("surface_area", [])) for m in mentions]
-    personas = [m.get("persona", "default") for m in mentions]
-    ontologies = [m.get("ontology", "none") for m in mentions]
+    topics = shared_or_private(TOPICS).encode(tuple(m.get("surface_area", [])) for m in mentions)
+    personas = shared_or_private(PERSONAS).encode(m.get("persona", "default") for m in mentions)
+    ontologies = shared_or_private(ONTOLOGIES).encode(m.get("ontology", "none") for m in mentions)
 
     topic_entropy = entropy(topics)
     persona_var = entropy(personas)
     ontology_spread = entropy(ontologies)
 
-    diversity = (
-        0.4 * np.tanh(topic_entropy) +
-        0.35 * np.tanh(persona_var) +
-        0.25 * np.tanh(ontology_spread)
-    )
-
-    return float(np.clip(diversity, 0, 1))
+    return float(diversity_from_stats(topic_entropy, persona_var, ontology_spread, profile))
@@ -1,3 +1,62 @@
+from array import array
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from .interning import ONTOLOGIES, PERSONAS, SOURCES, SURFACES, TOPICS, shared_or_private
+
+MENTION_DEFAULTS = {
+    "source": "unknown",
+    "text": "",
+    "authority": 0.5,
+    "sentiment": 0.5,
+    "accuracy": 0.5,
+    "completeness": 0.5,
+    "last_seen": "2025-01-01T00:00:00",
+    "surface_area": [],
+    "persona": "default",
+    "ontology": "none",
+}
+
+DEFAULT_TABLES = {
+    "source": SOURCES,
+    "persona": PERSONAS,
+    "ontology": ONTOLOGIES,
+    "topic": TOPICS,
+    "surface": SURFACES,
+}
+
+US_PER_DAY = 86_400 * 10**6
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_us(timestamp):
+    # Naive timestamps are taken as UTC, matching time_decay's utcnow() baseline
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    elif not isinstance(timestamp, datetime) and isinstance(timestamp, date):
+        timestamp = datetime(timestamp.year, timestamp.month, timestamp.day)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = timestamp - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 10**6 + delta.microseconds
+
+
+def _parse_timestamps(values):
+    # NumPy parses naive ISO 8601 strings in C; anything else (offsets,
+    # datetime objects) goes through to_epoch_us one by one
+    naive = all(
+        isinstance(v, str) and len(v) <= 26 and "+" not in v and "-" not in v[10:] and not v.endswith("Z")
+        for v in values
+    )
+    if naive:
+        try:
+            return np.array(values, dtype="datetime64[us]").astype(np.int64)
+        except ValueError:
+            pass
+    return np.fromiter(map(to_epoch_us, values), dtype=np.int64, count=len(values))
+
+
 def normalize_input(data):
     # Guarantee minimal keys
     normalized = {
@@ -5,18 +64,215 @@ def normalize_input(data):
         "mentions": []
     }
 
+    d = MENTION_DEFAULTS
     for m in data.get("mentions", []):
         normalized["mentions"].append({
-            "source": m.get("source", "unknown"),
-            "text": m.get("text", ""),
-            "authority": float(m.get("authority", 0.5)),
-            "sentiment": float(m.get("sentiment", 0.5)),
-            "accuracy": float(m.get("accuracy", 0.5)),
-            "completeness": float(m.get("completeness", 0.5)),
-            "last_seen": m.get("last_seen", "2025-01-01T00:00:00"),
-            "surface_area": m.get("surface_area", []),
-            "persona": m.get("persona", "default"),
-            "ontology": m.get("ontology", "none")
+            "source": m.get("source", d["source"]),
+            "text": m.get("text", d["text"]),
+            "authority": float(m.get("authority", d["authority"])),
+            "sentiment": float(m.get("sentiment", d["sentiment"])),
+            "accuracy": float(m.get("accuracy", d["accuracy"])),
+            "completeness": float(m.get("completeness", d["completeness"])),
+            "last_seen": m.get("last_seen", d["last_seen"]),
+            "surface_area": m.get("surface_area", d["surface_area"]),
+            "persona": m.get("persona", d["persona"]),
+            "ontology": m.get("ontology", d["ontology"])
         })
 
     return normalized
+
+def mention_rows(mentions):
+    """Mentions as dicts, whether given as a list or column-wise."""
+    if not isinstance(mentions, dict):
+        return mentions
+    names = list(mentions)
+    return [dict(zip(names, row)) for row in zip(*mentions.values())]
+
+# ---------------------------
+# COLUMNAR MENTIONS
+# ---------------------------
+
+class MentionFrame:
+    """
+    Columnar mentions of one or more brands.
+
+    Mentions of brand ``i`` are rows ``offsets[i]:offsets[i + 1]``. Numeric
+    fields are float32, ``last_seen_us`` is int64 microseconds since the epoch
+    (UTC) and categorical fields are int32 codes, from the interning tables
+    or from the dictionaries of the archive the frame was read from.
+    ``topic`` encodes the whole ``surface_area`` tuple; the individual areas
+    are flattened into ``surface``, with ``surface_counts[j]`` entries for
+    mention ``j`` and ``surface_offsets`` bounding each brand's share.
+    ``text`` is None unless requested.
+    """
+
+    NUMERIC = ("authority", "sentiment", "accuracy", "completeness")
+    CODES = ("source", "persona", "ontology", "topic")
+
+    __slots__ = (
+        "brands", "offsets", "authority", "sentiment", "accuracy", "completeness",
+        "last_seen_us", "source", "persona", "ontology", "topic",
+        "surface_counts", "surface_offsets", "surface", "text",
+    )
+    COLUMNS = NUMERIC + CODES + ("last_seen_us", "surface_counts", "surface")
+
+    def __init__(self, brands, offsets, surface_offsets, columns, text=None):
+        self.brands = brands
+        self.offsets = offsets
+        self.surface_offsets = surface_offsets
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+        self.text = text
+
+    def __len__(self):
+        return len(self.last_seen_us)
+
+    @property
+    def n_brands(self):
+        return len(self.brands)
+
+    def brand(self, i):
+        """Zero-copy view of brand ``i``'s mentions as a single-brand frame."""
+        return self.slice(i, i + 1)
+
+    def slice(self, start, stop):
+        """Zero-copy view of brands ``start:stop`` (only the offsets are copied)."""
+        lo, hi = int(self.offsets[start]), int(self.offsets[stop])
+        s_lo, s_hi = int(self.surface_offsets[start]), int(self.surface_offsets[stop])
+        columns = {name: getattr(self, name)[lo:hi] for name in self.COLUMNS}
+        columns["surface"] = self.surface[s_lo:s_hi]
+        return MentionFrame(
+            self.brands[start:stop],
+            self.offsets[start:stop + 1] - lo,
+            self.surface_offsets[start:stop + 1] - s_lo,
+            columns,
+            self.text[lo:hi] if self.text is not None else None,
+        )
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.surface_offsets.nbytes + sum(
+            getattr(self, name).nbytes for name in self.COLUMNS
+        )
+
+
+class FrameBuilder:
+    """
+    Single-pass MentionFrame construction: raw mentions go straight into
+    typed ``array`` buffers that become the frame's NumPy columns.
+
+    Categorical fields are encoded with the process-wide interning tables
+    (or private ones once a shared table is full) unless ``tables`` maps
+    field names to other CategoryTables.
+    """
+
+    def __init__(self, keep_text=False, tables=None):
+        tables = tables or {}
+        self.tables = {
+            name: tables[name] if name in tables else shared_or_private(table)
+            for name, table in DEFAULT_TABLES.items()
+        }
+        self.brands = []
+        self.offsets = array("q", [0])
+        self.numeric = {name: array("f") for name in MentionFrame.NUMERIC}
+        self.last_seen_us = array("q")
+        self.codes = {name: array("i") for name in MentionFrame.CODES}
+        self.surface_counts = array("H")
+        self.surface_offsets = array("q", [0])
+        self.surface = array("i")
+        self.text = [] if keep_text else None
+
+    def add_mention(self, m):
+        d = MENTION_DEFAULTS
+        for name, column in self.numeric.items():
+            column.append(float(m.get(name, d[name])))
+        self.last_seen_us.append(to_epoch_us(m.get("last_seen", d["last_seen"])))
+        tables = self.tables
+        for name in ("source", "persona", "ontology"):
+            self.codes[name].append(tables[name].code(m.get(name, d[name])))
+        areas = m.get("surface_area", d["surface_area"])
+        self.codes["topic"].append(tables["topic"].code(tuple(areas)))
+        self.surface.extend(map(tables["surface"].code, areas))
+        self.surface_counts.append(len(areas))
+        if self.text is not None:
+            self.text.append(m.get("text", d["text"]))
+
+    def add_columns(self, columns):
+        """
+        Mentions given column-wise, ``{field: [value per mention]}``, as
+        binary clients send them. Numeric columns are converted in bulk;
+        ``last_seen_us`` (epoch microseconds) may replace ``last_seen``.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("mention columns must all have the same length")
+        n = lengths.pop() if lengths else 0
+        d = MENTION_DEFAULTS
+
+        for name, column in self.numeric.items():
+            values = columns.get(name)
+            column.frombytes(
+                np.asarray(values, dtype=np.float32).tobytes() if values is not None
+                else np.full(n, d[name], dtype=np.float32).tobytes()
+            )
+        if "last_seen_us" in columns:
+            last_seen_us = np.asarray(columns["last_seen_us"], dtype=np.int64)
+        else:
+            last_seen_us = _parse_timestamps(columns.get("last_seen") or [d["last_seen"]] * n)
+        self.last_seen_us.frombytes(last_seen_us.tobytes())
+
+        tables = self.tables
+        for name in ("source", "persona", "ontology"):
+            codes = tables[name].encode(columns.get(name) or [d[name]] * n)
+            self.codes[name].frombytes(codes.astype(np.int32).tobytes())
+        areas = columns.get("surface_area") or [d["surface_area"]] * n
+        topics = tables["topic"].encode([tuple(a) for a in areas])
+        self.codes["topic"].frombytes(topics.astype(np.int32).tobytes())
+        flat = [s for a in areas for s in a]
+        self.surface.frombytes(tables["surface"].encode(flat).astype(np.int32).tobytes())
+        self.surface_counts.frombytes(np.fromiter(map(len, areas), dtype=np.uint16, count=n).tobytes())
+        if self.text is not None:
+            self.text.extend(columns.get("text") or [d["text"]] * n)
+
+    def end_brand(self, name="UNKNOWN"):
+        self.brands.append(name)
+        self.offsets.append(len(self.last_seen_us))
+        self.surface_offsets.append(len(self.surface))
+
+    def add_brand(self, raw_data):
+        mentions = raw_data.get("mentions", [])
+        if isinstance(mentions, dict):
+            self.add_columns(mentions)
+        else:
+            for m in mentions:
+                self.add_mention(m)
+        self.end_brand(raw_data.get("brand", "UNKNOWN"))
+
+    def build(self):
+        columns = {name: np.frombuffer(col, dtype=np.float32) for name, col in self.numeric.items()}
+        columns.update({name: np.frombuffer(col, dtype=np.int32) for name, col in self.codes.items()})
+        columns["last_seen_us"] = np.frombuffer(self.last_seen_us, dtype=np.int64)
+        columns["surface_counts"] = np.frombuffer(self.surface_counts, dtype=np.uint16)
+        columns["surface"] = np.frombuffer(self.surface, dtype=np.int32)
+        return MentionFrame(
+            self.brands,
+            np.frombuffer(self.offsets, dtype=np.int64),
+            np.frombuffer(self.surface_offsets, dtype=np.int64),
+            columns,
+            self.text,
+        )
+
+
+def normalize_frame(data, keep_text=False):
+    """Columnar counterpart of normalize_input for one brand."""
+    builder = FrameBuilder(keep_text)
+    builder.add_brand(data)
+    return builder.build()
+
+
+def normalize_frames(brands, keep_text=False):
+    """One MentionFrame holding the mentions of many brands, in order."""
+    builder = FrameBuilder(keep_text)
+    for raw in brands:
+        builder.add_brand(raw)
+    return builder.build()
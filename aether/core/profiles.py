@@ -0,0 +1,225 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
+import numpy as np
+import yaml
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "weights.yaml")
+DEFAULT_PROFILE = "default"
+
+logger = logging.getLogger(__name__)
+
+# Layout of a compiled profile; also the order of ScoringProfile.vector
+SCHEMA = {
+    "components": ("presence", "quality", "diversity"),
+    "presence_weights": ("frequency", "systems", "surfaces", "recency"),
+    "quality_weights": ("accuracy", "authority", "completeness", "redundancy"),
+    "diversity_weights": ("topics", "personas", "ontologies"),
+}
+VECTOR_KEYS = tuple(
+    (section, key) for section, keys in SCHEMA.items() for key in keys
+)
+
+
+class ProfileError(ValueError):
+    pass
+
+
+class ScoringProfile:
+    """
+    A validated, immutable set of scoring coefficients.
+
+    ``components`` holds the top-level presence/quality/diversity weights, the
+    ``*_weights`` dicts hold the per-metric coefficients and ``vector`` is all
+    of them flattened in ``VECTOR_KEYS`` order.
+    """
+
+    __slots__ = (
+        "name",
+        "components",
+        "presence_weights",
+        "quality_weights",
+        "diversity_weights",
+        "vector",
+    )
+
+    def __init__(self, name, sections):
+        self.name = name
+        self.components = dict(sections["components"])
+        self.presence_weights = dict(sections["presence_weights"])
+        self.quality_weights = dict(sections["quality_weights"])
+        self.diversity_weights = dict(sections["diversity_weights"])
+        self.vector = np.array([sections[s][k] for s, k in VECTOR_KEYS], dtype=np.float64)
+        self.vector.setflags(write=False)
+
+    def as_weights(self):
+        # Same shape as weights.yaml, for callers that still expect load_weights()
+        weights = dict(self.components)
+        for section in ("presence_weights", "quality_weights", "diversity_weights"):
+            weights[section] = dict(getattr(self, section))
+        return weights
+
+    def __repr__(self):
+        return f"ScoringProfile({self.name!r})"
+
+
+def _merge(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def compile_profile(name, raw):
+    """
+    Validate a weights mapping (weights.yaml layout) and compile it.
+    """
+    if not isinstance(raw, dict):
+        raise ProfileError(f"profile {name!r} must be a mapping")
+
+    sections = {"components": {k: raw.get(k) for k in SCHEMA["components"]}}
+    for section in ("presence_weights", "quality_weights", "diversity_weights"):
+        sections[section] = dict(raw.get(section) or {})
+
+    unknown = set(raw) - set(SCHEMA["components"]) - set(SCHEMA)
+    if unknown:
+        raise ProfileError(f"profile {name!r}: unknown keys {sorted(unknown)}")
+
+    for section, keys in SCHEMA.items():
+        values = sections[section]
+        extra = set(values) - set(keys)
+        if extra:
+            raise ProfileError(f"profile {name!r}: unknown {section} keys {sorted(extra)}")
+        for key in keys:
+            value = values.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ProfileError(f"profile {name!r}: {section}.{key} must be a finite number, got {value!r}")
+            values[key] = float(value)
+
+    return ScoringProfile(name, sections)
+
+
+class ProfileRegistry:
+    """
+    Named scoring profiles loaded from a weights file.
+
+    The top level of the file is the ``default`` profile; an optional
+    ``profiles`` mapping adds named profiles as partial overrides of it, e.g.
+    per tenant or experiment. Profiles are compiled once and the file is only
+    re-read when its mtime changes, checked at most every ``check_interval``
+    seconds.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._profiles = {}
+        self._extra = {}
+        self._mtime = None
+        self._checked_at = float("-inf")
+        self._fingerprint = None
+
+    def get(self, name=DEFAULT_PROFILE):
+        self._maybe_reload()
+        try:
+            return self._profiles[name]
+        except KeyError:
+            raise ProfileError(f"unknown scoring profile {name!r}") from None
+
+    def names(self):
+        self._maybe_reload()
+        return sorted(self._profiles)
+
+    def fingerprint(self):
+        """
+        Short digest of every compiled profile; it changes whenever any
+        coefficient does, so it can key caches of computed scores.
+        """
+        self._maybe_reload()
+        with self._lock:
+            if self._fingerprint is None:
+                h = hashlib.blake2b(digest_size=8)
+                for name, profile in sorted(self._profiles.items()):
+                    h.update(name.encode("utf-8") + b"\0")
+                    h.update(profile.vector.tobytes())
+                self._fingerprint = h.hexdigest()
+            return self._fingerprint
+
+    def register(self, name, raw):
+        """
+        Add a profile that does not live in the weights file. ``raw`` is a
+        partial override of the default profile and survives file reloads.
+        """
+        self._maybe_reload()
+        with self._lock:
+            profile = compile_profile(name, _merge(self._default_raw, raw))
+            self._extra[name] = raw
+            self._profiles[name] = profile
+            self._fingerprint = None
+        return profile
+
+    def reload(self):
+        with self._lock:
+            self._load()
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._profiles:
+            return
+        with self._lock:
+            self._checked_at = now
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._mtime:
+                return
+            try:
+                self._load()
+            except (ProfileError, yaml.YAMLError):
+                if not self._profiles:
+                    raise
+                # Keep serving the last good profiles until the file is fixed
+                logger.exception("invalid scoring profiles in %s, keeping previous", self.path)
+                self._mtime = mtime
+
+    def _load(self):
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, "r") as f:
+            raw = yaml.safe_load(f) or {}
+
+        named = raw.get("profiles") or {}
+        default_raw = {k: v for k, v in raw.items() if k != "profiles"}
+
+        profiles = {DEFAULT_PROFILE: compile_profile(DEFAULT_PROFILE, default_raw)}
+        for name, override in {**named, **self._extra}.items():
+            profiles[name] = compile_profile(name, _merge(default_raw, override or {}))
+
+        # Swap only once everything validated
+        self._default_raw = default_raw
+        self._profiles = profiles
+        self._fingerprint = None
+        self._mtime = mtime
+        self._checked_at = time.monotonic()
+
+
+_registry = ProfileRegistry()
+
+
+def get_registry():
+    return _registry
+
+
+def get_profile(profile=None):
+    """
+    Resolve ``profile`` (None, a profile name or a ScoringProfile) to a
+    compiled ScoringProfile from the shared registry.
+    """
+    if isinstance(profile, ScoringProfile):
+        return profile
+    return _registry.get(profile or DEFAULT_PROFILE)
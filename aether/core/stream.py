@@ -0,0 +1,125 @@
+"""
+Exact GEO score of one brand from mentions that arrive as a stream.
+
+Mentions are buffered into a FrameBuilder and folded, one chunk at a time,
+into running sums and per-code category counts, so memory depends on the
+chunk size and the number of distinct categories, never on the number of
+mentions. Categories are coded in tables private to the scorer, so the count
+arrays are sized by this stream's categories, not by everything the process
+has interned, and untrusted streams do not grow the shared tables. With
+``as_of`` fixed up front every aggregate is exact and the score matches
+``compute_geo_score`` over the same mentions.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from .interning import CategoryTable
+from .metrics import (
+    DECAY_LAMBDA,
+    diversity_from_stats,
+    entropy_from_counts,
+    presence_from_stats,
+    quality_from_stats,
+)
+from .normalizers import US_PER_DAY, FrameBuilder, to_epoch_us
+from .profiles import get_profile
+
+CATEGORIES = ("source", "surface", "topic", "persona", "ontology")
+
+
+class StreamingScorer:
+    """
+    Running aggregates of one brand's mentions, fed with ``add``/``extend``
+    and folded every ``chunk_size`` mentions.
+    """
+
+    def __init__(self, brand="UNKNOWN", as_of=None, chunk_size=8192):
+        self.brand = brand
+        self.as_of = as_of or datetime.utcnow()
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.accuracy = 0.0
+        self.authority = 0.0
+        self.completeness = 0.0
+        self.recency_sum = 0.0
+        self.counts = {name: np.zeros(0, dtype=np.int64) for name in CATEGORIES}
+        self._as_of_us = to_epoch_us(self.as_of)
+        self._tables = {name: CategoryTable(name) for name in CATEGORIES}
+        self._builder = FrameBuilder(tables=self._tables)
+        self._buffered = 0
+
+    def add(self, mention):
+        self._builder.add_mention(mention)
+        self._buffered += 1
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def extend(self, mentions):
+        for m in mentions:
+            self.add(m)
+
+    def flush(self):
+        if not self._buffered:
+            return
+        self._builder.end_brand(self.brand)
+        frame = self._builder.build()
+        self._builder = FrameBuilder(tables=self._tables)
+        self._buffered = 0
+
+        self.count += len(frame)
+        self.accuracy += float(np.sum(frame.accuracy, dtype=np.float64))
+        self.authority += float(np.sum(frame.authority, dtype=np.float64))
+        self.completeness += float(np.sum(frame.completeness, dtype=np.float64))
+        days = np.floor_divide(self._as_of_us - frame.last_seen_us, US_PER_DAY)
+        self.recency_sum += float(np.sum(np.exp(-DECAY_LAMBDA * days)))
+
+        for name in CATEGORIES:
+            chunk = np.bincount(getattr(frame, name))
+            total = self.counts[name]
+            if chunk.size > total.size:
+                total = np.concatenate([total, np.zeros(chunk.size - total.size, dtype=np.int64)])
+            total[:chunk.size] += chunk
+            self.counts[name] = total
+
+    def distinct(self, name):
+        return int(np.count_nonzero(self.counts[name]))
+
+    def score(self, profile=None):
+        """Flush the buffer and return a compute_geo_score-shaped result."""
+        self.flush()
+        profile = get_profile(profile)
+        nan = float("nan")
+        n = self.count
+
+        presence = float(presence_from_stats(
+            n, self.distinct("source"), self.distinct("surface"),
+            self.recency_sum / n if n else nan, profile,
+        ))
+        if n:
+            quality = float(quality_from_stats(
+                self.accuracy / n, self.authority / n, self.completeness / n, n, profile
+            ))
+        else:
+            quality = nan
+        diversity = float(diversity_from_stats(
+            entropy_from_counts(self.counts["topic"]),
+            entropy_from_counts(self.counts["persona"]),
+            entropy_from_counts(self.counts["ontology"]),
+            profile,
+        ))
+
+        weights = profile.components
+        final = (
+            weights["presence"] * presence +
+            weights["quality"] * quality +
+            weights["diversity"] * diversity
+        )
+
+        return {
+            "brand": self.brand,
+            "presence": presence,
+            "quality": quality,
+            "diversity": diversity,
+            "geo_score": final
+        }
@@ -0,0 +1,248 @@
+"""
+What-if sweeps over the top-level presence/quality/diversity weights.
+
+The component scores of a brand do not depend on the component weights, so
+they are computed once into a ``(brands, 3)`` matrix, cached to disk, and
+every candidate weighting is then one column of a single matrix product:
+
+    python -m aether.core.sweep build brands.jsonl -o components.npz
+    python -m aether.core.sweep run components.npz --grid 0.05 -o sweep.jsonl
+    python -m aether.core.sweep run components.npz --weights candidates.csv
+
+For each candidate the sweep reports the top-ranked brands and how its
+scores and ranking differ from the baseline profile's.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from .archive import MentionArchive, iter_payloads
+from .batch import score_frame
+from .normalizers import FrameBuilder
+from .profiles import SCHEMA, get_profile
+
+COMPONENTS = SCHEMA["components"]
+
+
+class ComponentMatrix:
+    """
+    Presence, quality and diversity of many brands, one row per brand in
+    ``COMPONENTS`` order, plus the baseline component weights they were
+    scored with.
+    """
+
+    def __init__(self, brands, values, baseline, profile="default", as_of=None):
+        self.brands = list(brands)
+        self.values = np.asarray(values, dtype=np.float64).reshape(-1, len(COMPONENTS))
+        self.baseline = np.asarray(baseline, dtype=np.float64)
+        self.profile = profile
+        self.as_of = as_of
+
+    def __len__(self):
+        return len(self.brands)
+
+    @classmethod
+    def from_frames(cls, frames, as_of=None, profile=None):
+        profile = get_profile(profile)
+        as_of = as_of or datetime.utcnow()
+        brands, blocks = [], []
+        for frame in frames:
+            scores = score_frame(frame, as_of=as_of, profile=profile)
+            brands.extend(frame.brands)
+            blocks.append(np.column_stack([scores[c] for c in COMPONENTS]))
+        values = np.concatenate(blocks) if blocks else np.empty((0, len(COMPONENTS)))
+        baseline = [profile.components[c] for c in COMPONENTS]
+        return cls(brands, values, baseline, profile.name, as_of.isoformat())
+
+    @classmethod
+    def from_payloads(cls, payloads, as_of=None, profile=None, chunk_size=10_000):
+        """Score an iterable of raw brand payloads, ``chunk_size`` brands at a time."""
+        def frames():
+            builder = FrameBuilder()
+            for raw in payloads:
+                builder.add_brand(raw)
+                if len(builder.brands) >= chunk_size:
+                    yield builder.build()
+                    builder = FrameBuilder()
+            if builder.brands:
+                yield builder.build()
+
+        return cls.from_frames(frames(), as_of=as_of, profile=profile)
+
+    @classmethod
+    def from_archive(cls, archive, as_of=None, profile=None):
+        if isinstance(archive, str):
+            archive = MentionArchive(archive)
+        return cls.from_frames(archive.groups(), as_of=as_of, profile=profile)
+
+    def save(self, path):
+        np.savez(
+            path,
+            brands=np.array([str(b) for b in self.brands]),
+            values=self.values,
+            baseline=self.baseline,
+            meta=json.dumps({"profile": self.profile, "as_of": self.as_of}),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(data["brands"].tolist(), data["values"], data["baseline"], **meta)
+
+
+def simplex_grid(step):
+    """Every weighting on a ``step`` grid whose three weights sum to 1."""
+    n = int(round(1 / step))
+    if n < 1 or not np.isclose(n * step, 1):
+        raise ValueError(f"grid step must divide 1, got {step!r}")
+    p, q = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    keep = p + q <= n
+    p, q = p[keep], q[keep]
+    return np.column_stack([p, q, n - p - q]) / n
+
+
+def sweep(components, weights, top_k=10, block_size=256):
+    """
+    Evaluate every row of ``weights`` (candidates x 3) against a
+    ComponentMatrix.
+
+    Scores are ``values @ weights.T``, evaluated ``block_size`` candidates at
+    a time to bound memory. Brands with a missing component (no mentions)
+    are left out. Returns per-candidate arrays:
+
+    * ``top``: indices into ``components.brands`` of the ``top_k`` best brands
+    * ``mean_delta``, ``mean_abs_delta``, ``max_abs_delta``: score change
+      against the baseline weights
+    * ``rank_corr``: Spearman correlation with the baseline ranking
+    * ``top_overlap``: share of the baseline top ``top_k`` still in the top
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    if weights.shape[1] != len(COMPONENTS):
+        raise ValueError(f"weights must have {len(COMPONENTS)} columns {COMPONENTS}, got {weights.shape[1]}")
+
+    valid = np.flatnonzero(np.isfinite(components.values).all(axis=1))
+    values = components.values[valid]
+    n, n_candidates = len(valid), len(weights)
+    top_k = min(top_k, n)
+
+    baseline = values @ components.baseline
+    base_order = np.argsort(-baseline)
+    base_ranks = np.empty(n, dtype=np.int64)
+    base_ranks[base_order] = np.arange(n)
+    base_top = base_order[:top_k]
+
+    result = {
+        "top": np.empty((n_candidates, top_k), dtype=np.int64),
+        "mean_delta": np.empty(n_candidates),
+        "mean_abs_delta": np.empty(n_candidates),
+        "max_abs_delta": np.empty(n_candidates),
+        "rank_corr": np.empty(n_candidates),
+        "top_overlap": np.empty(n_candidates),
+    }
+    if n == 0:
+        result["top"] = valid[result["top"]]
+        for key in ("mean_delta", "mean_abs_delta", "max_abs_delta", "rank_corr", "top_overlap"):
+            result[key].fill(np.nan)
+        return result
+
+    positions = np.arange(n, dtype=np.float64)
+    for start in range(0, n_candidates, block_size):
+        block = slice(start, min(start + block_size, n_candidates))
+        # Candidates x brands, so every sort below runs over a contiguous row
+        scores = weights[block] @ values.T
+        delta = scores - baseline
+        abs_delta = np.abs(delta)
+        result["mean_delta"][block] = delta.mean(axis=1)
+        result["mean_abs_delta"][block] = abs_delta.mean(axis=1)
+        result["max_abs_delta"][block] = abs_delta.max(axis=1)
+
+        order = np.argsort(-scores, axis=1)
+        top = order[:, :top_k]
+        result["top"][block] = top
+        result["top_overlap"][block] = np.isin(top, base_top).sum(axis=1) / max(top_k, 1)
+
+        if n > 1:
+            # The brand at position k of a candidate's order has rank k there,
+            # so rank differences are a gather rather than a second sort
+            d = positions - base_ranks[order]
+            result["rank_corr"][block] = 1 - 6 * np.einsum("ij,ij->i", d, d) / (n * (n * n - 1.0))
+        else:
+            result["rank_corr"][block] = 1.0
+
+    result["top"] = valid[result["top"]]
+    return result
+
+
+def iter_results(components, weights, result):
+    """One JSON-ready dict per candidate, with brand names for ``top``."""
+    weights = np.atleast_2d(weights)
+    for j, w in enumerate(weights):
+        yield {
+            "candidate": j,
+            "weights": dict(zip(COMPONENTS, map(float, w))),
+            "top": [components.brands[i] for i in result["top"][j]],
+            **{
+                key: float(result[key][j])
+                for key in ("mean_delta", "mean_abs_delta", "max_abs_delta", "rank_corr", "top_overlap")
+            },
+        }
+
+
+def load_candidates(path):
+    """Candidate weights from .npy (n x 3) or .csv with presence/quality/diversity columns."""
+    if path.endswith(".npy"):
+        return np.load(path)
+    table = np.genfromtxt(path, delimiter=",", names=True, dtype=np.float64)
+    return np.column_stack([table[c] for c in COMPONENTS])
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m aether.core.sweep", description="Component weight sweeps")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="score brands once into a cached component matrix (.npz)")
+    build.add_argument("inputs", nargs="+", help="JSON/JSONL brand payloads or a mention archive")
+    build.add_argument("-o", "--output", required=True)
+    build.add_argument("--as-of", type=datetime.fromisoformat)
+    build.add_argument("--profile")
+
+    run = sub.add_parser("run", help="evaluate candidate weightings against a component matrix")
+    run.add_argument("components")
+    source = run.add_mutually_exclusive_group(required=True)
+    source.add_argument("--weights", help=".npy or .csv of candidate weights")
+    source.add_argument("--grid", type=float, help="every weighting summing to 1 on this step")
+    run.add_argument("--top", type=int, default=10)
+    run.add_argument("-o", "--output", default="-")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        if len(args.inputs) == 1 and args.inputs[0].endswith(".aema"):
+            matrix = ComponentMatrix.from_archive(args.inputs[0], as_of=args.as_of, profile=args.profile)
+        else:
+            payloads = (raw for path in args.inputs for raw in iter_payloads(path))
+            matrix = ComponentMatrix.from_payloads(payloads, as_of=args.as_of, profile=args.profile)
+        matrix.save(args.output)
+        return 0
+
+    matrix = ComponentMatrix.load(args.components)
+    weights = simplex_grid(args.grid) if args.grid else load_candidates(args.weights)
+    result = sweep(matrix, weights, top_k=args.top)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for record in iter_results(matrix, weights, result):
+            out.write(json.dumps(record) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
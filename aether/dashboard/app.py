@@ -1,17 +1,122 @@
 import streamlit as st
+import hashlib
+import io
 import json
 import sys
 import os
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
 
 # Ensure the core module can be imported when running on Streamlit Cloud
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.geo import compute_geo_score
+from core.batch import score_frame
+from core.normalizers import FrameBuilder
+from core.profiles import get_registry
+
+COMPONENTS = ["presence", "quality", "diversity"]
+CHUNK_BRANDS = 5_000
+CACHED_UPLOADS = 8
+
+# ---------------------------
+# PARSING + SCORING
+# ---------------------------
+
+def iter_payloads(raw, name):
+    """Brand payloads of an upload: JSONL is read line by line, JSON whole."""
+    if name.endswith((".jsonl", ".ndjson")):
+        for line in io.BytesIO(raw):
+            if line.strip():
+                yield json.loads(line)
+        return
+    data = json.loads(raw)
+    yield from (data if isinstance(data, list) else [data])
+
+
+@st.cache_data(max_entries=CACHED_UPLOADS, show_spinner="Scoring brands...")
+def score_upload(digest, name, as_of, profile, profiles, _raw):
+    # Keyed on the file digest and the profile fingerprint (``profiles``);
+    # the bytes themselves are never hashed again
+    as_of = datetime(as_of.year, as_of.month, as_of.day)
+    columns = {key: [] for key in ["brand", "mentions"] + COMPONENTS + ["geo_score"]}
+
+    def flush(builder):
+        frame = builder.build()
+        scores = score_frame(frame, as_of=as_of, profile=profile)
+        columns["brand"].extend(map(str, frame.brands))
+        columns["mentions"].append(np.diff(frame.offsets))
+        for key in COMPONENTS + ["geo_score"]:
+            columns[key].append(np.asarray(scores[key], dtype=np.float64))
+
+    builder = FrameBuilder()
+    for raw in iter_payloads(_raw, name):
+        builder.add_brand(raw)
+        if len(builder.brands) >= CHUNK_BRANDS:
+            flush(builder)
+            builder = FrameBuilder()
+    if builder.brands:
+        flush(builder)
+
+    table = {"brand": columns["brand"]}
+    for key in ["mentions"] + COMPONENTS + ["geo_score"]:
+        table[key] = np.concatenate(columns[key]) if columns[key] else np.zeros(0)
+    return pd.DataFrame(table)
+
+
+def histogram(values, bins=20):
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=bins, range=(0, 1))
+    labels = [f"{lo:.2f}" for lo in edges[:-1]]
+    return pd.DataFrame({"count": counts}, index=pd.Index(labels, name="score"))
+
+# ---------------------------
+# UI
+# ---------------------------
 
 st.title("GEo Score Dashboard")
-uploaded_file = st.file_uploader("Upload JSON data", type=["json"])
+uploaded_file = st.file_uploader(
+    "Upload brand data (one JSON payload, a JSON list, or JSONL with one brand per line)",
+    type=["json", "jsonl", "ndjson"],
+)
 if uploaded_file is not None:
-    data = json.load(uploaded_file)
-    result = compute_geo_score(data)
-    st.subheader("Results")
-    st.json(result)
+    options = st.columns(2)
+    as_of = options[0].date_input("Score as of", value=date.today())
+    profile = options[1].selectbox("Scoring profile", get_registry().names())
+
+    raw = uploaded_file.getvalue()
+    # Hash each upload once, not on every rerun
+    digests = st.session_state.setdefault("digests", {})
+    if uploaded_file.file_id not in digests:
+        digests[uploaded_file.file_id] = hashlib.sha256(raw).hexdigest()
+    digest = digests[uploaded_file.file_id]
+    scores = score_upload(digest, uploaded_file.name, as_of, profile, get_registry().fingerprint(), raw)
+
+    if len(scores) == 1:
+        st.subheader("Results")
+        row = scores.iloc[0]
+        st.json({
+            "brand": row["brand"],
+            **{key: float(row[key]) for key in COMPONENTS + ["geo_score"]},
+        })
+    else:
+        st.subheader(f"{len(scores):,} brands")
+        metrics = st.columns(4)
+        for column, key in zip(metrics, ["geo_score"] + COMPONENTS):
+            column.metric(f"median {key}", f"{np.nanmedian(scores[key]):.3f}" if len(scores) else "-")
+
+        query = st.text_input("Filter brands")
+        view = scores[scores["brand"].str.contains(query, case=False, regex=False)] if query else scores
+        st.dataframe(
+            view.sort_values("geo_score", ascending=False),
+            hide_index=True,
+            width="stretch",
+        )
+
+        st.subheader("Components")
+        top_n = st.slider("Top brands by geo_score", 5, 100, 25)
+        top = view.nlargest(top_n, "geo_score").set_index("brand")
+        st.bar_chart(top[COMPONENTS], stack=False)
+
+        chosen = st.selectbox("Distribution of", ["geo_score"] + COMPONENTS)
+        st.bar_chart(histogram(view[chosen].to_numpy()))
@@ -0,0 +1,62 @@
+"""
+Per-request CPU of /geo/score across codecs and payload sizes.
+
+    python -m benchmarks.bench_api_codecs --mentions 100 1000 10000
+
+Times the whole job a worker runs for one request (decode, normalize,
+score, encode) for stdlib JSON, orjson, msgpack with one map per mention
+and msgpack with column-wise mentions.
+"""
+import argparse
+import json
+import random
+import time
+
+import msgpack
+import orjson
+
+from aether.api import codecs, jobs
+from aether.core.geo import compute_geo_score
+from benchmarks.synthetic import make_brand
+
+
+def _stdlib_job(body):
+    payload = json.loads(body)
+    return json.dumps(compute_geo_score(payload["data"])).encode()
+
+
+def _columnar(brand):
+    mentions = brand["mentions"]
+    columns = {f: [m[f] for m in mentions] for f in mentions[0]} if mentions else {}
+    return {"brand": brand["brand"], "mentions": columns}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mentions", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time budget per case")
+    args = parser.parse_args()
+
+    for n in args.mentions:
+        brand = make_brand(random.Random(n), 0, n)
+        cases = [
+            ("json (stdlib)", json.dumps({"data": brand}).encode(), _stdlib_job),
+            ("json (orjson)", orjson.dumps({"data": brand}), lambda b: jobs.score_one(b)),
+            ("msgpack rows", msgpack.packb({"data": brand}),
+             lambda b: jobs.score_one(b, codecs.MSGPACK, codecs.MSGPACK)),
+            ("msgpack columns", msgpack.packb({"data": _columnar(brand)}),
+             lambda b: jobs.score_one(b, codecs.MSGPACK, codecs.MSGPACK)),
+        ]
+        print(f"{n} mentions")
+        for name, body, job in cases:
+            job(body)
+            runs, start = 0, time.perf_counter()
+            while time.perf_counter() - start < args.seconds:
+                job(body)
+                runs += 1
+            elapsed = (time.perf_counter() - start) / runs
+            print(f"  {name:16s} {len(body) / 1024:9.1f} KiB  {elapsed * 1000:8.2f} ms/req  {1 / elapsed:8.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+JSONL parsing + scoring vs memory-mapped archive rescoring.
+
+    python -m benchmarks.bench_archive --brands 20000 --mentions 20
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from aether.core.archive import MentionArchive, iter_payloads, score_archive, write_archive
+from aether.core.batch import compute_geo_scores_batch
+from benchmarks.synthetic import make_brands
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--brands", type=int, default=20000)
+    parser.add_argument("--mentions", type=int, default=20, help="mean mentions per brand")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = os.path.join(tmp, "brands.jsonl")
+        archive_path = os.path.join(tmp, "brands.aema")
+        with open(jsonl, "w") as f:
+            for raw in make_brands(args.brands, args.mentions):
+                f.write(json.dumps(raw) + "\n")
+
+        start = time.perf_counter()
+        compute_geo_scores_batch(list(iter_payloads(jsonl)))
+        from_json = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_archive(archive_path, iter_payloads(jsonl))
+        convert = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in score_archive(MentionArchive(archive_path)):
+            pass
+        rescore = time.perf_counter() - start
+
+        json_mb = os.path.getsize(jsonl) / 2**20
+        archive_mb = os.path.getsize(archive_path) / 2**20
+        print(f"JSONL {json_mb:.1f} MB, archive {archive_mb:.1f} MB")
+        print(f"JSONL parse + batch score: {from_json:7.2f}s  {args.brands / from_json:10.0f} brands/sec")
+        print(f"JSONL -> archive (once):   {convert:7.2f}s")
+        print(f"archive rescore:           {rescore:7.2f}s  {args.brands / rescore:10.0f} brands/sec"
+              f"  {archive_mb / rescore:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+ContentAnalyzer documents/sec: raw-HTML tokenizing vs markup stripping vs a process pool.
+
+    python -m benchmarks.bench_content_analyzer --corpus '/path/to/pages/**/*.html'
+
+Without ``--corpus`` a synthetic corpus of script- and style-heavy pages is used.
+The cached cases analyze the corpus into an empty AnalysisCache, then again
+as an unchanged corpus would be on a re-run.
+"""
+import argparse
+import glob
+import os
+import random
+import re
+import tempfile
+import time
+from collections import Counter
+
+from content_analyzer.agent import ContentAnalyzer
+from content_analyzer.cache import AnalysisCache
+
+
+def legacy_analyze(text):
+    words = re.findall(r"\b\w+\b", text.lower())
+    return {"word_count": len(words), "top_words": Counter(words).most_common(5)}
+
+
+def synthetic_page(rng):
+    words = ["acme", "dental", "tools", "care", "clinic", "brand", "product", "review", "price", "team"]
+    body = "".join(
+        f"<div class='row'><p>{' '.join(rng.choice(words) for _ in range(rng.randint(20, 80)))}</p></div>"
+        for _ in range(rng.randint(10, 60))
+    )
+    script = "<script>" + "function f(a,b){return a+b;}var x=f(1,2);" * rng.randint(50, 400) + "</script>"
+    style = "<style>" + ".row{margin:0 auto;padding:4px}" * rng.randint(50, 300) + "</style>"
+    return f"<!DOCTYPE html><html><head><title>Acme</title>{style}{script}</head><body>{body}</body></html>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="glob of HTML files (recursive ** allowed)")
+    parser.add_argument("--docs", type=int, default=1000, help="documents to use")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.corpus:
+        paths = sorted(glob.glob(args.corpus, recursive=True))[:args.docs]
+        docs = [open(p, encoding="utf-8", errors="replace").read() for p in paths]
+    else:
+        rng = random.Random(0)
+        docs = [synthetic_page(rng) for _ in range(args.docs)]
+    print(f"{len(docs)} documents, {sum(map(len, docs)) / 2**20:.1f} MB")
+
+    analyzer = ContentAnalyzer()
+    tmp = tempfile.TemporaryDirectory()
+    cached = ContentAnalyzer(cache=AnalysisCache(os.path.join(tmp.name, "analysis.db"), max_bytes=2**30))
+    cases = [
+        ("raw HTML (legacy)", lambda: [legacy_analyze(d) for d in docs]),
+        ("analyze", lambda: [analyzer.analyze(d) for d in docs]),
+        (f"analyze_many x{args.workers}", lambda: analyzer.analyze_many(docs, workers=args.workers)),
+        ("analyze_many, cold cache", lambda: cached.analyze_many(docs, workers=1)),
+        ("analyze_many, warm cache", lambda: cached.analyze_many(docs, workers=1)),
+    ]
+    with tmp:
+        for name, run in cases:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f"  {name:26s} {elapsed:7.2f}s  {len(docs) / elapsed:9.0f} docs/sec")
+        cached.cache.close()
+
+
+if __name__ == "__main__":
+    main()
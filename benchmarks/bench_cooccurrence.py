@@ -0,0 +1,86 @@
+"""
+Co-occurrence graph build speed and memory, CSR against a dict of sets.
+
+    python -m benchmarks.bench_cooccurrence --docs 20000 --mentions 200 --entities 200000 --window 5
+
+Documents mention entities drawn from a Zipf distribution over
+``--entities`` ids, as real pages mention a few brands often and most
+rarely. The dict of sets is the representation ``build_graph`` used to
+return, built over the same documents and window; its size is measured
+with tracemalloc.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from knowledge_graph_builder.agent import KnowledgeGraphBuilder
+
+
+def dict_of_sets(docs, window):
+    graph = {}
+    for doc in docs:
+        for i, a in enumerate(doc):
+            graph.setdefault(a, set())
+            for b in doc[i + 1:i + 1 + window]:
+                graph[a].add(b)
+                graph.setdefault(b, set()).add(a)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--mentions", type=int, default=200)
+    parser.add_argument("--entities", type=int, default=200_000)
+    parser.add_argument("--window", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ids = [f"entity-{i:07d}" for i in range(args.entities)]
+    docs = [
+        [ids[i] for i in (rng.zipf(1.3, size=args.mentions) - 1) % args.entities]
+        for _ in range(args.docs)
+    ]
+
+    builder = KnowledgeGraphBuilder(window=args.window)
+    start = time.perf_counter()
+    for doc in docs:
+        builder.add_document(doc)
+    builder.graph.compact()
+    elapsed = time.perf_counter() - start
+    graph = builder.graph
+    print(
+        f"csr: {args.docs:,} docs in {elapsed:.1f}s ({args.docs / elapsed:,.0f} docs/sec); "
+        f"{len(graph):,} nodes, {graph.num_edges:,} edges in {graph.nbytes / 2**20:.1f} MiB "
+        f"({graph.nbytes / graph.num_edges:.1f} bytes/edge)"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.npz")
+        t = time.perf_counter()
+        builder.save(path)
+        saved = time.perf_counter() - t
+        t = time.perf_counter()
+        KnowledgeGraphBuilder.load(path)
+        print(f"save {saved:.2f}s, load {time.perf_counter() - t:.2f}s, {os.path.getsize(path) / 2**20:.1f} MiB")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    baseline = dict_of_sets(docs, args.window)
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    edges = (sum(len(s) for s in baseline.values()) + sum(a in s for a, s in baseline.items())) // 2
+    assert edges == graph.num_edges
+    print(
+        f"dict of sets: {elapsed:.1f}s; {edges:,} edges in {size / 2**20:.1f} MiB "
+        f"({size / edges:.1f} bytes/edge, {size / graph.nbytes:.1f}x the CSR arrays), no weights"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Crawl throughput against a local stub server with simulated latency.
+
+    python -m benchmarks.bench_crawl --pages 2000 --latency 0.05 --hosts 16
+
+Serial ``CrawlerSimulator.crawl`` (one blocking request and connection per
+page) against ``CrawlEngine`` at increasing concurrency. The stub is an
+asyncio server in its own process that answers every request after
+``--latency`` seconds; it listens on 127.0.0.1 .. 127.0.0.N, which count as
+N hosts for the per-host limits.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from crawler_simulator.agent import CrawlerSimulator
+from crawler_simulator.engine import CrawlEngine
+
+BODY = b"<html><head><title>Stub</title></head><body>" + b"<p>lorem ipsum</p>" * 200 + b"</body></html>"
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+
+
+async def _handle(reader, writer, latency):
+    # Minimal keep-alive HTTP/1.1: every request gets BODY after ``latency``
+    try:
+        while True:
+            await reader.readuntil(b"\r\n\r\n")
+            await asyncio.sleep(latency)
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _serve(latency, port):
+    async def main():
+        server = await asyncio.start_server(
+            lambda r, w: _handle(r, w, latency), "0.0.0.0", 0, backlog=4096
+        )
+        port.value = server.sockets[0].getsockname()[1]
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def serve(latency):
+    """Start the stub in its own process and return (process, port)."""
+    port = multiprocessing.Value("i", 0)
+    process = multiprocessing.Process(target=_serve, args=(latency, port), daemon=True)
+    process.start()
+    while not port.value:
+        time.sleep(0.01)
+    return process, port.value
+
+
+async def run_engine(urls, concurrency, per_host):
+    async with CrawlEngine(concurrency=concurrency, per_host=per_host) as engine:
+        return sum([1 async for _ in engine.crawl_many(urls)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--hosts", type=int, default=16)
+    parser.add_argument("--per-host", type=int, default=16)
+    parser.add_argument("--concurrency", default="16,64,256")
+    args = parser.parse_args()
+
+    server, port = serve(args.latency)
+    urls = [f"http://127.0.0.{i % args.hosts + 1}:{port}/page/{i}" for i in range(args.pages)]
+
+    serial = urls[: max(10, int(1 / args.latency))]
+    crawler = CrawlerSimulator()
+    start = time.perf_counter()
+    for url in serial:
+        crawler.crawl(url)
+    elapsed = time.perf_counter() - start
+    print(f"  serial crawl()        {len(serial) / elapsed:8.0f} pages/sec")
+
+    for concurrency in map(int, args.concurrency.split(",")):
+        start = time.perf_counter()
+        n = asyncio.run(run_engine(urls, concurrency, args.per_host))
+        elapsed = time.perf_counter() - start
+        print(f"  engine x{concurrency:<4d}         {n / elapsed:8.0f} pages/sec")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Frontier throughput and memory as the number of URLs grows.
+
+    python -m benchmarks.bench_crawl_frontier --urls 10000000 --hosts 50000
+
+URLs are spread over ``--hosts`` hosts, with 10% re-discovered duplicates
+(other spellings of URLs already added). Peak RSS is reported after adding
+and after popping a sample, so memory can be compared across ``--urls``.
+"""
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+
+from crawler_simulator.frontier import Frontier
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def host_of(i, hosts):
+    return f"site{i * 2654435761 % hosts}.test"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--urls", type=int, default=1_000_000)
+    parser.add_argument("--hosts", type=int, default=10_000)
+    parser.add_argument("--pops", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"baseline: peak RSS {rss_mb():.0f} MB")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "frontier.db")
+        with Frontier(path, capacity=1_000_000) as frontier:
+            added = 0
+            start = time.perf_counter()
+            for i in range(args.urls):
+                if i % 10 == 9:
+                    j = rng.randrange(i) // 10 * 10  # a URL added as new
+                    url = f"HTTPS://{host_of(j, args.hosts).upper()}/page/{j}?utm_source=feed&id={j % 97}#x"
+                else:
+                    url = f"https://{host_of(i, args.hosts)}/page/{i}?id={i % 97}"
+                added += frontier.add(url, depth=i % 4)
+            elapsed = time.perf_counter() - start
+            print(
+                f"add: {args.urls:,} URLs ({added:,} new) in {elapsed:.1f}s "
+                f"({elapsed / args.urls * 1e6:.1f}us/URL), peak RSS {rss_mb():.0f} MB"
+            )
+
+            start = time.perf_counter()
+            for _ in range(args.pops):
+                frontier.done(frontier.pop())
+            elapsed = time.perf_counter() - start
+            print(f"pop+done: {elapsed / args.pops * 1e6:.1f}us/URL, peak RSS {rss_mb():.0f} MB")
+
+            start = time.perf_counter()
+            frontier.checkpoint()
+            stats = frontier.stats()
+            print(
+                f"checkpoint {time.perf_counter() - start:.2f}s; {stats['pending']:,} pending over "
+                f"{stats['hosts']:,} hosts; Bloom filter {stats['bloom_bytes'] / 2**20:.1f} MiB "
+                f"for {stats['seen']:,} URLs; db {os.path.getsize(path) / 2**20:.0f} MiB on disk"
+            )
+
+        start = time.perf_counter()
+        with Frontier(path) as resumed:
+            print(f"resume: {time.perf_counter() - start:.2f}s, {len(resumed):,} pending")
+
+
+if __name__ == "__main__":
+    main()
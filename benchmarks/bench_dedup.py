@@ -0,0 +1,72 @@
+"""
+DuplicateIndex insert and lookup latency at 1M documents, plus SimHash speed.
+
+    python -m benchmarks.bench_dedup --docs 1000000 --queries 10000
+
+Fingerprints are uniform random 64-bit values (as SimHash of unrelated pages
+are); half the queries are near-duplicates of indexed documents.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from content_analyzer.dedup import DuplicateIndex, simhash
+
+
+def percentiles(samples):
+    p50, p99 = np.percentile(np.asarray(samples) * 1e6, [50, 99])
+    return f"p50 {p50:.1f}us, p99 {p99:.1f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--max-distance", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    fingerprints = rng.integers(0, 2**64, size=args.docs, dtype=np.uint64, endpoint=False).tolist()
+
+    index = DuplicateIndex(args.max_distance)
+    start = time.perf_counter()
+    for i, fp in enumerate(fingerprints):
+        index.add(str(i), fp)
+    elapsed = time.perf_counter() - start
+    print(f"insert: {args.docs:,} docs in {elapsed:.1f}s ({elapsed / args.docs * 1e6:.1f}us/doc)")
+
+    queries = []
+    for q in range(args.queries):
+        fp = fingerprints[q]
+        queries.append(fp ^ (1 << q % 64) if q % 2 else int(rng.integers(0, 2**63)) * 2)
+    latencies, found = [], 0
+    for fp in queries:
+        t = time.perf_counter()
+        found += bool(index.query(fp))
+        latencies.append(time.perf_counter() - t)
+    print(f"query: {percentiles(latencies)}, {found:,}/{args.queries:,} with a near-duplicate")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.npz")
+        t = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - t
+        t = time.perf_counter()
+        DuplicateIndex.load(path)
+        print(f"save {saved:.2f}s, load {time.perf_counter() - t:.2f}s, {os.path.getsize(path) / 1e6:.0f} MB")
+
+    words = [f"w{i}" for i in range(5_000)]
+    text_rng = random.Random(0)
+    docs = [" ".join(text_rng.choices(words, k=1_000)) for _ in range(500)]
+    t = time.perf_counter()
+    for doc in docs:
+        simhash(doc)
+    print(f"simhash: {len(docs) / (time.perf_counter() - t):,.0f} docs/sec (1,000 words)")
+
+
+if __name__ == "__main__":
+    main()
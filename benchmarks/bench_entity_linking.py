@@ -0,0 +1,72 @@
+"""
+EntityLinker build and scan speed against a per-name regex baseline.
+
+    python -m benchmarks.bench_entity_linking --names 100000 --docs 200
+
+Names and documents are synthetic; the regex baseline is only run on a
+sample of names, its time is extrapolated linearly.
+"""
+import argparse
+import random
+import re
+import time
+
+from content_analyzer.entities import EntityLinker
+
+VOCAB = [f"w{i}" for i in range(20_000)]
+NAME_VOCAB = [f"n{i}" for i in range(50_000)] + VOCAB[:1_000]
+
+
+def synthetic_entities(n, rng):
+    return [
+        {"id": f"e{i}", "displayName": " ".join(rng.choices(NAME_VOCAB, k=rng.randint(1, 4))), "slug": f"entity-{i}"}
+        for i in range(n)
+    ]
+
+
+def synthetic_doc(entities, rng, words=2_000):
+    tokens = rng.choices(VOCAB, k=words)
+    for _ in range(words // 50):
+        tokens.insert(rng.randrange(len(tokens)), rng.choice(entities)["displayName"])
+    return " ".join(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--regex-sample", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    entities = synthetic_entities(args.names, rng)
+    docs = [synthetic_doc(entities, rng) for _ in range(args.docs)]
+    chars = sum(map(len, docs))
+
+    start = time.perf_counter()
+    linker = EntityLinker(entities)
+    linker.link("")
+    print(f"build: {len(linker):,} entities in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    linker.update(synthetic_entities(1_000, random.Random(1)))
+    linker.link("")
+    print(f"update: 1,000 entities in {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    mentions = sum(len(linker.link(doc)) for doc in docs)
+    elapsed = time.perf_counter() - start
+    print(f"aho-corasick: {args.docs / elapsed:,.0f} docs/sec, {chars / elapsed / 1e6:.1f} MB/s, {mentions:,} mentions")
+
+    sample = entities[:args.regex_sample]
+    patterns = [re.compile(r"\b" + re.escape(e["displayName"]) + r"\b", re.I) for e in sample]
+    start = time.perf_counter()
+    for doc in docs[:10]:
+        for pattern in patterns:
+            pattern.findall(doc)
+    elapsed = (time.perf_counter() - start) * (args.names / len(sample)) * (args.docs / min(args.docs, 10))
+    print(f"regex per name (extrapolated): {args.docs / elapsed:,.2f} docs/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Per-brand vs batch GEO scoring throughput.
+
+    python -m benchmarks.bench_geo_batch --brands 5000 --mentions 20
+"""
+import argparse
+import time
+
+from aether.core.batch import compute_geo_scores_batch
+from aether.core.geo import compute_geo_score
+from benchmarks.synthetic import make_brands
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--brands", type=int, default=5000)
+    parser.add_argument("--mentions", type=int, default=20, help="mean mentions per brand")
+    args = parser.parse_args()
+
+    brands = make_brands(args.brands, args.mentions)
+    total = sum(len(b["mentions"]) for b in brands)
+    print(f"{args.brands} brands, {total} mentions")
+
+    start = time.perf_counter()
+    for b in brands:
+        compute_geo_score(b)
+    loop = time.perf_counter() - start
+    print(f"per-brand: {loop:8.3f}s  {args.brands / loop:12.0f} brands/sec")
+
+    start = time.perf_counter()
+    compute_geo_scores_batch(brands)
+    batch = time.perf_counter() - start
+    print(f"batch:     {batch:8.3f}s  {args.brands / batch:12.0f} brands/sec  ({loop / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Page metadata extraction: a full BeautifulSoup parse (the old crawl() path)
+against head-only parsing, on synthetic pages of growing size.
+
+    python -m benchmarks.bench_page_metadata --sizes 0.1,1,5
+"""
+import argparse
+import time
+
+from crawler_simulator.metadata import head_metadata, parse_dom
+
+HEAD = (
+    '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Acme Dental</title>'
+    '<meta name="description" content="Dental tools"><link rel="canonical" href="https://acme.test/">'
+    '<script type="application/ld+json">{"@type": "Organization", "name": "Acme"}</script></head>'
+)
+ROW = '<div class="row"><a href="/p/1">Acme</a><p>Dental tools for clinics and teams.</p></div>'
+
+
+def page(mb):
+    rows = int(mb * 2**20 / len(ROW))
+    return (HEAD + "<body>" + ROW * rows + "</body></html>").encode()
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="0.1,1,5", help="page sizes in MB")
+    args = parser.parse_args()
+
+    for mb in map(float, args.sizes.split(",")):
+        content = page(mb)
+        text = content.decode()
+        soup = timed(lambda: parse_dom(text).title.string, 1 if mb >= 1 else 5)
+        head = timed(lambda: head_metadata(content), 50)
+        print(f"  {mb:5.1f} MB  BeautifulSoup {soup * 1e3:9.1f} ms   head_metadata {head * 1e3:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Peak memory of scoring one huge brand: whole JSON body vs streamed NDJSON.
+
+    python -m benchmarks.bench_stream_upload --mentions 200000
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+import tracemalloc
+
+from aether.api.upload import NDJSONDecoder
+from aether.core.geo import compute_geo_score
+from aether.core.stream import StreamingScorer
+from benchmarks.synthetic import make_mention
+
+
+def _ndjson(n, seed=0):
+    rng = random.Random(seed)
+    return "".join(json.dumps(make_mention(rng)) + "\n" for _ in range(n)).encode()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mentions", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for n in (args.mentions // 4, args.mentions):
+        ndjson = _ndjson(n)
+        body = b'{"brand": "huge", "mentions": [' + ndjson.strip().replace(b"\n", b",") + b"]}"
+        compressed = gzip.compress(ndjson)
+
+        def whole():
+            compute_geo_score(json.loads(body))
+
+        def streamed():
+            scorer = StreamingScorer("huge")
+            decoder = NDJSONDecoder(scorer.add, gzip=True)
+            for i in range(0, len(compressed), 1 << 16):
+                decoder.feed(compressed[i:i + (1 << 16)])
+            decoder.close()
+            scorer.score()
+
+        print(f"{n} mentions, {len(body) / 2**20:.0f} MB JSON, {len(compressed) / 2**20:.0f} MB gzip NDJSON")
+        for name, fn in (("whole body", whole), ("streamed", streamed)):
+            elapsed, peak = _measure(fn)
+            print(f"  {name:12s} {elapsed:6.2f}s  peak {peak:8.1f} MB (excluding the request body)")
+
+
+if __name__ == "__main__":
+    main()
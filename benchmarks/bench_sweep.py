@@ -0,0 +1,37 @@
+"""
+Component weight sweep: one matmul per block of candidates.
+
+    python -m benchmarks.bench_sweep --brands 10000 --candidates 5000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from aether.core.sweep import ComponentMatrix, sweep
+from benchmarks.synthetic import make_brands
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--brands", type=int, default=10000)
+    parser.add_argument("--mentions", type=int, default=20, help="mean mentions per brand")
+    parser.add_argument("--candidates", type=int, default=5000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matrix = ComponentMatrix.from_payloads(make_brands(args.brands, args.mentions))
+    build = time.perf_counter() - start
+
+    weights = np.random.default_rng(0).dirichlet(np.ones(3), size=args.candidates)
+    start = time.perf_counter()
+    sweep(matrix, weights)
+    elapsed = time.perf_counter() - start
+
+    print(f"component matrix ({args.brands} brands, once): {build:7.2f}s")
+    print(f"sweep of {args.candidates} weightings:          {elapsed:7.2f}s"
+          f"  {args.candidates / elapsed:10.0f} weightings/sec")
+
+
+if __name__ == "__main__":
+    main()
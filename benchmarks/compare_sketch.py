@@ -0,0 +1,46 @@
+"""
+Exact vs sketch-mode GEO scoring: score deviation and peak memory.
+
+    python -m benchmarks.compare_sketch --mentions 1000 10000 100000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from aether.core.geo import compute_geo_score
+from benchmarks.synthetic import make_large_brand
+
+AS_OF = datetime(2026, 1, 1)
+KEYS = ("presence", "quality", "diversity", "geo_score")
+
+
+def measure(brand, sketch):
+    tracemalloc.start()
+    start = time.perf_counter()
+    score = compute_geo_score(brand, as_of=AS_OF, sketch=sketch)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return score, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mentions", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'mentions':>9} {'seed':>4} " + " ".join(f"{'d_' + k:>12}" for k in KEYS)
+          + f" {'exact MB':>9} {'sketch MB':>9}")
+    for n in args.mentions:
+        for seed in range(args.seeds):
+            brand = make_large_brand(n, seed=seed)
+            exact, _, exact_peak = measure(brand, sketch=False)
+            approx, _, sketch_peak = measure(brand, sketch=True)
+            deltas = " ".join(f"{approx[k] - exact[k]:>12.2e}" for k in KEYS)
+            print(f"{n:>9} {seed:>4} {deltas} {exact_peak / 2**20:>9.1f} {sketch_peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Local load test: small /geo/score latency while large requests are in flight.
+
+    python -m benchmarks.load_api --executor inline
+    python -m benchmarks.load_api --executor process --workers 4
+
+Starts the API under uvicorn in a subprocess, keeps ``--large-clients``
+clients posting large brands in a loop, and measures the latency of small
+requests and /health alongside them.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.synthetic import make_brand, make_brands
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(client):
+    for _ in range(200):
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError("API did not start")
+
+
+async def _large_loop(client, payload, stop, stats):
+    while not stop.is_set():
+        r = await client.post("/geo/score", json=payload)
+        stats[r.status_code] = stats.get(r.status_code, 0) + 1
+
+
+async def _probe(client, path, payload, duration):
+    latencies = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        if payload is None:
+            await client.get(path)
+        else:
+            await client.post(path, json=payload)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return np.array(latencies) * 1000
+
+
+async def run(args, base_url):
+    import random
+    large = {"data": make_brand(random.Random(1), 0, args.large_mentions)}
+    small = {"data": make_brands(1, mean_mentions=10, seed=2)[0]}
+    timeout = httpx.Timeout(120.0)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        await _wait_ready(client)
+        stop, stats = asyncio.Event(), {}
+        loops = [
+            asyncio.create_task(_large_loop(client, large, stop, stats))
+            for _ in range(args.large_clients)
+        ]
+        await asyncio.sleep(0.5)
+        small_ms, health_ms = await asyncio.gather(
+            _probe(client, "/geo/score", small, args.duration),
+            _probe(client, "/health", None, args.duration),
+        )
+        stop.set()
+        await asyncio.gather(*loops)
+
+    print(f"executor={args.executor} workers={args.workers} large={args.large_mentions} mentions x {args.large_clients} clients")
+    for name, ms in (("small /geo/score", small_ms), ("/health", health_ms)):
+        print(f"{name:18s} n={len(ms):5d}  p50={np.percentile(ms, 50):8.1f}ms  p99={np.percentile(ms, 99):8.1f}ms")
+    print(f"large responses by status: {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--executor", default="process", choices=("process", "thread", "inline"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--large-mentions", type=int, default=50_000)
+    parser.add_argument("--large-clients", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    port = _free_port()
+    env = {
+        **os.environ,
+        "AETHER_SCORING_EXECUTOR": args.executor,
+        "AETHER_SCORING_WORKERS": str(args.workers),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "aether.api.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        asyncio.run(run(args, f"http://127.0.0.1:{port}"))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
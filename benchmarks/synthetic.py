@@ -0,0 +1,51 @@
+"""Synthetic brand payloads for the benchmarks, shaped like tests/demo_data.json."""
+import random
+from datetime import datetime, timedelta
+
+SOURCES = ["ChatGPT", "Claude", "Gemini", "Perplexity", "Copilot", "Grok", "Llama", "Mistral"]
+PERSONAS = ["consumer", "clinician", "researcher", "investor", "press"]
+ONTOLOGIES = ["medicine", "biology", "dentistry", "retail", "finance", "none"]
+TOPICS = [f"topic-{i}" for i in range(60)]
+
+
+def make_mention(rng, base=datetime(2025, 11, 20)):
+    return {
+        "source": rng.choice(SOURCES),
+        "text": "Lorem ipsum dolor sit amet " * rng.randint(1, 8),
+        "authority": round(rng.random(), 3),
+        "accuracy": round(rng.random(), 3),
+        "completeness": round(rng.random(), 3),
+        "sentiment": round(rng.random(), 3),
+        "last_seen": (base - timedelta(days=rng.randint(0, 365), hours=rng.randint(0, 23))).isoformat(),
+        "surface_area": rng.sample(TOPICS, rng.randint(0, 5)),
+        "persona": rng.choice(PERSONAS),
+        "ontology": rng.choice(ONTOLOGIES),
+    }
+
+
+def make_brand(rng, index, mentions):
+    return {"brand": f"brand-{index}", "mentions": [make_mention(rng) for _ in range(mentions)]}
+
+
+def make_brands(n_brands, mean_mentions=20, seed=0):
+    rng = random.Random(seed)
+    return [
+        make_brand(rng, i, max(1, int(rng.expovariate(1 / mean_mentions))))
+        for i in range(n_brands)
+    ]
+
+
+def make_large_brand(n_mentions, n_sources=500, n_topics=5000, seed=0):
+    # High-cardinality brand for the sketch-mode comparison
+    rng = random.Random(seed)
+    sources = [f"source-{i}" for i in range(n_sources)]
+    topics = [f"topic-{i}" for i in range(n_topics)]
+    personas = [f"persona-{i}" for i in range(max(n_topics // 50, 1))]
+    mentions = []
+    for _ in range(n_mentions):
+        m = make_mention(rng)
+        m["source"] = sources[min(int(rng.paretovariate(1.2)) - 1, n_sources - 1)]
+        m["surface_area"] = rng.sample(topics, rng.randint(0, 4))
+        m["persona"] = rng.choice(personas)
+        mentions.append(m)
+    return {"brand": f"large-{seed}", "mentions": mentions}
@@ -1,24 +1,190 @@
-import re
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Iterable, List, Optional, Tuple, Union
+
+from .cache import AnalysisCache, content_key
+from .dedup import DuplicateIndex, simhash
+from .entities import EntityLinker
+from .extract import WORD_RE, extract_text, looks_like_html
+from .stream import StreamingAnalyzer
+
+# Bump whenever analyze() results change shape or meaning; cached results
+# of other versions are then never read
+ANALYZER_VERSION = "1"
+
+_worker_analyzer = None
+
+
+def _init_worker(analyzer):
+    # Ship the analyzer (and its entity automaton) once per worker, not per task
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_in_worker(docs, html):
+    return _worker_analyzer._analyze_batch(docs, html)
+
 
 class ContentAnalyzer:
     """
     Processes and summarizes page content, extracting entities and assessing quality, relevance and tone.
+
+    Args:
+        linker: Entity gazetteer; when given, ``analyze`` also reports the
+            graph entities mentioned in the text.
+        cache: Results cache; pages whose extracted text was analyzed before,
+            by the same ``version``, are read from it instead.
     """
 
-    def analyze(self, text: str) -> dict:
+    def __init__(self, linker: Optional[EntityLinker] = None, cache: Optional[AnalysisCache] = None):
+        self.linker = linker
+        self.cache = cache
+
+    @property
+    def version(self) -> str:
+        """Identifies what ``analyze`` computes: the analyzer and its entities."""
+        if self.linker is None:
+            return ANALYZER_VERSION
+        return f"{ANALYZER_VERSION}+entities:{self.linker.fingerprint()}"
+
+    def analyze(self, text: str, html: Optional[bool] = None) -> dict:
         """
         Analyze the provided text and return summary metrics.
 
         Args:
-            text: The text to analyze.
+            text: The text to analyze, plain or HTML.
+            html: Whether ``text`` is HTML; detected from its tags when None.
+                Markup, scripts and styles are stripped before counting.
 
         Returns:
-            A dictionary with word_count and top_words (list of tuples).
+            A dictionary with word_count and top_words (list of tuples), plus
+            entities (see ``EntityLinker.link``) when a linker is set.
         """
+        return self._analyze_batch([text], html)[0]
+
+    def _analyze_batch(self, docs: List[str], html: Optional[bool]) -> List[dict]:
+        texts = [extract_text(doc) if html or (html is None and looks_like_html(doc)) else doc for doc in docs]
+        if self.cache is None:
+            return [self._analyze(text) for text in texts]
+        version = self.version
+        keys = [content_key(text, version) for text in texts]
+        found = self.cache.get_many(keys)
+        fresh = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in fresh:
+                fresh[key] = self._analyze(text)
+        if fresh:
+            self.cache.put_many(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    def _analyze(self, text: str) -> dict:
         # Normalize text to lowercase and extract words
-        words = re.findall(r"\b\w+\b", text.lower())
+        words = WORD_RE.findall(text.lower())
         word_count = len(words)
         counts = Counter(words)
         top_words = counts.most_common(5)
-        return {"word_count": word_count, "top_words": top_words}
+        result = {"word_count": word_count, "top_words": top_words}
+        if self.linker is not None:
+            result["entities"] = self.linker.link(text)
+        return result
+
+    def analyze_many(
+        self,
+        docs: Iterable[str],
+        workers: Optional[int] = None,
+        html: Optional[bool] = None,
+    ) -> List[dict]:
+        """
+        Analyze many documents across a process pool.
+
+        Args:
+            docs: The documents to analyze.
+            workers: Worker processes; defaults to the CPU count. With one
+                worker, or one document, everything runs in this process.
+            html: Passed to ``analyze`` for every document.
+
+        Returns:
+            One ``analyze`` result per document, in input order.
+        """
+        docs = list(docs)
+        workers = min(workers or os.cpu_count() or 1, len(docs))
+        if workers <= 1:
+            return self._analyze_batch(docs, html)
+        # A few chunks per worker amortize pickling (and cache round trips)
+        # without starving the pool
+        size = max(1, len(docs) // (4 * workers))
+        chunks = [docs[i:i + size] for i in range(0, len(docs), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+            return [result for batch in pool.map(_analyze_in_worker, chunks, [html] * len(chunks)) for result in batch]
+
+    def analyze_unique(
+        self,
+        docs: Iterable[Tuple[str, str]],
+        index: DuplicateIndex,
+        workers: Optional[int] = None,
+        html: Optional[bool] = None,
+    ) -> List[dict]:
+        """
+        Analyze ``(doc_id, text)`` pairs once per group of near-duplicates.
+
+        Args:
+            docs: Document ids and texts, plain or HTML.
+            index: Near-duplicate index every document is fingerprinted
+                into (after markup stripping).
+            workers: Passed to ``analyze_many``.
+            html: Whether the texts are HTML; detected per text when None.
+
+        Returns:
+            One ``analyze`` result per document, in input order, with its
+            doc_id and canonical id added. Documents whose canonical copy
+            is in this batch share its result rather than being analyzed.
+        """
+        ids, canonicals, texts, first = [], [], [], {}
+        for doc_id, text in docs:
+            if html or (html is None and looks_like_html(text)):
+                text = extract_text(text)
+            # Texts without words all fingerprint to 0: never treat them as duplicates
+            canonical = index.add(doc_id, simhash(text)) if WORD_RE.search(text) else doc_id
+            ids.append(doc_id)
+            canonicals.append(canonical)
+            # A canonical copy from an earlier batch is represented by its first duplicate here
+            if canonical not in first:
+                first[canonical] = len(texts)
+                texts.append(text)
+        results = self.analyze_many(texts, workers=workers, html=False)
+        return [
+            {**results[first[canonical]], "doc_id": doc_id, "canonical": canonical}
+            for doc_id, canonical in zip(ids, canonicals)
+        ]
+
+    def analyze_stream(
+        self,
+        chunks: Union[Iterable[Union[str, bytes]], IO],
+        html: bool = False,
+        capacity: int = 4096,
+        chunk_size: int = 1 << 20,
+    ) -> dict:
+        """
+        Analyze text of any size in bounded memory.
+
+        Args:
+            chunks: An iterable of str or UTF-8 bytes chunks (a generator,
+                ``response.iter_content()``...) or a file object, read
+                ``chunk_size`` at a time.
+            html: Strip markup, scripts and styles while streaming.
+            capacity: Words tracked for top_words; see ``content_analyzer.stream``
+                for the accuracy this buys.
+
+        Returns:
+            A dictionary with an exact word_count, top_words and max_error,
+            the largest possible undercount of a top_words count.
+        """
+        if hasattr(chunks, "read"):
+            stream = chunks
+            chunks = iter(lambda: stream.read(chunk_size), stream.read(0))
+        analyzer = StreamingAnalyzer(capacity=capacity, html=html)
+        for chunk in chunks:
+            analyzer.feed(chunk)
+        return analyzer.close()
@@ -0,0 +1,192 @@
+"""
+Disk-backed cache of analysis results, keyed by content.
+
+Keys are hashes of the extracted text and the version of whatever produced
+the value (``ContentAnalyzer.version``), so an unchanged page is never
+re-analyzed and a new analyzer never sees stale results. Entries live in a
+SQLite database in WAL mode: any number of processes can read while one
+writes, each through its own connection. Values are pickled, so only open
+cache files you wrote yourself.
+
+The database is bounded by ``max_bytes`` of pickled values. Reads record an
+access time; once a write takes the total over the budget, the least
+recently used entries are evicted down to 90% of it. Access times are
+buffered in memory and written with the next ``put_many`` (or ``flush``),
+so lookups never wait for the write lock.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS total (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL);
+INSERT OR IGNORE INTO total VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+    BEGIN UPDATE total SET size = size + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF size ON results
+    BEGIN UPDATE total SET size = size + NEW.size - OLD.size; END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+    BEGIN UPDATE total SET size = size - OLD.size; END;
+"""
+# SQLite caps the host parameters of one statement
+_BATCH = 500
+
+
+def content_key(text: str, version: str) -> str:
+    """Cache key of ``text`` as processed by ``version``."""
+    h = hashlib.blake2b(version.encode("utf-8") + b"\0", digest_size=16)
+    h.update(text.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Size-bounded LRU cache in a SQLite file, shared between processes.
+
+    Args:
+        path: Database file; created if missing.
+        max_bytes: Budget for the pickled values.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched: Dict[str, float] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not cross a fork; each process opens its own
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            self._pid = os.getpid()
+            self._touched.clear()
+        return self._db
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_db=None, _pid=None, _touched={})
+        return state
+
+    def get(self, key: str) -> Any:
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many({key: value})
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """The cached values of ``keys``; missing keys are left out."""
+        keys = list(dict.fromkeys(keys))
+        db = self._connect()
+        found = {}
+        for start in range(0, len(keys), _BATCH):
+            chunk = keys[start:start + _BATCH]
+            rows = db.execute(
+                f"SELECT key, value FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update((key, pickle.loads(value)) for key, value in rows)
+        now = time.time()
+        self._touched.update(dict.fromkeys(found, now))
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        """Store values in one transaction, then evict if over budget."""
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(data) <= self.max_bytes:
+                rows.append((key, data, len(data), now))
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            self._write_touched(db)
+            db.executemany(
+                "INSERT INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, accessed = excluded.accessed",
+                rows,
+            )
+            self._evict(db)
+
+    def flush(self) -> None:
+        """Write buffered access times."""
+        if self._touched:
+            db = self._connect()
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                self._write_touched(db)
+
+    def _write_touched(self, db):
+        db.executemany(
+            "UPDATE results SET accessed = MAX(accessed, ?) WHERE key = ?",
+            [(t, key) for key, t in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _evict(self, db):
+        (size,) = db.execute("SELECT size FROM total").fetchone()
+        if size <= self.max_bytes:
+            return
+        excess = size - int(self.max_bytes * 0.9)
+        # Oldest first, until the running total of their sizes covers the excess
+        victims = db.execute(
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed, key) - size AS before "
+            "FROM results ORDER BY accessed, key) WHERE before < ?",
+            (excess,),
+        ).fetchall()
+        db.executemany("DELETE FROM results WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._connect() as db:
+            db.execute("DELETE FROM results")
+        self._touched.clear()
+
+    def close(self) -> None:
+        if self._db is not None and self._pid == os.getpid():
+            self.flush()
+            self._db.close()
+        self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        (size,) = self._connect().execute("SELECT size FROM total").fetchone()
+        return {
+            "entries": len(self),
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,185 @@
+"""
+Near-duplicate detection with SimHash and a banded lookup index.
+
+``simhash`` turns the visible text of a document into a 64-bit fingerprint:
+every 3-word shingle is hashed and votes on each bit, so documents sharing
+most shingles (a syndicated press release under another header, the next
+page of a listing) get fingerprints a few bits apart. Two documents are
+near-duplicates when their fingerprints differ in at most ``max_distance``
+bits; 3 of 64 is the usual choice for web pages.
+
+``DuplicateIndex`` cuts fingerprints into ``max_distance + 1`` bands. By the
+pigeonhole principle two fingerprints within ``max_distance`` bits agree
+exactly on at least one band, so a lookup only compares the documents that
+share a band value with the query. Each band is a sorted array searched with
+``np.searchsorted``; documents added since the last merge sit in small
+per-band dictionaries and are merged in once they reach an eighth of the
+index. The index saves to and loads from a single ``.npz`` file.
+
+    index = DuplicateIndex.load("pages.npz") if os.path.exists("pages.npz") else DuplicateIndex()
+    canonical = index.add(url, simhash(extract_text(html)))
+    if canonical != url:
+        ...  # reuse the analysis of ``canonical``
+    index.save("pages.npz")
+"""
+import hashlib
+import json
+from array import array
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .extract import WORD_RE
+
+BITS = 64
+SHINGLE = 3
+
+
+def simhash(text: str, shingle: int = SHINGLE) -> int:
+    """64-bit SimHash of the lowercased word shingles of ``text``."""
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return 0
+    n = max(len(words) - shingle + 1, 1)
+    digests = b"".join(
+        hashlib.blake2b(" ".join(words[i:i + shingle]).encode("utf-8"), digest_size=8).digest()
+        for i in range(n)
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8), bitorder="little").reshape(n, BITS)
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - n
+    return int(np.packbits(votes > 0, bitorder="little").view("<u8")[0])
+
+
+class DuplicateIndex:
+    """
+    Fingerprints of many documents and the canonical copy of each.
+
+    Args:
+        max_distance: Largest Hamming distance between the fingerprints of
+            two near-duplicates, 0 to 63. Lookups cost more as it grows: the
+            bands get narrower and match more unrelated documents.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance < BITS:
+            raise ValueError(f"max_distance must be in [0, {BITS}), got {max_distance!r}")
+        self.max_distance = max_distance
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._fingerprints = array("Q")
+        self._canonical = array("q")
+        # Rows superseded by a newer fingerprint of the same id; never matched
+        self._dead = set()
+
+        bands = max_distance + 1
+        widths = [BITS // bands + (b < BITS % bands) for b in range(bands)]
+        self._shifts = [sum(widths[:b]) for b in range(bands)]
+        self._masks = [(1 << w) - 1 for w in widths]
+        # Merged part: per band, band values sorted and the rows holding them
+        self._keys = [np.zeros(0, dtype=np.uint64) for _ in range(bands)]
+        self._sorted_rows = [np.zeros(0, dtype=np.int64) for _ in range(bands)]
+        self._pending: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._n_pending = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._rows
+
+    def fingerprint(self, doc_id: str) -> int:
+        return self._fingerprints[self._rows[doc_id]]
+
+    def canonical(self, doc_id: str) -> str:
+        """The document ``doc_id`` was found to duplicate, or ``doc_id`` itself."""
+        return self.ids[self._canonical[self._rows[doc_id]]]
+
+    def query(self, fingerprint: int) -> List[Tuple[str, int]]:
+        """``(doc_id, distance)`` of every indexed near-duplicate, closest first."""
+        return [(self.ids[row], distance) for row, distance in self._matches(fingerprint)]
+
+    def _matches(self, fingerprint):
+        candidates = set()
+        for band, (shift, mask) in enumerate(zip(self._shifts, self._masks)):
+            value = (fingerprint >> shift) & mask
+            keys = self._keys[band]
+            # A Python int would make numpy compare in float64, over a cast copy of ``keys``
+            key = np.uint64(value)
+            lo = keys.searchsorted(key, side="left")
+            hi = keys.searchsorted(key, side="right")
+            candidates.update(self._sorted_rows[band][lo:hi].tolist())
+            candidates.update(self._pending[band].get(value, ()))
+        candidates -= self._dead
+        fingerprints, limit = self._fingerprints, self.max_distance
+        # Tens of candidates per lookup: plain ints beat numpy's per-call overhead
+        matches = [(d, row) for row in candidates if (d := bin(fingerprints[row] ^ fingerprint).count("1")) <= limit]
+        matches.sort()
+        return [(row, d) for d, row in matches]
+
+    def add(self, doc_id: str, fingerprint: int) -> str:
+        """
+        Index a document and return its canonical id: the canonical copy of
+        its closest indexed near-duplicate, or ``doc_id`` when it has none.
+        Re-adding a known id with the same fingerprint returns its existing
+        canonical; with another one (the page changed) the id is indexed
+        afresh and its old fingerprint is no longer matched.
+        """
+        old = self._rows.get(doc_id)
+        if old is not None:
+            if self._fingerprints[old] == fingerprint:
+                return self.canonical(doc_id)
+            self._dead.add(old)
+        matches = self._matches(fingerprint)
+        row = len(self.ids)
+        canonical = self._canonical[matches[0][0]] if matches else row
+        self.ids.append(doc_id)
+        self._rows[doc_id] = row
+        self._fingerprints.append(fingerprint)
+        self._canonical.append(canonical)
+        for band, (shift, mask) in enumerate(zip(self._shifts, self._masks)):
+            self._pending[band].setdefault((fingerprint >> shift) & mask, []).append(row)
+        self._n_pending += 1
+        if self._n_pending >= max(1024, len(self.ids) // 8):
+            self._merge()
+        return self.ids[canonical]
+
+    def _merge(self):
+        if not self._n_pending:
+            return
+        fingerprints = np.frombuffer(self._fingerprints, dtype=np.uint64)
+        new_rows = np.arange(len(self.ids) - self._n_pending, len(self.ids), dtype=np.int64)
+        for band, (shift, mask) in enumerate(zip(self._shifts, self._masks)):
+            new_keys = (fingerprints[new_rows] >> np.uint64(shift)) & np.uint64(mask)
+            order = np.argsort(new_keys, kind="stable")
+            at = np.searchsorted(self._keys[band], new_keys[order], side="right")
+            self._keys[band] = np.insert(self._keys[band], at, new_keys[order])
+            self._sorted_rows[band] = np.insert(self._sorted_rows[band], at, new_rows[order])
+            self._pending[band].clear()
+        self._n_pending = 0
+
+    def save(self, path: str):
+        self._merge()
+        np.savez(
+            path,
+            ids=np.array(self.ids, dtype=str),
+            fingerprints=np.frombuffer(self._fingerprints, dtype=np.uint64),
+            canonical=np.frombuffer(self._canonical, dtype=np.int64),
+            keys=np.stack(self._keys) if self.ids else np.zeros((len(self._keys), 0), dtype=np.uint64),
+            sorted_rows=np.stack(self._sorted_rows) if self.ids else np.zeros((len(self._keys), 0), dtype=np.int64),
+            dead=np.array(sorted(self._dead), dtype=np.int64),
+            meta=json.dumps({"max_distance": self.max_distance}),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "DuplicateIndex":
+        with np.load(path) as data:
+            index = cls(**json.loads(str(data["meta"])))
+            index.ids = data["ids"].tolist()
+            # Later rows of an id supersede earlier ones
+            index._rows = {doc_id: row for row, doc_id in enumerate(index.ids)}
+            index._dead = set(data["dead"].tolist()) if "dead" in data else set()
+            index._fingerprints = array("Q", data["fingerprints"].tobytes())
+            index._canonical = array("q", data["canonical"].tobytes())
+            index._keys = list(data["keys"])
+            index._sorted_rows = list(data["sorted_rows"])
+        return index
@@ -0,0 +1,272 @@
+"""
+Gazetteer entity linking against the knowledge graph's entities.
+
+Entity ``displayName`` and ``slug`` values are compiled into a token-level
+Aho-Corasick automaton: names are split into words with the analyzer's
+``WORD_RE`` (so "acme-dental", "Acme Dental" and "ACME dental" are the same
+name) and every document is scanned once, word by word, whatever the number
+of names. Matches are reported with character offsets into the original text.
+
+The automaton is updated in place when entities change. Adding a name
+inserts its words into the trie and removing one drops its outputs; the
+failure links, which any insertion can invalidate, are recomputed lazily in
+one pass over the trie before the next scan.
+
+    linker = EntityLinker.from_graph_service("http://localhost:8001")
+    linker.link("Acme Dental launched the SmileKit 2 toothbrush")
+    # [{"entity_id": "...", "name": "Acme Dental", "start": 0, "end": 11}, ...]
+"""
+import hashlib
+import json
+import pickle
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from .extract import WORD_RE
+
+NAME_FIELDS = ("displayName", "slug")
+PAGE_LIMIT = 200
+
+
+def name_tokens(name: str) -> tuple:
+    """The words of an entity name, lowercased, as matched against text."""
+    return tuple(WORD_RE.findall(name.lower()))
+
+
+def load_snapshot(path: str) -> List[dict]:
+    """
+    Entities from a local snapshot: a JSON list, a graph-service
+    ``{"entities": [...]}`` response, or JSONL with one entity per line.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data["entities"] if isinstance(data, dict) else data
+
+
+def fetch_entities(base_url: str, entity_type: Optional[str] = None, client=None) -> List[dict]:
+    """Every entity of graph-service ``GET /entities``, paging ``PAGE_LIMIT`` at a time."""
+    import httpx
+
+    params = {"limit": PAGE_LIMIT}
+    if entity_type:
+        params["type"] = entity_type
+    own = client is None
+    client = client or httpx.Client(base_url=base_url, timeout=30.0)
+    entities = []
+    try:
+        while True:
+            response = client.get("/entities", params={**params, "offset": len(entities)})
+            response.raise_for_status()
+            page = response.json()["entities"]
+            entities.extend(page)
+            if len(page) < PAGE_LIMIT:
+                return entities
+    finally:
+        if own:
+            client.close()
+
+
+class EntityLinker:
+    """
+    Aho-Corasick automaton over entity names.
+
+    Node 0 is the root. ``_goto[n]`` maps a word to the child node,
+    ``_out[n]`` holds the entity ids whose name ends at ``n`` and
+    ``_depth[n]`` is the number of words from the root. ``_link[n]`` is the
+    nearest node along the failure chain with outputs, so a scan only visits
+    nodes that report matches.
+    """
+
+    def __init__(self, entities: Iterable[dict] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[set] = [set()]
+        self._depth: List[int] = [0]
+        self._fail: List[int] = [0]
+        self._link: List[int] = [0]
+        self._names: Dict[str, tuple] = {}
+        self._dirty = False
+        self._fingerprint = None
+        self.update(entities)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, entity_id):
+        return entity_id in self._names
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> "EntityLinker":
+        return cls(load_snapshot(path))
+
+    @classmethod
+    def from_graph_service(cls, base_url: str, entity_type: Optional[str] = None, client=None) -> "EntityLinker":
+        return cls(fetch_entities(base_url, entity_type, client))
+
+    # ---------------------------
+    # BUILDING
+    # ---------------------------
+
+    @staticmethod
+    def _entity_names(entity: dict) -> tuple:
+        names = {name_tokens(entity[field]) for field in NAME_FIELDS if entity.get(field)}
+        names.discard(())
+        return tuple(sorted(names))
+
+    def _find(self, tokens):
+        node = 0
+        for token in tokens:
+            node = self._goto[node].get(token)
+            if node is None:
+                return None
+        return node
+
+    def _insert(self, tokens, entity_id):
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][token] = child
+                self._goto.append({})
+                self._out.append(set())
+                self._depth.append(self._depth[node] + 1)
+                self._fail.append(0)
+                self._link.append(0)
+                self._dirty = True
+            node = child
+        if not self._out[node]:
+            # A node gaining its first output can become a link target
+            self._dirty = True
+        self._out[node].add(entity_id)
+
+    def add(self, entity: dict):
+        """Add or replace one entity (a dict with ``id`` and ``displayName``/``slug``)."""
+        entity_id = entity["id"]
+        names = self._entity_names(entity)
+        if self._names.get(entity_id) == names:
+            return
+        self.remove(entity_id)
+        for tokens in names:
+            self._insert(tokens, entity_id)
+        self._names[entity_id] = names
+        self._fingerprint = None
+
+    def remove(self, entity_id):
+        """Drop an entity. Its trie nodes stay; they match nothing until reused."""
+        if entity_id in self._names:
+            self._fingerprint = None
+        for tokens in self._names.pop(entity_id, ()):
+            node = self._find(tokens)
+            if node is not None:
+                self._out[node].discard(entity_id)
+
+    def update(self, entities: Iterable[dict]):
+        """Add or replace entities; unchanged ones cost a dictionary lookup."""
+        for entity in entities:
+            self.add(entity)
+
+    def sync(self, entities: Iterable[dict]):
+        """Make the linker hold exactly ``entities``, touching only what changed."""
+        entities = list(entities)
+        keep = {entity["id"] for entity in entities}
+        for entity_id in [e for e in self._names if e not in keep]:
+            self.remove(entity_id)
+        self.update(entities)
+
+    def fingerprint(self) -> str:
+        """Hash of every entity id and name; changes whenever matching can."""
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            for entity_id, names in sorted(self._names.items(), key=lambda item: str(item[0])):
+                h.update(repr((entity_id, names)).encode("utf-8"))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def _build_links(self):
+        goto, fail, link, out = self._goto, self._fail, self._link, self._out
+        queue = deque()
+        for child in goto[0].values():
+            fail[child] = link[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(token, 0)
+                fail[child] = target
+                link[child] = target if out[target] else link[target]
+                queue.append(child)
+        self._dirty = False
+
+    # ---------------------------
+    # MATCHING
+    # ---------------------------
+
+    def link(self, text: str, overlapping: bool = False) -> List[dict]:
+        """
+        Entity mentions in ``text``, in order of position.
+
+        Args:
+            text: Plain text; strip HTML first with ``extract.extract_text``.
+            overlapping: Report every match. By default the longest match
+                wins wherever matches overlap, leftmost first, so
+                "Acme Dental" does not also yield "Acme".
+
+        Returns:
+            ``{"entity_id", "name", "start", "end"}`` dicts, where ``name`` is
+            ``text[start:end]``. Entities sharing a name are all reported for
+            the same span.
+        """
+        if self._dirty:
+            self._build_links()
+        goto, fail, link, out, depth = self._goto, self._fail, self._link, self._out, self._depth
+        starts: List[int] = []
+        spans = []
+        node = 0
+        for i, match in enumerate(WORD_RE.finditer(text)):
+            starts.append(match.start())
+            token = match.group().lower()
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            state = node if out[node] else link[node]
+            while state:
+                if out[state]:
+                    spans.append((starts[i - depth[state] + 1], match.end(), state))
+                state = link[state]
+
+        spans.sort(key=lambda s: (s[0], -s[1]))
+        mentions = []
+        end = -1
+        for start, stop, state in spans:
+            if not overlapping and start < end:
+                continue
+            end = stop
+            name = text[start:stop]
+            mentions.extend(
+                {"entity_id": entity_id, "name": name, "start": start, "end": stop}
+                for entity_id in sorted(out[state], key=str)
+            )
+        return mentions
+
+    # ---------------------------
+    # PERSISTENCE
+    # ---------------------------
+
+    def save(self, path: str):
+        """Pickle the compiled automaton, so a restart skips rebuilding it."""
+        if self._dirty:
+            self._build_links()
+        with open(path, "wb") as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "EntityLinker":
+        linker = cls.__new__(cls)
+        with open(path, "rb") as f:
+            linker.__dict__.update(pickle.load(f))
+        return linker
@@ -0,0 +1,162 @@
+"""
+Bounded-memory streaming word statistics.
+
+Text arrives in chunks of any size (str or bytes). ``word_count`` is exact.
+Word frequencies are kept in a Misra-Gries summary of at most ``capacity``
+words, the mergeable dual of Space-Saving: each chunk is counted exactly and
+merged in, and whenever more than ``capacity`` words are tracked, every count
+is lowered by the (capacity + 1)-th largest one and the non-positive ones are
+dropped.
+
+Accuracy, with N the total number of words:
+
+* While the text has at most ``capacity`` distinct words nothing is ever
+  dropped and ``top_words`` equals ``ContentAnalyzer.analyze``'s, except
+  that words longer than ``MAX_WORD`` characters are counted under their
+  first ``MAX_WORD``.
+* Otherwise every reported count is a lower bound on the true count, low by
+  at most ``max_error`` (reported, and never above N / (capacity + 1)), and
+  every word more frequent than ``max_error`` is still tracked. So the top 5
+  are exact whenever the 5th most frequent word leads the 6th by more than
+  ``max_error``; counts are within ``max_error`` of the truth regardless.
+
+Memory is ``capacity`` entries plus the distinct words of one chunk. A word
+running on across chunks is held back as at most ``MAX_WORD`` characters, and
+the HTML parser is fed 64K characters at a time and never holds more than
+one piece of a script, style or comment waiting for its end.
+"""
+import codecs
+import heapq
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Union
+
+
+# Longest word kept; longer ones are counted under this many leading characters
+MAX_WORD = 256
+
+_WORD = re.compile(r"(\w{1,%d})\w*" % MAX_WORD)
+_WORD_CHAR = re.compile(r"\w")
+_LEADING_WORD = re.compile(r"\w*")
+
+
+class _TextExtractor(HTMLParser):
+    # Incremental counterpart of extract.extract_text: passes visible text on
+    _SKIP = {"script", "style", "noscript", "template"}
+    PIECE = 1 << 16
+    # Enough of a held-back script, style or comment to hold its closing tag
+    _KEEP = 256
+
+    def __init__(self, sink):
+        super().__init__(convert_charrefs=True)
+        self.sink = sink
+        self.skipping = 0
+
+    def feed(self, data):
+        for start in range(0, len(data), self.PIECE):
+            super().feed(data[start:start + self.PIECE])
+            if len(self.rawdata) > self.PIECE:
+                self._drop_hidden()
+
+    def _drop_hidden(self):
+        # HTMLParser buffers a script or style body (and a comment) until its
+        # closing tag arrives, rebuilding the buffer on every feed. None of it
+        # is visible text, so only the end that may start that tag is kept
+        if self.cdata_elem:
+            self.rawdata = self.rawdata[-self._KEEP:]
+        elif self.rawdata.startswith("<!--"):
+            self.rawdata = "<!--" + self.rawdata[-self._KEEP:]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self.skipping += 1
+        self.sink(" ")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self.skipping:
+            self.skipping -= 1
+        self.sink(" ")
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.sink(data)
+
+
+class StreamingAnalyzer:
+    """
+    Incremental ``analyze``: ``feed`` chunks, then ``close`` for the result.
+
+    Args:
+        capacity: Maximum number of words tracked for ``top_words``.
+        html: Strip markup (skipping scripts and styles) as it streams in.
+        top: Number of ``top_words`` to report.
+    """
+
+    def __init__(self, capacity: int = 4096, html: bool = False, top: int = 5):
+        self.capacity = capacity
+        self.top = top
+        self.word_count = 0
+        self.max_error = 0
+        self.counts = {}
+        self._tail = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._html = _TextExtractor(self._feed_text) if html else None
+
+    def feed(self, chunk: Union[str, bytes]) -> None:
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        if self._html is not None:
+            self._html.feed(chunk)
+        else:
+            self._feed_text(chunk)
+
+    def _feed_text(self, text: str) -> None:
+        text = text.lower()
+        start = 0
+        if self._tail:
+            # Finish the word held back at the end of the previous chunk
+            start = _LEADING_WORD.match(text).end()
+            self._tail += text[:max(0, min(start, MAX_WORD - len(self._tail)))]
+            if start == len(text):
+                return
+        words = _WORD.findall(text, start)
+        if self._tail:
+            words.insert(0, self._tail)
+            self._tail = ""
+        if words and _WORD_CHAR.match(text, len(text) - 1):
+            # The last word may continue in the next chunk; hold it back until then
+            self._tail = words.pop()
+        self._count(words)
+
+    def _count(self, words) -> None:
+        if not words:
+            return
+        self.word_count += len(words)
+        counts = self.counts
+        for word, n in Counter(words).items():
+            counts[word] = counts.get(word, 0) + n
+        if len(counts) > self.capacity:
+            threshold = heapq.nlargest(self.capacity + 1, counts.values())[-1]
+            self.counts = {w: c - threshold for w, c in counts.items() if c > threshold}
+            self.max_error += threshold
+
+    def close(self) -> dict:
+        """
+        Flush buffered text and summarize everything fed so far.
+
+        Returns:
+            A dictionary with word_count and top_words like ``analyze``, plus
+            max_error, the largest possible undercount of any top_words count
+            (0 when the counts are exact).
+        """
+        if self._html is not None:
+            self._html.feed(self._decoder.decode(b"", final=True))
+            self._html.close()
+        else:
+            self._feed_text(self._decoder.decode(b"", final=True))
+        self._count([self._tail] if self._tail else [])
+        self._tail = ""
+        # Same tie order as Counter.most_common: first seen first
+        top_words = heapq.nlargest(self.top, self.counts.items(), key=lambda kv: kv[1])
+        return {"word_count": self.word_count, "top_words": top_words, "max_error": self.max_error}
@@ -1,11 +1,30 @@
+import asyncio
+from typing import Optional
+
 import requests
-from bs4 import BeautifulSoup
+
+from .cache import CrawlCache
+from .engine import crawl_many
+from .metadata import CHUNK_BYTES, MAX_BODY_BYTES, describe_page, read_capped
+
 
 class CrawlerSimulator:
     """
     Simulates LLM-powered web crawlers to explore the brand's online presence.
+
+    Args:
+        cache: Validators of earlier crawls (``cache.CrawlCache``). Requests
+            are then conditional, and a page that has not changed comes back
+            with empty content and ``metadata["not_modified"]`` set, without
+            being parsed.
+        max_bytes: Largest body kept per page; longer ones are cut there and
+            flagged ``truncated``. None for no limit.
     """
 
+    def __init__(self, cache: Optional[CrawlCache] = None, max_bytes: Optional[int] = MAX_BODY_BYTES):
+        self.cache = cache
+        self.max_bytes = max_bytes
+
     def crawl(self, url: str) -> dict:
         """
         Fetch a webpage and return its content and basic metadata.
@@ -14,19 +33,42 @@ class CrawlerSimulator:
             url: The URL to crawl.
 
         Returns:
-            A dictionary containing the URL, raw HTML content, and metadata such as title and content length.
+            A dictionary containing the URL, raw HTML content, and metadata:
+            title, description, canonical, language and json_ld from the
+            page head (see ``metadata.head_metadata``), length and truncated.
+            Use ``metadata.parse_dom`` for a full tree of the page.
         """
+        headers = self.cache.conditional_headers(url) if self.cache is not None else None
         try:
-            response = requests.get(url, timeout=10)
-            content = response.text
+            # Streamed, so the download stops at max_bytes
+            with requests.get(url, timeout=10, headers=headers, stream=True) as response:
+                body, truncated = read_capped(response.iter_content(CHUNK_BYTES), self.max_bytes)
         except Exception as e:
             # If any error occurs during the request, return error info.
             return {"url": url, "content": "", "metadata": {"error": str(e)}}
 
-        soup = BeautifulSoup(content, "html.parser")
-        title = soup.title.string.strip() if soup.title and soup.title.string else None
-        metadata = {
-            "title": title,
-            "length": len(content),
-        }
-        return {"url": url, "content": content, "metadata": metadata}
+        return describe_page(
+            url, response.status_code, response.headers, body, response.encoding, truncated, self.cache
+        )
+
+    def crawl_many(self, urls, **options) -> list:
+        """
+        Fetch many URLs concurrently over pooled keep-alive connections.
+
+        Args:
+            urls: The URLs to crawl.
+            **options: ``engine.CrawlEngine`` limits (concurrency, per_host,
+                per_host_rate, retries...). This crawler's cache is used
+                unless another is given.
+
+        Returns:
+            ``crawl``-shaped dicts in completion order. Use
+            ``engine.crawl_many`` from async code to consume them as they arrive.
+        """
+        options.setdefault("cache", self.cache)
+        options.setdefault("max_bytes", self.max_bytes)
+
+        async def collect():
+            return [result async for result in crawl_many(urls, **options)]
+
+        return asyncio.run(collect())
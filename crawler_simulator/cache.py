@@ -0,0 +1,208 @@
+"""
+Persistent validators for conditional re-crawls.
+
+``CrawlCache`` remembers, per URL, the ``ETag`` and ``Last-Modified`` of the
+last response and a hash of its body, in a SQLite file. The next crawl of
+the URL sends ``If-None-Match``/``If-Modified-Since``; a ``304`` or a body
+with the same hash is reported as not modified, so downstream stages can
+skip the page. Servers that ignore validators still cost a download, but
+not the parse and analysis that would follow it.
+
+    cache = CrawlCache("crawl.db")
+    CrawlerSimulator(cache=cache).crawl(url)        # or CrawlEngine(cache=cache)
+    print(cache.report())
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    title TEXT,
+    fetched_at REAL NOT NULL,
+    links TEXT
+)
+"""
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+NOT_MODIFIED = "not_modified"
+# States whose content downstream stages have already seen
+SKIPPABLE = (UNCHANGED, NOT_MODIFIED)
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class CrawlCache:
+    """
+    Validators and content hashes of crawled URLs.
+
+    Safe to share between threads: ``CrawlEngine`` reads and records pages
+    from worker threads so SQLite never blocks its event loop.
+
+    Args:
+        path: SQLite file; created if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        if "links" not in {row[1] for row in self._db.execute("PRAGMA table_info(pages)")}:
+            # Files written before outlinks were kept
+            self._db.execute("ALTER TABLE pages ADD COLUMN links TEXT")
+        # Serializes record's read-then-write and the counters it updates
+        self._lock = threading.Lock()
+        self.counts = {NEW: 0, CHANGED: 0, UNCHANGED: 0, NOT_MODIFIED: 0}
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    def entry(self, url: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT etag, last_modified, content_hash, length, title, fetched_at FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ("etag", "last_modified", "content_hash", "length", "title", "fetched_at")
+        return dict(zip(keys, row))
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 if the page is unchanged."""
+        entry = self.entry(url)
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(
+        self,
+        url: str,
+        status: int,
+        headers: Mapping[str, str],
+        content: bytes,
+        title: Union[str, Callable[[], Optional[str]], None] = None,
+    ) -> Optional[dict]:
+        """
+        Store the validators of a response.
+
+        Args:
+            title: The page title, or a function computing it that is only
+                called for new or changed pages, so unchanged ones are never
+                parsed.
+
+        Returns:
+            The stored entry with its ``state``: ``new``, ``changed``,
+            ``not_modified`` (a 304) or ``unchanged`` (same body hash); the
+            last two are ``SKIPPABLE``. None for error responses, which are
+            neither stored nor counted, and for a 304 to an unknown URL.
+        """
+        if status >= 400:
+            return None
+        with self._lock:
+            return self._record(url, status, headers, content, title)
+
+    def _record(self, url, status, headers, content, title):
+        entry = self.entry(url)
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if status == 304 and entry is not None:
+            state = NOT_MODIFIED
+            self.bytes_saved += entry["length"]
+            digest, length, title = entry["content_hash"], entry["length"], entry["title"]
+            # A 304 may omit validators that still hold
+            etag = etag or entry["etag"]
+            last_modified = last_modified or entry["last_modified"]
+        elif status == 304:
+            # A 304 for a page we have no record of (validators from elsewhere)
+            return None
+        else:
+            digest, length = content_hash(content), len(content)
+            self.bytes_downloaded += length
+            if entry is not None and entry["content_hash"] == digest:
+                state, title = UNCHANGED, entry["title"]
+            else:
+                state = NEW if entry is None else CHANGED
+                title = title() if callable(title) else title
+        self._db.execute(
+            "INSERT INTO pages (url, etag, last_modified, content_hash, length, title, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (url) DO UPDATE SET "
+            "etag = excluded.etag, last_modified = excluded.last_modified, "
+            "content_hash = excluded.content_hash, length = excluded.length, title = excluded.title, "
+            "fetched_at = excluded.fetched_at",
+            (url, etag, last_modified, digest, length, title, time.time()),
+        )
+        self.counts[state] += 1
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": digest,
+            "length": length,
+            "title": title,
+            "state": state,
+        }
+
+    def set_links(self, url: str, links: List[str]) -> None:
+        """
+        Remember the outlinks of a page just crawled, so a later crawl that
+        finds it unchanged can follow them without its content.
+        """
+        self._db.execute("UPDATE pages SET links = ? WHERE url = ?", (json.dumps(links), url))
+
+    def links(self, url: str) -> Optional[List[str]]:
+        """Outlinks stored with ``set_links``; None if never stored."""
+        row = self._db.execute("SELECT links FROM pages WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row is not None and row[0] is not None else None
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        crawled = sum(self.counts.values())
+        skipped = self.counts[NOT_MODIFIED] + self.counts[UNCHANGED]
+        return {
+            "urls": len(self),
+            "crawled": crawled,
+            **self.counts,
+            "skip_rate": skipped / crawled if crawled else 0.0,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def report(self) -> str:
+        """One-paragraph summary of this session's re-crawl savings."""
+        s = self.stats()
+        total = s["bytes_downloaded"] + s["bytes_saved"]
+        saved = s["bytes_saved"] / total if total else 0.0
+        return (
+            f"{s['crawled']} pages crawled: {s['new']} new, {s['changed']} changed, "
+            f"{s['not_modified']} not modified (304), {s['unchanged']} unchanged (same hash); "
+            f"{s['skip_rate']:.0%} skippable. Downloaded {s['bytes_downloaded']:,} bytes, "
+            f"saved {s['bytes_saved']:,} ({saved:.0%})."
+        )
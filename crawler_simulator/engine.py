@@ -0,0 +1,241 @@
+"""
+Asynchronous crawl engine for many URLs.
+
+Requests share pooled ``httpx.AsyncClient``s, so connections to a host are
+kept alive and reused instead of paying a TCP/TLS handshake per page. Hosts
+are spread over one client per ``POOL_SHARD`` connections: httpcore scans its
+whole pool on every request, which turns quadratic past a few dozen
+connections (one pool of 256 connections crawled ~4x slower than 64 here).
+Throughput is then bounded by three limits rather than by latency:
+
+* ``concurrency``: requests in flight, and so connections open, overall
+* ``per_host``: requests in flight to any one host
+* ``per_host_rate``: request starts per second to any one host
+
+URLs are scheduled in a sliding window of ``4 * concurrency`` tasks, so a
+50k-URL crawl holds a bounded number of pending tasks, and a task waiting
+for a busy host does not hold a global slot. Connection errors, timeouts and
+429/5xx responses are retried with exponential backoff and full jitter
+(honouring ``Retry-After``). Results are yielded as they complete:
+
+    async with CrawlEngine(concurrency=200, per_host=8) as engine:
+        async for page in engine.crawl_many(urls):
+            ...
+"""
+import asyncio
+import random
+import time
+import zlib
+from typing import AsyncIterator, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .cache import CrawlCache
+from .metadata import CHUNK_BYTES, MAX_BODY_BYTES, describe_page
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POOL_SHARD = 32
+
+
+class _Host:
+    # Politeness state of one host: a slot semaphore, the next start time
+    # and the client whose pool holds its connections
+    __slots__ = ("slots", "interval", "next_start", "lock", "client")
+
+    def __init__(self, per_host, rate, client):
+        self.client = client
+        self.slots = asyncio.Semaphore(per_host)
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait_turn(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class CrawlEngine:
+    """
+    Pooled, polite async HTTP fetcher.
+
+    Args:
+        concurrency: Requests in flight overall.
+        per_host: Requests in flight to one host.
+        per_host_rate: Request starts per second to one host; None for no limit.
+        retries: Retries after the first attempt.
+        backoff: Base delay of the first retry in seconds; doubled per retry,
+            capped at ``max_backoff`` and drawn uniformly below that (full jitter).
+        timeout: Per-request timeout in seconds.
+        client: An ``httpx.AsyncClient`` to use instead of a pooled one of
+            our own (tests pass one with a mock transport).
+        cache: Validators of earlier crawls; see ``CrawlCache``. Metadata
+            then carries the page's cache state, and unchanged pages come
+            back with empty content and ``metadata["not_modified"]`` set.
+            The cache is read and written from worker threads.
+        max_bytes: Largest body kept per page; the download stops there and
+            the page is flagged ``truncated``. None for no limit.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 100,
+        per_host: int = 4,
+        per_host_rate: Optional[float] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 20.0,
+        headers: Optional[Dict[str, str]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[CrawlCache] = None,
+        max_bytes: Optional[int] = MAX_BODY_BYTES,
+    ):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.per_host_rate = per_host_rate
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.headers = headers or {"User-Agent": "AETHER-crawler/1.0"}
+        self._clients = [client] if client is not None else []
+        self._own_clients = client is None
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, _Host] = {}
+        self.stats = {"requests": 0, "retries": 0, "errors": 0, "bytes": 0}
+
+    async def __aenter__(self):
+        if not self._clients:
+            # The global semaphore bounds connections; pools only hold them
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=POOL_SHARD)
+            self._clients = [
+                httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)),
+                    limits=limits,
+                    headers=self.headers,
+                    follow_redirects=True,
+                )
+                for _ in range(max(1, self.concurrency // POOL_SHARD))
+            ]
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._own_clients:
+            await asyncio.gather(*(client.aclose() for client in self._clients))
+            self._clients = []
+
+    def _host(self, url):
+        key = urlsplit(url).netloc.lower()
+        host = self._hosts.get(key)
+        if host is None:
+            client = self._clients[zlib.crc32(key.encode()) % len(self._clients)]
+            host = self._hosts[key] = _Host(self.per_host, self.per_host_rate, client)
+        return host
+
+    def _delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def fetch(self, url: str, use_cache: bool = True) -> dict:
+        """
+        Fetch one page, retrying transient failures.
+
+        Args:
+            url: The URL to fetch.
+            use_cache: False to fetch unconditionally and leave the cache
+                untouched, e.g. for sitemaps that must be read in full.
+
+        Returns:
+            ``CrawlerSimulator.crawl``-shaped dict (see ``metadata.describe_page``)
+            whose metadata also has status, content_type, final_url,
+            attempts and elapsed; or metadata with an error once retries
+            are exhausted.
+        """
+        host = self._host(url)
+        cache = self.cache if use_cache else None
+        # Cache lookups and writes are blocking SQLite calls: keep them off the event loop
+        headers = await asyncio.to_thread(cache.conditional_headers, url) if cache is not None else None
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            response = error = None
+            async with host.slots:
+                await host.wait_turn()
+                async with self._slots:
+                    self.stats["requests"] += 1
+                    try:
+                        async with host.client.stream("GET", url, headers=headers) as response:
+                            body, truncated = await self._read(response)
+                    except httpx.HTTPError as e:
+                        error = e
+            retry = error is not None or response.status_code in RETRY_STATUSES
+            if not retry or attempt >= self.retries:
+                break
+            self.stats["retries"] += 1
+            await asyncio.sleep(self._delay(attempt, response))
+            attempt += 1
+
+        metadata = {"attempts": attempt + 1, "elapsed": time.monotonic() - started}
+        if error is not None:
+            self.stats["errors"] += 1
+            return {"url": url, "content": "", "metadata": {"error": str(error) or type(error).__name__, **metadata}}
+        self.stats["bytes"] += len(body)
+        page = (url, response.status_code, response.headers, body, response.encoding, truncated, cache)
+        result = await asyncio.to_thread(describe_page, *page) if cache is not None else describe_page(*page)
+        result["metadata"].update(
+            metadata,
+            status=response.status_code,
+            content_type=response.headers.get("content-type"),
+            final_url=str(response.url),
+        )
+        return result
+
+    async def _read(self, response):
+        # Stop downloading at max_bytes; leaving the stream closes the connection
+        body = bytearray()
+        async for chunk in response.aiter_bytes(CHUNK_BYTES):
+            if self.max_bytes is not None and len(body) + len(chunk) > self.max_bytes:
+                body += chunk[:self.max_bytes - len(body)]
+                return bytes(body), True
+            body += chunk
+        return bytes(body), False
+
+    async def crawl_many(self, urls: Iterable[str], use_cache: bool = True) -> AsyncIterator[dict]:
+        """Fetch every URL (see ``fetch``), yielding results in completion order."""
+        window = 4 * self.concurrency
+        urls = iter(urls)
+        pending = set()
+        try:
+            while True:
+                for url in urls:
+                    pending.add(asyncio.ensure_future(self.fetch(url, use_cache)))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+async def crawl_many(urls: Iterable[str], **options) -> AsyncIterator[dict]:
+    """``CrawlEngine(**options).crawl_many(urls)`` on an engine of its own."""
+    async with CrawlEngine(**options) as engine:
+        async for result in engine.crawl_many(urls):
+            yield result
@@ -0,0 +1,459 @@
+"""
+Crawl frontier: the URLs of a crawl still to fetch, and every URL seen.
+
+URLs are canonicalized before anything else (``canonicalize``): scheme and
+host are lowercased, default ports, fragments and tracking parameters are
+dropped, dot segments are resolved and the query is sorted, so spellings of
+one page collapse into one URL. A ``ScalableBloomFilter`` remembers every
+canonical URL ever added in 2-4 bytes per URL at a 0.1% false positive
+rate, growing by slices as the crawl grows. A false positive drops
+a new URL; nothing is ever fetched twice.
+
+Pending URLs live in SQLite, not in memory, so the frontier holds 10M+ URLs
+with memory bounded by the Bloom filter and SQLite's page cache. Scheduling
+is per-host fair: ``pop`` serves the host that has waited longest (each host
+is ready again ``host_delay`` seconds after its last URL was handed out)
+and, within it, the shallowest URL, the most recently modified first. Popped
+URLs stay on disk until ``done``; reopening the same file after a crash puts
+them back in the queue, so a crawl resumes where it stopped.
+
+    with Frontier("crawl.db", host_delay=1.0) as frontier:
+        frontier.add("https://acme.test/")
+        while (entry := frontier.pop()) is not None:
+            page = crawler.crawl(entry["url"])
+            frontier.add_links(page["content"], entry["url"], entry["depth"] + 1)
+            frontier.done(entry)
+"""
+import gzip
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Union
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit, urlunsplit
+
+import numpy as np
+
+TRACKING_PARAMS = frozenset({
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "ref_src",
+})
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# URLs added are buffered and written this many at a time
+BUFFER_ROWS = 10_000
+_PERCENT = re.compile(r"%[0-9a-fA-F]{2}")
+_HREF = re.compile(r"""<a\s[^>]*?href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.I)
+
+# ---------------------------
+# CANONICALIZATION
+# ---------------------------
+
+
+def _remove_dot_segments(path):
+    # RFC 3986 section 5.2.4, keeping a trailing slash
+    segments = []
+    for segment in path.split("/"):
+        if segment == "..":
+            if len(segments) > 1:
+                segments.pop()
+        elif segment != ".":
+            segments.append(segment)
+    if path.endswith(("/.", "/..")):
+        segments.append("")
+    return "/".join(segments) or "/"
+
+
+def canonicalize(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Canonical form of an http(s) URL, resolved against ``base`` if given;
+    None for other schemes and unparseable URLs.
+    """
+    try:
+        parts = urlsplit(urljoin(base, url.strip()) if base else url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = _PERCENT.sub(lambda m: m.group().upper(), _remove_dot_segments(parts.path or "/"))
+    if not path.startswith("/"):
+        path = "/" + path
+    query = ""
+    if parts.query:
+        params = [
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+        ]
+        query = urlencode(sorted(params), quote_via=quote)
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def extract_links(content: str, base_url: str) -> List[str]:
+    """Canonical http(s) targets of the ``<a href>`` links of a page."""
+    links = []
+    for match in _HREF.finditer(content):
+        href = html.unescape(next(g for g in match.groups() if g is not None))
+        url = canonicalize(href, base_url)
+        if url:
+            links.append(url)
+    return links
+
+
+def parse_sitemap(content: Union[str, bytes]):
+    """
+    Entries of a sitemap or sitemap index (optionally gzipped), streamed.
+
+    Yields:
+        ``(kind, url, lastmod)`` with kind ``"page"`` or ``"sitemap"`` and
+        lastmod a POSIX timestamp or None.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    loc = lastmod = None
+    for event, element in ElementTree.iterparse(BytesIO(content), events=("end",)):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "loc":
+            loc = (element.text or "").strip()
+        elif tag == "lastmod":
+            lastmod = _timestamp(element.text)
+        elif tag in ("url", "sitemap"):
+            if loc:
+                yield ("page" if tag == "url" else "sitemap"), loc, lastmod
+            loc = lastmod = None
+            element.clear()
+
+
+def _timestamp(value):
+    try:
+        parsed = datetime.fromisoformat((value or "").strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+# ---------------------------
+# BLOOM FILTER
+# ---------------------------
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` items at ``error_rate``."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.m = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.m + 7) // 8)
+        self.count = count
+
+    def _positions(self, h1, h2):
+        m = self.m
+        return [(h1 + i * h2) % m for i in range(self.k)]
+
+    def contains(self, h1, h2):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(h1, h2))
+
+    def add(self, h1, h2):
+        bits = self.bits
+        for p in self._positions(h1, h2):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows without a size given up front (Almeida et al.):
+    when the newest slice is full a new one is added, ``growth`` times
+    larger with a ``tightening`` times smaller error rate, so the overall
+    false positive rate stays below ``error_rate``.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-3, growth: int = 2, tightening: float = 0.5):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.slices: List[BloomFilter] = []
+
+    def __len__(self):
+        return sum(s.count for s in self.slices)
+
+    @staticmethod
+    def _hashes(item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = self._hashes(item)
+        return any(s.contains(h1, h2) for s in self.slices)
+
+    def add(self, item: str) -> bool:
+        """Add ``item``; False if it was (probably) there already."""
+        h1, h2 = self._hashes(item)
+        if any(s.contains(h1, h2) for s in self.slices):
+            return False
+        if not self.slices or self.slices[-1].count >= self.slices[-1].capacity:
+            n = len(self.slices)
+            self.slices.append(BloomFilter(
+                self.capacity * self.growth ** n, self.error_rate * (1 - self.tightening) * self.tightening ** n
+            ))
+        self.slices[-1].add(h1, h2)
+        return True
+
+    @property
+    def nbytes(self):
+        return sum(len(s.bits) for s in self.slices)
+
+    def save(self, path: str):
+        arrays = {f"slice{i}": np.frombuffer(s.bits, dtype=np.uint8) for i, s in enumerate(self.slices)}
+        meta = {
+            "capacity": self.capacity, "error_rate": self.error_rate, "growth": self.growth,
+            "tightening": self.tightening,
+            "slices": [[s.capacity, s.error_rate, s.count] for s in self.slices],
+        }
+        # Write then rename, so a crash never leaves a torn filter behind
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, meta=json.dumps(meta), **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ScalableBloomFilter":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            bloom = cls(meta["capacity"], meta["error_rate"], meta["growth"], meta["tightening"])
+            bloom.slices = [
+                BloomFilter(capacity, error_rate, bytearray(data[f"slice{i}"].tobytes()), count)
+                for i, (capacity, error_rate, count) in enumerate(meta["slices"])
+            ]
+        return bloom
+
+# ---------------------------
+# FRONTIER
+# ---------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    url TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    lastmod REAL NOT NULL,
+    popped INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS urls_next ON urls (host, depth, lastmod DESC, id) WHERE popped = 0;
+CREATE INDEX IF NOT EXISTS urls_popped ON urls (host) WHERE popped = 1;
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    ready_at REAL NOT NULL,
+    turn INTEGER NOT NULL,
+    pending INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hosts_ready ON hosts (ready_at, turn) WHERE pending > 0;
+"""
+
+
+class Frontier:
+    """
+    Persistent, deduplicated, per-host-fair URL queue.
+
+    Args:
+        path: SQLite file for the queue; the Bloom filter is kept next to
+            it in ``path + ".bloom.npz"``.
+        host_delay: Seconds between two URLs handed out for one host.
+        max_depth: URLs deeper than this are ignored.
+        allowed_hosts: Only URLs on these hosts are queued (all if None).
+        capacity, error_rate: Sizing of the first Bloom filter slice.
+        commit_every: Writes between automatic commits and filter saves.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        host_delay: float = 0.0,
+        max_depth: Optional[int] = None,
+        allowed_hosts: Optional[Iterable[str]] = None,
+        capacity: int = 1_000_000,
+        error_rate: float = 1e-3,
+        commit_every: int = 50_000,
+    ):
+        self.path = path
+        self.bloom_path = path + ".bloom.npz"
+        self.host_delay = host_delay
+        self.max_depth = max_depth
+        self.allowed_hosts = {h.lower() for h in allowed_hosts} if allowed_hosts else None
+        self.commit_every = commit_every
+        self._writes = 0
+        self._rows: List[tuple] = []
+        self._new_per_host: Dict[str, int] = {}
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        if os.path.exists(self.bloom_path):
+            self.seen = ScalableBloomFilter.load(self.bloom_path)
+        else:
+            self.seen = ScalableBloomFilter(capacity, error_rate)
+        # URLs handed out but never marked done were interrupted: queue them again
+        with self._db:
+            for host, n in self._db.execute("SELECT host, COUNT(*) FROM urls WHERE popped = 1 GROUP BY host").fetchall():
+                self._db.execute("UPDATE hosts SET pending = pending + ? WHERE host = ?", (n, host))
+            self._db.execute("UPDATE urls SET popped = 0 WHERE popped = 1")
+        # Hosts ready at the same time are served in turn, least recently served first
+        self._turn = self._db.execute("SELECT COALESCE(MAX(turn), 0) + 1 FROM hosts").fetchone()[0]
+
+    def __len__(self):
+        self._flush()
+        return self._db.execute("SELECT COALESCE(SUM(pending), 0) FROM hosts").fetchone()[0]
+
+    def add(self, url: str, depth: int = 0, lastmod: Optional[float] = None, base: Optional[str] = None) -> bool:
+        """Queue a URL unless it (or another spelling of it) was seen before."""
+        url = canonicalize(url, base)
+        if url is None or (self.max_depth is not None and depth > self.max_depth):
+            return False
+        host = urlsplit(url).netloc
+        if self.allowed_hosts is not None and host not in self.allowed_hosts:
+            return False
+        if not self.seen.add(url):
+            return False
+        self._rows.append((host, url, depth, lastmod or 0.0))
+        self._new_per_host[host] = self._new_per_host.get(host, 0) + 1
+        if len(self._rows) >= BUFFER_ROWS:
+            self._flush()
+        return True
+
+    def _flush(self):
+        # Adds are written in batches: one executemany beats a statement per URL several times over
+        if not self._rows:
+            return
+        rows, new_per_host = self._rows, self._new_per_host
+        self._rows, self._new_per_host = [], {}
+        self._db.executemany("INSERT INTO urls (host, url, depth, lastmod) VALUES (?, ?, ?, ?)", rows)
+        self._db.executemany(
+            "INSERT INTO hosts (host, ready_at, turn, pending) VALUES (?, 0, 0, ?) "
+            "ON CONFLICT (host) DO UPDATE SET pending = pending + excluded.pending",
+            new_per_host.items(),
+        )
+        self._wrote(len(rows))
+
+    def add_many(self, urls: Iterable[str], depth: int = 0) -> int:
+        """Queue many URLs at one depth; returns how many were new."""
+        return sum(self.add(url, depth) for url in urls)
+
+    def add_links(self, content: str, base_url: str, depth: int) -> int:
+        """Queue the links of a fetched page; returns how many were new."""
+        return self.add_many(extract_links(content, base_url), depth)
+
+    def add_sitemap(self, content: Union[str, bytes], depth: int = 0) -> List[str]:
+        """
+        Queue the pages of a sitemap with their lastmod.
+
+        Returns:
+            The URLs of nested sitemaps (from a sitemap index) to fetch and
+            pass back in.
+        """
+        nested = []
+        for kind, url, lastmod in parse_sitemap(content):
+            if kind == "sitemap":
+                nested.append(url)
+            else:
+                self.add(url, depth, lastmod)
+        return nested
+
+    def pop(self, now: Optional[float] = None) -> Optional[dict]:
+        """
+        The next URL to fetch: from the host ready longest, its shallowest
+        and most recently modified URL. None when no host is ready yet
+        (see ``next_ready``) or the frontier is empty.
+        """
+        now = time.time() if now is None else now
+        self._flush()
+        row = self._db.execute(
+            "SELECT host FROM hosts WHERE pending > 0 AND ready_at <= ? ORDER BY ready_at, turn LIMIT 1", (now,)
+        ).fetchone()
+        if row is None:
+            return None
+        (host,) = row
+        entry = self._db.execute(
+            "SELECT id, url, depth, lastmod FROM urls WHERE host = ? AND popped = 0 "
+            "ORDER BY depth, lastmod DESC, id LIMIT 1",
+            (host,),
+        ).fetchone()
+        # Not committed here: a pop lost in a crash is requeued on reopen anyway
+        self._db.execute("UPDATE urls SET popped = 1 WHERE id = ?", (entry[0],))
+        self._db.execute(
+            "UPDATE hosts SET pending = pending - 1, ready_at = ?, turn = ? WHERE host = ?",
+            (now + self.host_delay, self._turn, host),
+        )
+        self._turn += 1
+        return {"id": entry[0], "url": entry[1], "depth": entry[2], "lastmod": entry[3] or None}
+
+    def pop_many(self, n: int, now: Optional[float] = None) -> List[dict]:
+        """Up to ``n`` URLs, one host at a time in ``pop`` order."""
+        entries = []
+        while len(entries) < n:
+            entry = self.pop(now)
+            if entry is None:
+                break
+            entries.append(entry)
+        return entries
+
+    def next_ready(self) -> Optional[float]:
+        """When the next host becomes ready, or None if nothing is pending."""
+        self._flush()
+        row = self._db.execute("SELECT MIN(ready_at) FROM hosts WHERE pending > 0").fetchone()
+        return row[0]
+
+    def done(self, entry) -> None:
+        """Forget a fetched URL (its Bloom filter bit stays set)."""
+        entry_id = entry["id"] if isinstance(entry, dict) else entry
+        self._db.execute("DELETE FROM urls WHERE id = ?", (entry_id,))
+        self._wrote()
+
+    def _wrote(self, n=1):
+        self._writes += n
+        if self._writes >= self.commit_every:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Commit the queue and save the Bloom filter."""
+        self._flush()
+        self._db.commit()
+        self.seen.save(self.bloom_path)
+        self._writes = 0
+
+    def close(self) -> None:
+        self.checkpoint()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> dict:
+        self._flush()
+        return {
+            "pending": len(self),
+            "in_flight": self._db.execute("SELECT COUNT(*) FROM urls WHERE popped = 1").fetchone()[0],
+            "hosts": self._db.execute("SELECT COUNT(*) FROM hosts WHERE pending > 0").fetchone()[0],
+            "seen": len(self.seen),
+            "bloom_bytes": self.seen.nbytes,
+        }
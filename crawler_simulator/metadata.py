@@ -0,0 +1,158 @@
+"""
+Cheap page metadata from the document head, and size-capped page bodies.
+
+The crawler only needs a handful of fields per page, and all of them live in
+``<head>``: title, meta description, canonical link, language and JSON-LD.
+``head_metadata`` finds the end of the head with one regex search and runs
+the standard library's incremental HTML tokenizer over that prefix only, so
+its cost does not grow with the size of the body. A full DOM is built only
+when a later stage asks for one with ``parse_dom``.
+
+Bodies are read in chunks and cut at ``max_bytes`` (``MAX_BODY_BYTES`` by
+default); ``describe_page`` flags the cut in the metadata as ``truncated``.
+"""
+import json
+import re
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .cache import SKIPPABLE
+
+_HEAD_END = re.compile(rb"</head\s*>|<body[\s>]", re.I)
+# Pages without a head end: never tokenize more than this much looking for one
+HEAD_SCAN_BYTES = 256 * 1024
+MAX_BODY_BYTES = 5 * 2**20
+CHUNK_BYTES = 64 * 1024
+
+
+class _HeadParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title: Optional[str] = None
+        self.description: Optional[str] = None
+        self.canonical: Optional[str] = None
+        self.language: Optional[str] = None
+        self.json_ld: List = []
+        self._capture = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k.lower(): v or "" for k, v in attrs}
+        if tag == "html" and attrs.get("lang"):
+            self.language = attrs["lang"].strip()
+        elif tag == "title" and self.title is None:
+            self._capture, self._text = "title", []
+        elif tag == "script" and attrs.get("type", "").strip().lower() == "application/ld+json":
+            self._capture, self._text = "json_ld", []
+        elif tag == "meta":
+            name = (attrs.get("name") or attrs.get("property") or "").lower()
+            if name in ("description", "og:description") and self.description is None:
+                self.description = attrs.get("content", "").strip() or None
+            elif attrs.get("http-equiv", "").lower() == "content-language" and self.language is None:
+                self.language = attrs.get("content", "").strip() or None
+        elif tag == "link" and "canonical" in attrs.get("rel", "").lower().split():
+            self.canonical = attrs.get("href", "").strip() or None
+
+    def handle_data(self, data):
+        if self._capture:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if self._capture == "title" and tag == "title":
+            self.title = " ".join("".join(self._text).split()) or None
+        elif self._capture == "json_ld" and tag == "script":
+            try:
+                self.json_ld.append(json.loads("".join(self._text)))
+            except ValueError:
+                pass
+        else:
+            return
+        self._capture = None
+
+
+def head_metadata(content: Union[str, bytes], encoding: str = "utf-8") -> dict:
+    """
+    Title, description, canonical URL, language and JSON-LD blocks of an
+    HTML page, read from its head only.
+
+    Args:
+        content: The page, or as much of its start as was downloaded.
+        encoding: Charset of ``content`` when it is bytes.
+
+    Returns:
+        A dict with title, description, canonical, language (None when
+        absent) and json_ld (a list of parsed blocks).
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+        encoding = "utf-8"
+    match = _HEAD_END.search(content, 0, HEAD_SCAN_BYTES)
+    head = content[:match.start() if match else HEAD_SCAN_BYTES]
+    try:
+        text = head.decode(encoding, "replace")
+    except LookupError:
+        text = head.decode("utf-8", "replace")
+    parser = _HeadParser()
+    parser.feed(text)
+    parser.close()
+    if parser._capture == "title":
+        # A title cut off by the scan limit or a truncated download
+        parser.handle_endtag("title")
+    return {
+        "title": parser.title,
+        "description": parser.description,
+        "canonical": parser.canonical,
+        "language": parser.language,
+        "json_ld": parser.json_ld,
+    }
+
+
+def read_capped(chunks: Iterable[bytes], max_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """Join ``chunks`` up to ``max_bytes``; returns the body and whether it was cut."""
+    body = bytearray()
+    for chunk in chunks:
+        if max_bytes is not None and len(body) + len(chunk) > max_bytes:
+            body += chunk[:max_bytes - len(body)]
+            return bytes(body), True
+        body += chunk
+    return bytes(body), False
+
+
+def describe_page(url, status, headers, body: bytes, encoding: Optional[str], truncated: bool, cache=None) -> dict:
+    """
+    ``CrawlerSimulator.crawl``-shaped result for a downloaded page.
+
+    Metadata holds the head fields of ``head_metadata``, the body length
+    and ``truncated``. With a ``CrawlCache`` it also holds the page's cache
+    state, and a page found unchanged comes back with empty content, its
+    cached title and ``not_modified`` set, without being parsed at all.
+    """
+    encoding = encoding or "utf-8"
+    fields = {}
+
+    def head():
+        if not fields:
+            fields.update(head_metadata(body, encoding))
+        return fields
+
+    metadata = {}
+    if cache is not None:
+        cached = cache.record(url, status, headers, body, lambda: head()["title"])
+        if cached is not None:
+            metadata["cache"] = cached["state"]
+            if cached["state"] in SKIPPABLE:
+                metadata.update(title=cached["title"], length=cached["length"], not_modified=True)
+                return {"url": url, "content": "", "metadata": metadata}
+    metadata.update(head(), length=len(body), truncated=truncated)
+    try:
+        content = body.decode(encoding, "replace")
+    except LookupError:
+        content = body.decode("utf-8", "replace")
+    return {"url": url, "content": content, "metadata": metadata}
+
+
+def parse_dom(content: str):
+    """Full BeautifulSoup tree of a page, for stages that need the body."""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, "html.parser")
@@ -1,26 +1,54 @@
+from typing import Optional, Sequence
+
+from .cooccurrence import CooccurrenceGraph
+
+
 class KnowledgeGraphBuilder:
     """
     Builds and updates a knowledge graph from extracted entities.
+
+    Documents added with ``add_document`` accumulate into one weighted
+    ``CooccurrenceGraph`` (``self.graph``), stored as CSR arrays; graphs
+    built elsewhere, e.g. by worker processes, are folded in with ``merge``.
+
+    Args:
+        window: Mentions at most this many tokens apart co-occur. Without
+            positions, mentions are one token apart in list order, so the
+            default links adjacent entities only.
     """
 
-    def build_graph(self, entities: list) -> dict:
+    def __init__(self, window: int = 1):
+        self.window = window
+        self.graph = CooccurrenceGraph()
+
+    def build_graph(self, entities: list, positions: Optional[Sequence[int]] = None) -> dict:
         """
         Construct or update the knowledge graph using extracted entities.
 
         Args:
             entities: A list of extracted entity strings.
+            positions: Token position of each entity, for a ``window`` in tokens.
 
         Returns:
             A dictionary mapping each entity to a set of related entities (co-occurrence graph).
         """
-        graph: dict[str, set[str]] = {}
-        for i, entity in enumerate(entities):
-            # ensure node in graph
-            if entity not in graph:
-                graph[entity] = set()
-            # connect with next entity if exists
-            if i < len(entities) - 1:
-                next_entity = entities[i + 1]
-                graph[entity].add(next_entity)
-                graph.setdefault(next_entity, set()).add(entity)
-        return graph
+        graph = CooccurrenceGraph()
+        graph.add_document(entities, positions, self.window)
+        return graph.to_dict()
+
+    def add_document(self, entities: Sequence, positions: Optional[Sequence[int]] = None, weight: float = 1.0) -> None:
+        """Count one document's co-occurrences into ``self.graph``."""
+        self.graph.add_document(entities, positions, self.window, weight)
+
+    def merge(self, other) -> None:
+        """Fold in another builder's (or a bare ``CooccurrenceGraph``'s) edge weights."""
+        self.graph.merge(other.graph if isinstance(other, KnowledgeGraphBuilder) else other)
+
+    def save(self, path: str) -> None:
+        self.graph.save(path)
+
+    @classmethod
+    def load(cls, path: str, window: int = 1) -> "KnowledgeGraphBuilder":
+        builder = cls(window)
+        builder.graph = CooccurrenceGraph.load(path)
+        return builder
@@ -1,5 +1,10 @@
+from collections import OrderedDict
+
 from crawler_simulator.agent import CrawlerSimulator
 from content_analyzer.agent import ContentAnalyzer
+from content_analyzer.cache import content_key
+from content_analyzer.dedup import simhash
+from content_analyzer.extract import WORD_RE, extract_text, looks_like_html
 from knowledge_graph_builder.agent import KnowledgeGraphBuilder
 from geo_scoring.score import compute_geo_score
 
@@ -11,8 +16,29 @@ class Orchestrator:
     This class ties together the individual agents: crawling web pages,
     analyzing content, building a knowledge graph, and computing a GEo visibility
     score. The `run` method orchestrates these steps for a given URL.
+
+    With an entity ``linker`` (see ``content_analyzer.entities``) the graph is
+    built from the graph entities the page mentions; without one, from its
+    most frequent words.
+
+    With a ``duplicates`` index (``content_analyzer.dedup.DuplicateIndex``)
+    every page with words is fingerprinted, and a near-duplicate of a page
+    analyzed earlier by this orchestrator reuses that page's analysis, as
+    long as the text it was computed from is still a near-duplicate.
+
+    With a ``cache`` (``content_analyzer.cache.AnalysisCache``) the analysis,
+    graph and score of every page are stored under a hash of its extracted
+    text, so re-running over unchanged pages only crawls and looks them up.
     """
 
+    REUSED_ANALYSES = 10_000
+
+    def __init__(self, linker=None, duplicates=None, cache=None):
+        self.linker = linker
+        self.duplicates = duplicates
+        self.cache = cache
+        self._analyses = OrderedDict()
+
     def run(self, url: str) -> dict:
         """
         Executes the AETHER pipeline on the provided URL.
@@ -26,18 +52,63 @@ class Orchestrator:
         """
         # Initialize agents
         crawler = CrawlerSimulator()
-        analyzer = ContentAnalyzer()
+        analyzer = ContentAnalyzer(linker=self.linker, cache=self.cache)
         graph_builder = KnowledgeGraphBuilder()
 
         # Step 1: Crawl the webpage
         crawl_result = crawler.crawl(url)
         content = crawl_result.get("content", "") if isinstance(crawl_result, dict) else ""
 
-        # Step 2: Analyze the content
-        analysis = analyzer.analyze(content)
+        # Steps 2-4 work on the visible text, which also keys the cache
+        text = extract_text(content) if looks_like_html(content) else content
+        canonical = fingerprint = None
+        # A page without words fingerprints to 0 and would duplicate every other such page
+        if self.duplicates is not None and WORD_RE.search(text):
+            fingerprint = simhash(text)
+            canonical = self.duplicates.add(url, fingerprint)
+
+        key = content_key(text, f"pipeline:{analyzer.version}") if self.cache is not None else None
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            analysis, knowledge_graph, geo_score = cached
+        else:
+            analysis, knowledge_graph, geo_score = self._process(analyzer, graph_builder, text, canonical, fingerprint)
+            if key:
+                self.cache.put(key, (analysis, knowledge_graph, geo_score))
+
+        # Aggregate results
+        return {
+            "crawl": crawl_result,
+            "analysis": analysis,
+            "knowledge_graph": knowledge_graph,
+            "geo_score": geo_score,
+            "canonical": canonical or url,
+        }
+
+    def _process(self, analyzer, graph_builder, text, canonical, fingerprint):
+        # Step 2: Analyze the content, unless a near-duplicate already was. The
+        # canonical page may have changed since, so its analysis is only reused
+        # while the text it was computed from is still a near-duplicate of this one.
+        analysis = None
+        if canonical is not None and canonical in self._analyses:
+            analyzed, reusable = self._analyses[canonical]
+            if bin(analyzed ^ fingerprint).count("1") <= self.duplicates.max_distance:
+                analysis = reusable
+                self._analyses.move_to_end(canonical)
+        if analysis is None:
+            analysis = analyzer.analyze(text, html=False)
+            if canonical is not None:
+                self._analyses[canonical] = (fingerprint, analysis)
+                self._analyses.move_to_end(canonical)
+                if len(self._analyses) > self.REUSED_ANALYSES:
+                    self._analyses.popitem(last=False)
 
         # Step 3: Build a knowledge graph from the analysis results
-        entities = analysis.get("top_words", []) if isinstance(analysis, dict) else []
+        if isinstance(analysis, dict) and "entities" in analysis:
+            # Distinct entity ids in order of first mention
+            entities = list(dict.fromkeys(m["entity_id"] for m in analysis["entities"]))
+        else:
+            entities = analysis.get("top_words", []) if isinstance(analysis, dict) else []
         knowledge_graph = graph_builder.build_graph(entities)
 
         # Step 4: Compute a GEo visibility score
@@ -47,11 +118,4 @@ class Orchestrator:
             "knowledge_graph": knowledge_graph,
         }
         geo_score = compute_geo_score(score_input)
-
-        # Aggregate results
-        return {
-            "crawl": crawl_result,
-            "analysis": analysis,
-            "knowledge_graph": knowledge_graph,
-            "geo_score": geo_score,
-        }
+        return analysis, knowledge_graph, geo_score
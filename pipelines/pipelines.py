@@ -4,16 +4,123 @@ Pipeline definitions for AETHER.
 This module defines workflows that orchestrate the execution of multiple agents,
 including crawling, content analysis, knowledge graph building, and GEo scoring.
 """
+import asyncio
+import os
+import tempfile
+import time
+from collections import deque
+from urllib.parse import urlsplit
 
+from content_analyzer.agent import ContentAnalyzer
+from crawler_simulator.engine import CrawlEngine
+from crawler_simulator.frontier import Frontier, canonicalize, extract_links
 
-def run_crawl_analysis_pipeline(urls):
+# Most sitemaps (indexes included) fetched by one crawl
+MAX_SITEMAPS = 1000
+
+
+def run_crawl_analysis_pipeline(
+    urls,
+    sitemaps=(),
+    max_pages=100,
+    max_depth=2,
+    frontier_path=None,
+    batch_size=50,
+    **crawl_options,
+):
     """
-    Example pipeline that crawls a list of URLs and performs content analysis.
+    Crawl outward from seed URLs and analyze every page reached.
 
-    :param urls: List of URLs to crawl and analyze.
+    Pages are scheduled by a ``crawler_simulator.frontier.Frontier`` kept to
+    the seeds' hosts: links found on each page are queued one level deeper,
+    so one spelling of each URL is fetched once, shallow pages first and
+    hosts in turn. With a ``cache`` in ``crawl_options`` a page unchanged since
+    the last crawl is not analyzed again (its ``analysis`` is None), but the
+    links stored with it are still followed.
+
+    :param urls: Seed URLs to crawl and analyze.
+    :param sitemaps: Sitemap (or sitemap index) URLs whose pages are seeded too.
+        Each sitemap is fetched once, so indexes listing each other do not
+        loop, and at most ``MAX_SITEMAPS`` are fetched.
+    :param max_pages: Pages to fetch before stopping, failed ones included.
+    :param max_depth: Link hops to follow from the seeds.
+    :param frontier_path: SQLite file for the frontier; a crawl given the same
+        file again resumes where it stopped. A temporary one when None.
+    :param batch_size: URLs crawled concurrently per round.
+    :param crawl_options: ``CrawlEngine`` options (concurrency, per_host,
+        cache...); one engine serves the whole crawl.
+    :return: One ``{"url", "depth", "metadata", "analysis"}`` dict per page
+        fetched; pages that failed to download are left out.
     """
-    # TODO: invoke CrawlerSimulator and ContentAnalyzer here.
-    pass
+    if frontier_path is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return run_crawl_analysis_pipeline(
+                urls, sitemaps, max_pages, max_depth, os.path.join(tmp, "frontier.db"), batch_size, **crawl_options
+            )
+
+    return asyncio.run(
+        _crawl_analysis(list(urls), list(sitemaps), max_pages, max_depth, frontier_path, batch_size, crawl_options)
+    )
+
+
+async def _crawl_analysis(urls, sitemaps, max_pages, max_depth, frontier_path, batch_size, crawl_options):
+    # One engine, so one set of keep-alive pools, for the whole crawl
+    analyzer = ContentAnalyzer()
+    cache = crawl_options.get("cache")
+    seeds = [url for url in (canonicalize(u) for u in urls + sitemaps) if url]
+    hosts = {urlsplit(url).netloc for url in seeds}
+    results = []
+    attempted = 0
+    async with CrawlEngine(**crawl_options) as engine:
+        with Frontier(frontier_path, max_depth=max_depth, allowed_hosts=hosts) as frontier:
+            frontier.add_many(urls)
+            # Sitemaps are always fetched in full: an unchanged one still lists pages to seed
+            pending = deque(url for url in map(canonicalize, sitemaps) if url)
+            fetched = set()
+            while pending and len(fetched) < MAX_SITEMAPS:
+                batch = []
+                while pending and len(batch) < batch_size and len(fetched) < MAX_SITEMAPS:
+                    url = pending.popleft()
+                    if url not in fetched:
+                        fetched.add(url)
+                        batch.append(url)
+                async for page in engine.crawl_many(batch, use_cache=False):
+                    if page["content"]:
+                        pending.extend(url for url in map(canonicalize, frontier.add_sitemap(page["content"])) if url)
+
+            while attempted < max_pages:
+                batch = frontier.pop_many(min(batch_size, max_pages - attempted))
+                if not batch:
+                    ready = frontier.next_ready()
+                    if ready is None:
+                        break
+                    await asyncio.sleep(max(0.0, ready - time.time()))
+                    continue
+                attempted += len(batch)
+                entries = {entry["url"]: entry for entry in batch}
+                pages = [page async for page in engine.crawl_many(list(entries))]
+                for page in pages:
+                    entry = entries[page["url"]]
+                    metadata = page["metadata"]
+                    if page["content"]:
+                        links = extract_links(page["content"], page["url"])
+                        if cache is not None:
+                            cache.set_links(page["url"], links)
+                        analysis = analyzer.analyze(page["content"])
+                    elif metadata.get("not_modified"):
+                        # Unchanged since the last crawl: nothing to analyze, but its links still lead on
+                        links = cache.links(page["url"]) or []
+                        analysis = None
+                    else:
+                        frontier.done(entry)
+                        continue
+                    frontier.add_many(links, entry["depth"] + 1)
+                    results.append(
+                        {"url": page["url"], "depth": entry["depth"], "metadata": metadata, "analysis": analysis}
+                    )
+                    frontier.done(entry)
+                frontier.checkpoint()
+    return results
 
 
 def run_full_pipeline(urls):
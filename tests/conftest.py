@@ -0,0 +1,27 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def serve():
+    """
+    Start local HTTP servers for the crawl tests: ``serve(handler)`` binds a
+    ``ThreadingHTTPServer`` (or ``server_class``) to a free port on 127.0.0.1,
+    serves it from a daemon thread and returns it. Every server started is
+    shut down after the test.
+    """
+    servers = []
+
+    def start(handler, server_class=ThreadingHTTPServer):
+        server = server_class(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,71 @@
+import pickle
+
+from content_analyzer.agent import ContentAnalyzer
+from content_analyzer.cache import AnalysisCache, content_key
+from content_analyzer.entities import EntityLinker
+from content_analyzer.extract import extract_text
+
+
+def test_batches_lru_eviction_and_reopen(tmp_path):
+    path = str(tmp_path / "analysis.db")
+    with AnalysisCache(path, max_bytes=2_000) as cache:
+        cache.put_many({f"k{i}": "x" * 100 for i in range(10)})
+        assert cache.get_many(["k0", "k5", "nope"]) == {"k0": "x" * 100, "k5": "x" * 100}
+        cache.put_many({f"n{i}": "y" * 100 for i in range(10)})
+        stats = cache.stats()
+        assert stats["bytes"] <= 2_000 and stats["evictions"] > 0
+        # Recently read entries outlive older unread ones
+        assert set(cache.get_many(["k0", "k5"])) == {"k0", "k5"}
+        assert cache.get("k1") is None
+        assert stats["hits"] == 2 and stats["misses"] == 1
+    with AnalysisCache(path) as cache:
+        assert cache.get("n9") == "y" * 100 and len(cache) == stats["entries"]
+
+
+def test_analyzer_reads_through_cache_keyed_by_text_and_version(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "analysis.db"))
+    analyzer = ContentAnalyzer(cache=cache)
+    page = "<p>Acme dental tools</p>"
+    result = analyzer.analyze(page)
+    # Same visible text, different markup: one entry
+    assert analyzer.analyze("<div>Acme dental tools</div>") == result == ContentAnalyzer().analyze(page)
+    assert cache.stats()["entries"] == 1 and cache.stats()["hits"] == 1
+
+    linker = EntityLinker([{"id": "b1", "displayName": "Acme"}])
+    linked = ContentAnalyzer(linker=linker, cache=cache)
+    assert linked.analyze(page)["entities"][0]["entity_id"] == "b1"
+    version = linked.version
+    linker.add({"id": "b2", "displayName": "dental tools"})
+    assert linked.version != version
+    assert [m["entity_id"] for m in linked.analyze(page)["entities"]] == ["b1", "b2"]
+    assert cache.get(content_key(extract_text(page), version)) is not None
+
+
+def test_analyze_many_shares_cache_across_processes(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "analysis.db"))
+    analyzer = ContentAnalyzer(cache=cache)
+    docs = [f"doc {i} " * (i + 1) for i in range(12)]
+    first = analyzer.analyze_many(docs, workers=2)
+    assert first == [ContentAnalyzer().analyze(d) for d in docs]
+    assert len(cache) == 12
+    clone = pickle.loads(pickle.dumps(analyzer))
+    assert clone.analyze_many(docs, workers=1) == first
+    assert clone.cache.stats()["hits"] == 12
+
+
+def test_orchestrator_skips_analysis_of_unchanged_pages(tmp_path, monkeypatch):
+    from crawler_simulator.agent import CrawlerSimulator
+    from orchestrator import orchestrator
+
+    monkeypatch.setattr(CrawlerSimulator, "crawl", lambda self, url: {"url": url, "content": "<p>acme acme dental</p>"})
+    calls = []
+    real = ContentAnalyzer._analyze
+    monkeypatch.setattr(ContentAnalyzer, "_analyze", lambda self, text: calls.append(text) or real(self, text))
+
+    cache = AnalysisCache(str(tmp_path / "analysis.db"))
+    first = orchestrator.Orchestrator(cache=cache).run("https://acme.test/a")
+    again = orchestrator.Orchestrator(cache=cache).run("https://acme.test/b")
+    assert len(calls) == 1
+    assert {k: again[k] for k in ("analysis", "knowledge_graph", "geo_score")} == {
+        k: first[k] for k in ("analysis", "knowledge_graph", "geo_score")
+    }
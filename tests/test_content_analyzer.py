@@ -0,0 +1,91 @@
+from content_analyzer.agent import ContentAnalyzer
+from content_analyzer.extract import extract_text, looks_like_html
+
+PAGE = """<!DOCTYPE html><html><head><title>Acme</title>
+<style>body { color: red; } .acme { display: none }</style>
+<script type="text/javascript">var acme = function() { return acme; };</script>
+</head><body><!-- acme acme acme -->
+<h1>Acme&nbsp;dental</h1><p>Acme makes dental tools.</p><p>Dental<b>care</b> &amp; more</p>
+</body></html>"""
+
+
+def test_extract_text_skips_scripts_styles_and_comments():
+    text = extract_text(PAGE)
+    assert "color" not in text and "function" not in text and "<" not in text
+    assert text.split() == ["Acme", "Acme", "dental", "Acme", "makes", "dental", "tools.", "Dental", "care", "&", "more"]
+    assert looks_like_html(PAGE) and not looks_like_html("a < b and c > d")
+
+
+def test_analyze_html_and_plain_text():
+    analyzer = ContentAnalyzer()
+    result = analyzer.analyze(PAGE)
+    assert result["word_count"] == 10
+    assert result["top_words"][:2] == [("acme", 3), ("dental", 3)]
+    assert analyzer.analyze("The cat and the hat", html=False) == {
+        "word_count": 5,
+        "top_words": [("the", 2), ("cat", 1), ("and", 1), ("hat", 1)],
+    }
+
+
+def test_analyze_many_preserves_order():
+    analyzer = ContentAnalyzer()
+    docs = [PAGE, "one two two", "<p>three</p>"] * 5
+    assert analyzer.analyze_many(docs, workers=2) == [analyzer.analyze(d) for d in docs]
+    assert analyzer.analyze_many([], workers=4) == []
+
+
+def test_analyze_stream_matches_analyze_across_chunk_boundaries():
+    import io
+    import random
+    rng = random.Random(0)
+    words = ["acme", "dental", "café", "tools", "x", "naïve", "the"]
+    text = " ".join(rng.choice(words) for _ in range(3000)) + "."
+    analyzer = ContentAnalyzer()
+    expected = analyzer.analyze(text, html=False)
+
+    data = text.encode("utf-8")
+    cuts = sorted(rng.sample(range(1, len(data)), 200))
+    chunks = [data[a:b] for a, b in zip([0] + cuts, cuts + [len(data)])]
+    got = analyzer.analyze_stream(chunks)
+    assert got == {**expected, "max_error": 0}
+    assert analyzer.analyze_stream(io.StringIO(text), chunk_size=7)["top_words"] == expected["top_words"]
+
+    html = analyzer.analyze_stream((PAGE[i:i + 13] for i in range(0, len(PAGE), 13)), html=True)
+    assert {k: html[k] for k in ("word_count", "top_words")} == analyzer.analyze(PAGE)
+
+
+def test_analyze_stream_error_bound_with_small_capacity():
+    import random
+    from collections import Counter
+    rng = random.Random(1)
+    tokens = [f"w{min(int(rng.paretovariate(1.0)), 5000)}" for _ in range(50_000)]
+    truth = Counter(tokens)
+    got = ContentAnalyzer().analyze_stream((" ".join(tokens[i:i + 500]) + " " for i in range(0, len(tokens), 500)), capacity=64)
+    assert got["word_count"] == len(tokens)
+    assert 0 < got["max_error"] <= len(tokens) / 65
+    for word, count in got["top_words"]:
+        assert truth[word] - got["max_error"] <= count <= truth[word]
+    assert [w for w, _ in got["top_words"]] == [w for w, _ in truth.most_common(5)]
+
+
+def test_analyze_stream_buffers_stay_bounded():
+    from content_analyzer.stream import MAX_WORD, StreamingAnalyzer
+
+    text = StreamingAnalyzer()
+    for _ in range(1000):
+        text.feed("a" * 1000)
+        assert len(text._tail) <= MAX_WORD
+    text.feed(" acme " + "b" * 300)
+    assert text.close()["top_words"] == [("a" * MAX_WORD, 1), ("acme", 1), ("b" * MAX_WORD, 1)]
+
+    page = StreamingAnalyzer(html=True)
+    page.feed("<p>acme</p><script>")
+    for _ in range(1000):
+        page.feed("var x = '<p>hidden</p>';" * 50)
+        assert len(page._html.rawdata) <= 2 * page._html.PIECE
+    page.feed("</script><!--")
+    for _ in range(100):
+        page.feed("hidden " * 1000)
+        assert len(page._html.rawdata) <= 2 * page._html.PIECE
+    page.feed("--><p>dental acme</p>")
+    assert page.close()["top_words"] == [("acme", 2), ("dental", 1)]
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from crawler_simulator.agent import CrawlerSimulator
+from crawler_simulator.cache import CrawlCache
+from crawler_simulator.engine import CrawlEngine
+
+LAST_MODIFIED = "Wed, 01 Oct 2025 08:00:00 GMT"
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        n = self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        headers = {}
+        if self.path == "/etag":
+            headers["ETag"] = '"v1"'
+            not_modified = self.headers.get("If-None-Match") == '"v1"'
+        elif self.path == "/last-modified":
+            headers["Last-Modified"] = LAST_MODIFIED
+            not_modified = self.headers.get("If-Modified-Since") == LAST_MODIFIED
+        else:
+            not_modified = False
+        if not_modified:
+            self.send_response(304)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            return
+        version = n if self.path == "/changing" else 1
+        body = f"<html><head><title>{self.path} v{version}</title></head><body>{'x' * 1000}</body></html>".encode()
+        self.send_response(200)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def base(serve):
+    return f"http://127.0.0.1:{serve(ConditionalHandler).server_address[1]}"
+
+
+PATHS = ["/etag", "/last-modified", "/plain", "/changing"]
+
+
+def test_conditional_recrawl_with_simulator(base, tmp_path):
+    path = str(tmp_path / "crawl.db")
+    with CrawlCache(path) as cache:
+        crawler = CrawlerSimulator(cache=cache)
+        first = {p: crawler.crawl(base + p) for p in PATHS}
+        assert all(r["metadata"]["cache"] == "new" and r["content"] for r in first.values())
+        assert first["/etag"]["metadata"]["title"] == "/etag v1"
+
+    # A later run, from the same file
+    with CrawlCache(path) as cache:
+        crawler = CrawlerSimulator(cache=cache)
+        second = {p: crawler.crawl(base + p) for p in PATHS}
+        states = {p: r["metadata"]["cache"] for p, r in second.items()}
+        assert states == {"/etag": "not_modified", "/last-modified": "not_modified", "/plain": "unchanged", "/changing": "changed"}
+        for p in ("/etag", "/last-modified", "/plain"):
+            assert second[p]["content"] == "" and second[p]["metadata"]["not_modified"]
+            assert second[p]["metadata"]["title"] == f"{p} v1"
+        assert second["/changing"]["metadata"]["title"] == "/changing v2" and second["/changing"]["content"]
+
+        stats = cache.stats()
+        assert stats["crawled"] == 4 and stats["skip_rate"] == 0.75
+        assert stats["bytes_saved"] == sum(first[p]["metadata"]["length"] for p in ("/etag", "/last-modified"))
+        assert "2 not modified (304), 1 unchanged" in cache.report()
+
+
+def test_conditional_recrawl_with_engine(base, tmp_path):
+    cache = CrawlCache(str(tmp_path / "crawl.db"))
+
+    async def crawl():
+        async with CrawlEngine(cache=cache) as engine:
+            return {r["url"][len(base):]: r async for r in engine.crawl_many(base + p for p in PATHS)}
+
+    asyncio.run(crawl())
+    results = asyncio.run(crawl())
+    assert results["/etag"]["metadata"]["status"] == 304 and results["/etag"]["metadata"]["not_modified"]
+    assert results["/plain"]["metadata"]["cache"] == "unchanged"
+    assert "not_modified" not in results["/changing"]["metadata"]
+    assert cache.stats()["new"] == 4 and cache.stats()["not_modified"] == 2
+
+
+def test_engine_keeps_cache_calls_off_the_event_loop(base, tmp_path):
+    threads = set()
+
+    class RecordingCache(CrawlCache):
+        def entry(self, url):
+            threads.add(threading.get_ident())
+            return super().entry(url)
+
+    cache = RecordingCache(str(tmp_path / "crawl.db"))
+
+    async def crawl():
+        async with CrawlEngine(cache=cache) as engine:
+            results = [r async for r in engine.crawl_many(base + p for p in PATHS)]
+        return threading.get_ident(), results
+
+    loop_thread, results = asyncio.run(crawl())
+    assert len(results) == len(PATHS) and len(cache) == len(PATHS)
+    assert threads and loop_thread not in threads
+
+
+def test_links_are_kept_and_old_files_migrated(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    old = sqlite3.connect(path)
+    old.execute(
+        "CREATE TABLE pages (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT NOT NULL, "
+        "length INTEGER NOT NULL, title TEXT, fetched_at REAL NOT NULL)"
+    )
+    old.commit()
+    old.close()
+    with CrawlCache(path) as cache:
+        cache.record("https://acme.test/", 200, {}, b"<a href='/a'>", "Home")
+        assert cache.links("https://acme.test/") is None
+        cache.set_links("https://acme.test/", ["https://acme.test/a"])
+        # A re-crawl finding the page unchanged keeps them
+        cache.record("https://acme.test/", 200, {}, b"<a href='/a'>", "Home")
+        assert cache.links("https://acme.test/") == ["https://acme.test/a"]
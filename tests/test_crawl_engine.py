@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crawler_simulator.agent import CrawlerSimulator
+from crawler_simulator.engine import CrawlEngine
+
+
+class StubServer(ThreadingHTTPServer):
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.starts = {}
+        self.failures = {}
+        self.connections = set()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        host = self.headers["Host"].split(":")[0]
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.active[host] = server.active.get(host, 0) + 1
+            server.active["*"] = server.active.get("*", 0) + 1
+            for key in (host, "*"):
+                server.peak[key] = max(server.peak.get(key, 0), server.active[key])
+            server.starts.setdefault(host, []).append(time.monotonic())
+            fail = self.path.startswith("/flaky") and server.failures.get(self.path, 0) < 2
+            if fail:
+                server.failures[self.path] = server.failures.get(self.path, 0) + 1
+        try:
+            time.sleep(0.3 if self.path.startswith("/slow") else 0.02)
+            status = 503 if fail else 200
+            body = f"<html><head><title>Page {self.path}</title></head><body>ok</body></html>".encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active[host] -= 1
+                server.active["*"] -= 1
+
+
+@pytest.fixture
+def server(serve):
+    return serve(StubHandler, StubServer)
+
+
+async def collect(engine, urls):
+    async with engine:
+        return [r async for r in engine.crawl_many(urls)]
+
+
+def test_limits_and_keep_alive(server):
+    urls = [f"http://127.0.0.1:{server.port}/p{i}" for i in range(30)]
+    urls += [f"http://localhost:{server.port}/p{i}" for i in range(30)]
+    engine = CrawlEngine(concurrency=5, per_host=3)
+    results = asyncio.run(collect(engine, urls))
+    assert sorted(r["url"] for r in results) == sorted(urls)
+    assert all(r["metadata"]["status"] == 200 for r in results)
+    assert results[0]["metadata"]["title"].startswith("Page /p")
+    assert server.peak["*"] <= 5 and server.peak["127.0.0.1"] <= 3 and server.peak["localhost"] <= 3
+    assert server.peak["*"] >= 4
+
+    # Connections to a host are kept alive and reused
+    server.connections.clear()
+    asyncio.run(collect(CrawlEngine(concurrency=3, per_host=3), urls[:30]))
+    assert len(server.connections) <= 3
+
+
+def test_retries_with_backoff_and_completion_order(server):
+    base = f"http://127.0.0.1:{server.port}"
+    urls = [f"{base}/slow", f"{base}/flaky1", f"{base}/fast"]
+    engine = CrawlEngine(concurrency=10, per_host=10, retries=3, backoff=0.01)
+    results = asyncio.run(collect(engine, urls))
+    assert [r["url"] for r in results][-1] == f"{base}/slow"
+    flaky = next(r for r in results if r["url"].endswith("flaky1"))
+    assert flaky["metadata"]["status"] == 200 and flaky["metadata"]["attempts"] == 3
+    assert engine.stats["retries"] == 2
+
+    engine = CrawlEngine(retries=1, backoff=0.01)
+    (gave_up,) = asyncio.run(collect(engine, [f"{base}/flaky2"]))
+    assert gave_up["metadata"]["status"] == 503 and gave_up["metadata"]["attempts"] == 2
+
+
+def test_per_host_rate_and_errors(server):
+    urls = [f"http://127.0.0.1:{server.port}/r{i}" for i in range(6)]
+    engine = CrawlEngine(concurrency=10, per_host=10, per_host_rate=20)
+    asyncio.run(collect(engine, urls))
+    starts = server.starts["127.0.0.1"]
+    assert starts[-1] - starts[0] >= 5 / 20 * 0.9
+
+    results = CrawlerSimulator().crawl_many(["http://127.0.0.1:1/nothing"], retries=1, backoff=0.01)
+    assert "error" in results[0]["metadata"] and results[0]["metadata"]["attempts"] == 2
@@ -0,0 +1,225 @@
+import gzip
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from crawler_simulator.frontier import Frontier, ScalableBloomFilter, canonicalize, extract_links, parse_sitemap
+from pipelines.pipelines import run_crawl_analysis_pipeline
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://acme.test/old</loc><lastmod>2020-01-01</lastmod></url>
+  <url><loc>https://acme.test/new</loc><lastmod>2024-06-01T12:00:00Z</lastmod></url>
+  <url><loc>https://acme.test/undated</loc></url>
+</urlset>"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://acme.test/sitemap-1.xml</loc></sitemap>
+</sitemapindex>"""
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Acme.TEST:443/a/./b/../c?b=2&a=1#top", "https://acme.test/a/c?a=1&b=2"),
+    ("http://acme.test:8080", "http://acme.test:8080/"),
+    ("https://acme.test/p?utm_source=x&gclid=1&id=7&FBCLID=2", "https://acme.test/p?id=7"),
+    ("https://acme.test/p%2fq/", "https://acme.test/p%2Fq/"),
+    ("https://acme.test/a/..", "https://acme.test/"),
+    ("mailto:team@acme.test", None),
+    ("https://acme.test:notaport/", None),
+])
+def test_canonicalize(url, expected):
+    assert canonicalize(url) == expected
+
+
+def test_extract_links_resolves_and_canonicalizes():
+    page = """<a href="/about#team">About</a> <A HREF='blog/?utm_medium=x'>Blog</A>
+              <a class="x" href=https://Other.test/>Other</a> <a href="javascript:void(0)">JS</a>
+              <a href="/q?a=1&amp;b=2">Q</a>"""
+    assert extract_links(page, "https://acme.test/en/") == [
+        "https://acme.test/about",
+        "https://acme.test/en/blog/",
+        "https://other.test/",
+        "https://acme.test/q?a=1&b=2",
+    ]
+
+
+def test_parse_sitemap_and_index():
+    entries = list(parse_sitemap(gzip.compress(SITEMAP)))
+    assert [(kind, url) for kind, url, _ in entries] == [
+        ("page", "https://acme.test/old"), ("page", "https://acme.test/new"), ("page", "https://acme.test/undated"),
+    ]
+    assert entries[0][2] < entries[1][2] and entries[2][2] is None
+    assert list(parse_sitemap(SITEMAP_INDEX)) == [("sitemap", "https://acme.test/sitemap-1.xml", None)]
+
+
+def test_scalable_bloom_filter_grows_without_false_negatives(tmp_path):
+    bloom = ScalableBloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"https://acme.test/{i}" for i in range(10_000)]
+    for item in items:
+        bloom.add(item)
+    assert len(bloom.slices) > 1
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"https://other.test/{i}" in bloom for i in range(10_000))
+    assert false_positives / 10_000 < 0.01
+    assert not bloom.add(items[0])
+
+    bloom.save(str(tmp_path / "bloom.npz"))
+    loaded = ScalableBloomFilter.load(str(tmp_path / "bloom.npz"))
+    assert len(loaded) == len(bloom) and all(item in loaded for item in items)
+
+
+def test_frontier_dedups_spellings(tmp_path):
+    with Frontier(str(tmp_path / "f.db")) as frontier:
+        assert frontier.add("https://acme.test/a")
+        assert not frontier.add("HTTPS://ACME.test/a#x")
+        assert not frontier.add("https://acme.test/a?utm_campaign=y")
+        assert frontier.add("/b", base="https://acme.test/a")
+        assert len(frontier) == 2
+
+
+def test_frontier_is_host_fair_then_shallow_and_fresh_first(tmp_path):
+    with Frontier(str(tmp_path / "f.db")) as frontier:
+        for i in range(3):
+            frontier.add(f"https://big.test/deep{i}", depth=2)
+        frontier.add_sitemap(SITEMAP.replace(b"acme.test", b"big.test"), depth=1)
+        frontier.add("https://small.test/", depth=0)
+        order = [frontier.pop(now=0)["url"] for _ in range(len(frontier))]
+    assert order[:2] == ["https://big.test/new", "https://small.test/"]
+    assert order[2:] == [
+        "https://big.test/old", "https://big.test/undated",
+        "https://big.test/deep0", "https://big.test/deep1", "https://big.test/deep2",
+    ]
+
+
+def test_frontier_host_delay(tmp_path):
+    with Frontier(str(tmp_path / "f.db"), host_delay=10.0) as frontier:
+        frontier.add_many(["https://acme.test/1", "https://acme.test/2"])
+        assert frontier.pop(now=100)["url"] == "https://acme.test/1"
+        assert frontier.pop(now=105) is None
+        assert frontier.next_ready() == 110
+        assert frontier.pop(now=110)["url"] == "https://acme.test/2"
+        assert frontier.pop(now=200) is None and frontier.next_ready() is None
+
+
+def test_frontier_limits(tmp_path):
+    with Frontier(str(tmp_path / "f.db"), max_depth=1, allowed_hosts=["Acme.test"]) as frontier:
+        assert frontier.add("https://acme.test/", depth=1)
+        assert not frontier.add("https://acme.test/deeper", depth=2)
+        assert not frontier.add("https://elsewhere.test/")
+
+
+def test_frontier_resumes_after_restart(tmp_path):
+    path = str(tmp_path / "f.db")
+    frontier = Frontier(path)
+    frontier.add_many(f"https://acme.test/{i}" for i in range(5))
+    done = frontier.pop(now=0)
+    frontier.done(done)
+    in_flight = frontier.pop(now=0)
+    frontier.checkpoint()
+    frontier._db.close()  # a crash: no close()
+
+    with Frontier(path) as resumed:
+        assert len(resumed) == 4
+        assert not resumed.add(done["url"])
+        urls = {resumed.pop(now=0)["url"] for _ in range(4)}
+        assert in_flight["url"] in urls and done["url"] not in urls
+        assert resumed.pop(now=0) is None
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pages = {
+        "/": ("Home", '<a href="/a">A</a> <a href="/b?utm_source=home">B</a> <a href="https://elsewhere.test/">X</a>'),
+        "/a": ("A", 'dental implants <a href="/">Home</a> <a href="/a/deep">Deep</a>'),
+        "/b": ("B", "dental crowns <a href='/a#top'>A again</a>"),
+        "/a/deep": ("Deep", "too deep"),
+    }
+
+    def log_message(self, *args):
+        pass
+
+    # Indexes listing themselves and each other; {base} is the server's URL
+    sitemaps = {
+        "/sitemap.xml": ["{base}/sitemap.xml", "{base}/sitemap-2.xml"],
+        "/sitemap-2.xml": ["{base}/./sitemap.xml", "{base}/sitemap-2.xml#again", "{base}/sitemap-pages.xml"],
+    }
+
+    def do_GET(self):
+        self.server.hits.append(self.path)
+        base = "http://%s:%d" % self.server.server_address
+        if self.path in self.sitemaps:
+            locs = "".join(f"<sitemap><loc>{loc.format(base=base)}</loc></sitemap>" for loc in self.sitemaps[self.path])
+            return self._send(200, "application/xml", f"<sitemapindex>{locs}</sitemapindex>".encode())
+        if self.path == "/sitemap-pages.xml":
+            return self._send(200, "application/xml", f"<urlset><url><loc>{base}/b</loc></url></urlset>".encode())
+        page = self.pages.get(self.path)
+        body = f"<html><head><title>{page[0]}</title></head><body>{page[1]}</body></html>".encode() if page else b"x"
+        self._send(200 if page else 404, "text/html; charset=utf-8", body)
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def site(serve):
+    server = serve(SiteHandler)
+    server.hits = []
+    return server
+
+
+def test_crawl_analysis_pipeline_follows_links_once(site):
+    root = f"http://127.0.0.1:{site.server_address[1]}/"
+    results = run_crawl_analysis_pipeline([root], max_depth=1)
+    assert sorted(r["url"][len(root) - 1:] for r in results) == ["/", "/a", "/b"]
+    assert sorted(site.hits) == ["/", "/a", "/b"]
+    by_path = {r["url"][len(root) - 1:]: r for r in results}
+    assert by_path["/a"]["depth"] == 1
+    assert by_path["/b"]["metadata"]["title"] == "B"
+    assert ("dental", 1) in by_path["/b"]["analysis"]["top_words"]
+
+
+def test_crawl_analysis_pipeline_follows_links_of_unchanged_pages(site, tmp_path):
+    from crawler_simulator.cache import CrawlCache
+
+    root = f"http://127.0.0.1:{site.server_address[1]}/"
+    with CrawlCache(str(tmp_path / "crawl.db")) as cache:
+        first = run_crawl_analysis_pipeline([root], max_depth=1, cache=cache)
+    site.hits.clear()
+    with CrawlCache(str(tmp_path / "crawl.db")) as cache:
+        again = run_crawl_analysis_pipeline([root], max_depth=1, cache=cache)
+    assert sorted(site.hits) == ["/", "/a", "/b"]
+    assert sorted(r["url"] for r in again) == sorted(r["url"] for r in first)
+    assert all(r["analysis"] is None and r["metadata"]["cache"] == "unchanged" for r in again)
+
+
+def test_crawl_analysis_pipeline_fetches_each_sitemap_once(site):
+    base = "http://127.0.0.1:%d" % site.server_address[1]
+    results = run_crawl_analysis_pipeline([], sitemaps=[base + "/sitemap.xml"], max_depth=0)
+    assert [r["url"] for r in results] == [base + "/b"]
+    assert sorted(site.hits) == ["/b", "/sitemap-2.xml", "/sitemap-pages.xml", "/sitemap.xml"]
+
+
+def test_crawl_analysis_pipeline_uses_one_engine_and_counts_failed_pages(site, monkeypatch):
+    from pipelines import pipelines
+
+    engines = []
+
+    class CountingEngine(pipelines.CrawlEngine):
+        def __init__(self, **options):
+            super().__init__(**options)
+            engines.append(self)
+
+    monkeypatch.setattr(pipelines, "CrawlEngine", CountingEngine)
+    root = f"http://127.0.0.1:{site.server_address[1]}/"
+    # Nothing listens on port 1, so these fail at once
+    unreachable = [f"http://127.0.0.1:1/page-{i}" for i in range(6)]
+    results = run_crawl_analysis_pipeline(unreachable + [root], max_pages=4, max_depth=1, batch_size=1, retries=0)
+    assert len(engines) == 1
+    assert engines[0].stats["requests"] == 4
+    assert engines[0].stats["errors"] == 4 - len(site.hits) > 0
+    assert sorted(r["url"] for r in results) == sorted(root[:-1] + path for path in site.hits)
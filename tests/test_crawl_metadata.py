@@ -0,0 +1,73 @@
+import asyncio
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from crawler_simulator.agent import CrawlerSimulator
+from crawler_simulator.engine import CrawlEngine
+from crawler_simulator.metadata import head_metadata, parse_dom
+
+HEAD = """<!DOCTYPE html><html lang="en-US"><head>
+<meta charset="utf-8"><title>
+  Acme Dental &amp; Co  </title>
+<meta name="description" content="Dental tools for clinics.">
+<link rel="alternate canonical" href="https://acme.test/">
+<script type="application/ld+json">{"@type": "Organization", "name": "Acme"}</script>
+<script type="application/ld+json">{not json}</script>
+</head>"""
+PAGE = HEAD + "<body>" + '<script type="application/ld+json">{"@type": "Product"}</script>' + "<p>x</p>" * 50_000 + "</body></html>"
+
+
+def test_head_metadata_reads_the_head_only():
+    meta = head_metadata(PAGE.encode())
+    assert meta == {
+        "title": "Acme Dental & Co",
+        "description": "Dental tools for clinics.",
+        "canonical": "https://acme.test/",
+        "language": "en-US",
+        "json_ld": [{"@type": "Organization", "name": "Acme"}],
+    }
+    assert head_metadata(PAGE) == meta
+    assert head_metadata("<title>cut off")["title"] == "cut off"
+    assert head_metadata(b"no markup at all") == {
+        "title": None, "description": None, "canonical": None, "language": None, "json_ld": [],
+    }
+    assert parse_dom(PAGE).title.string.strip() == "Acme Dental & Co"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = PAGE.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def url(serve):
+    return f"http://127.0.0.1:{serve(PageHandler).server_address[1]}/page"
+
+
+def test_body_cap_and_truncation_flag(url):
+    full = CrawlerSimulator().crawl(url)
+    assert full["content"] == PAGE and not full["metadata"]["truncated"]
+    assert full["metadata"]["title"] == "Acme Dental & Co" and full["metadata"]["language"] == "en-US"
+
+    capped = CrawlerSimulator(max_bytes=10_000).crawl(url)
+    assert capped["metadata"]["truncated"] and capped["metadata"]["length"] == 10_000
+    assert capped["content"] == PAGE[:10_000] and capped["metadata"]["canonical"] == "https://acme.test/"
+
+    async def crawl():
+        async with CrawlEngine(max_bytes=len(HEAD) + 10) as engine:
+            return [r async for r in engine.crawl_many([url])]
+
+    (page,) = asyncio.run(crawl())
+    assert page["metadata"]["truncated"] and page["metadata"]["length"] == len(HEAD) + 10
+    assert page["metadata"]["description"] == "Dental tools for clinics." and page["metadata"]["status"] == 200
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+
+from content_analyzer.agent import ContentAnalyzer
+from content_analyzer.dedup import DuplicateIndex, simhash
+
+WORDS = ["acme", "dental", "launches", "new", "toothbrush", "clinic", "price", "care", "smile", "kit", "review", "team"]
+
+
+def release(rng, n=400):
+    return " ".join(rng.choice(WORDS) + str(rng.randint(0, 50)) for _ in range(n))
+
+
+def test_simhash_is_close_for_near_duplicates():
+    rng = random.Random(0)
+    text = release(rng)
+    syndicated = "Reposted from the wire. " + text + " Share this story."
+    other = release(rng)
+    assert simhash(text) == simhash(text.upper())
+    assert bin(simhash(text) ^ simhash(syndicated)).count("1") <= 3
+    assert bin(simhash(text) ^ simhash(other)).count("1") > 10
+    assert simhash("") == 0
+
+
+def test_index_finds_all_fingerprints_within_distance():
+    rng = np.random.default_rng(0)
+    index = DuplicateIndex(max_distance=3)
+    base = rng.integers(0, 2**63, size=3000, dtype=np.uint64) * np.uint64(2) + rng.integers(0, 2, 3000, dtype=np.uint64)
+    for i, fp in enumerate(base.tolist()):
+        assert index.add(f"d{i}", fp) == f"d{i}"
+    for i, fp in enumerate(base[:200].tolist()):
+        flips = rng.choice(64, size=rng.integers(0, 4), replace=False)
+        near = fp ^ sum(1 << int(b) for b in flips)
+        assert index.query(near)[0] == (f"d{i}", len(flips))
+        far = fp ^ sum(1 << int(b) for b in rng.choice(64, size=8, replace=False))
+        assert f"d{i}" not in dict(index.query(far))
+    # Duplicates point at the root copy, not at the duplicate they matched
+    assert index.add("dup", int(base[7]) ^ 1) == "d7"
+    assert index.add("dup2", int(base[7]) ^ 3) == "d7"
+    assert index.canonical("dup2") == "d7" and index.add("dup2", int(base[7]) ^ 3) == "d7"
+
+
+def test_readding_an_id_with_a_new_fingerprint_replaces_it():
+    index = DuplicateIndex(max_distance=3)
+    assert index.add("page", 0xF0F0) == "page"
+    assert index.add("copy", 0xF0F1) == "page"
+    # The page changed: it is no longer its old self, nor matched as such
+    assert index.add("page", 0xFFFF_0000_0000_0000) == "page"
+    assert index.fingerprint("page") == 0xFFFF_0000_0000_0000 and len(index) == 2
+    assert index.query(0xF0F0) == [("copy", 1)]
+    assert index.add("other", 0xF0F0) == "page"  # the canonical id of "copy"
+    assert index.add("later", 0xFFFF_0000_0000_0001) == "page"
+
+
+def test_save_load_and_incremental_inserts(tmp_path):
+    index = DuplicateIndex(max_distance=2)
+    for i in range(1500):
+        index.add(f"d{i}", i * 0x9E3779B97F4A7C15 % 2**64)
+    index.add("tail", 12345)
+    index.save(str(tmp_path / "index.npz"))
+    loaded = DuplicateIndex.load(str(tmp_path / "index.npz"))
+    assert len(loaded) == 1501 and loaded.max_distance == 2
+    assert loaded.query(12345 ^ 2) == [("tail", 1)]
+    assert loaded.add("new", 12345 ^ 4) == "tail"
+    assert loaded.add("d5", index.fingerprint("d5")) == "d5"
+    assert loaded.add("d5", 12345 ^ 1) == "tail" and loaded.fingerprint("d5") == 12345 ^ 1
+    loaded.save(str(tmp_path / "again.npz"))
+    again = DuplicateIndex.load(str(tmp_path / "again.npz"))
+    assert len(again) == 1502 and ("d5", 0) not in again.query(index.fingerprint("d5"))
+
+
+def test_analyze_unique_reuses_canonical_results():
+    rng = random.Random(1)
+    a, b = release(rng), release(rng)
+    docs = [("a", f"<p>{a}</p>"), ("b", b), ("a-copy", f"<div>Syndicated</div><p>{a}</p>")]
+    index = DuplicateIndex()
+    analyzer = ContentAnalyzer()
+    results = analyzer.analyze_unique(docs, index)
+    assert [(r["doc_id"], r["canonical"]) for r in results] == [("a", "a"), ("b", "b"), ("a-copy", "a")]
+    assert results[2]["top_words"] == results[0]["top_words"] == analyzer.analyze(a)["top_words"]
+    assert analyzer.analyze_unique([("a-again", a)], index)[0]["canonical"] == "a"
+
+
+def test_orchestrator_reanalyzes_a_changed_page(tmp_path, monkeypatch):
+    from content_analyzer.cache import AnalysisCache
+    from crawler_simulator.agent import CrawlerSimulator
+    from orchestrator.orchestrator import Orchestrator
+
+    rng = random.Random(2)
+    pages = {"https://acme.test/a": release(rng)}
+    monkeypatch.setattr(CrawlerSimulator, "crawl", lambda self, url: {"url": url, "content": pages[url]})
+    orchestrator = Orchestrator(duplicates=DuplicateIndex(), cache=AnalysisCache(str(tmp_path / "a.db")))
+    first = orchestrator.run("https://acme.test/a")
+
+    pages["https://acme.test/a"] = release(rng)
+    changed = orchestrator.run("https://acme.test/a")
+    assert changed["analysis"] == ContentAnalyzer().analyze(pages["https://acme.test/a"])
+    assert changed["analysis"] != first["analysis"]
+    # And the cache entry for the new text is the new analysis, in a fresh process too
+    again = Orchestrator(duplicates=DuplicateIndex(), cache=AnalysisCache(str(tmp_path / "a.db")))
+    assert again.run("https://acme.test/a")["analysis"] == changed["analysis"]
+
+
+def test_orchestrator_does_not_dedup_empty_pages(monkeypatch):
+    from crawler_simulator.agent import CrawlerSimulator
+    from orchestrator.orchestrator import Orchestrator
+
+    monkeypatch.setattr(CrawlerSimulator, "crawl", lambda self, url: {"url": url, "content": "<p> </p>"})
+    index = DuplicateIndex()
+    orchestrator = Orchestrator(duplicates=index)
+    assert orchestrator.run("https://acme.test/a")["canonical"] == "https://acme.test/a"
+    assert orchestrator.run("https://acme.test/b")["canonical"] == "https://acme.test/b"
+    assert len(index) == 0
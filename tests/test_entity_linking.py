@@ -0,0 +1,73 @@
+import json
+
+from content_analyzer.agent import ContentAnalyzer
+from content_analyzer.entities import EntityLinker, fetch_entities
+
+ENTITIES = [
+    {"id": "b1", "slug": "acme", "displayName": "Acme"},
+    {"id": "b2", "slug": "acme-dental", "displayName": "Acme Dental"},
+    {"id": "p1", "slug": "smilekit-2", "displayName": "SmileKit 2"},
+    {"id": "p2", "slug": "dental-floss", "displayName": "Dental Floss"},
+]
+
+
+def spans(mentions):
+    return [(m["entity_id"], m["name"], m["start"], m["end"]) for m in mentions]
+
+
+def test_link_longest_match_and_offsets():
+    linker = EntityLinker(ENTITIES)
+    text = "ACME dental ships the SmileKit-2; acme also sells dental floss."
+    assert spans(linker.link(text)) == [
+        ("b2", "ACME dental", 0, 11),
+        ("p1", "SmileKit-2", 22, 32),
+        ("b1", "acme", 34, 38),
+        ("p2", "dental floss", 50, 62),
+    ]
+    overlapping = {(e, s) for e, _, s, _ in spans(linker.link("Acme Dental Floss", overlapping=True))}
+    assert overlapping == {("b1", 0), ("b2", 0), ("p2", 5)}
+    assert linker.link("acmes and smilekit") == []
+
+
+def test_incremental_updates_match_a_fresh_build():
+    linker = EntityLinker(ENTITIES[:2])
+    text = "Acme Dental Floss by Acme, now with SmileKit 2"
+    linker.link(text)
+    linker.update(ENTITIES[2:])
+    linker.add({"id": "b1", "displayName": "Acme Corp", "slug": "acme-corp"})
+    linker.sync([e for e in ENTITIES if e["id"] != "b2"] + [{"id": "b1", "displayName": "Acme Corp"}])
+    expected = EntityLinker([ENTITIES[2], ENTITIES[3], {"id": "b1", "displayName": "Acme Corp"}])
+    assert "b2" not in linker and len(linker) == 3
+    assert linker.link(text) == expected.link(text)
+    assert spans(linker.link(text)) == [("p2", "Dental Floss", 5, 17), ("p1", "SmileKit 2", 36, 46)]
+
+
+def test_failure_links_find_names_inside_longer_prefixes():
+    linker = EntityLinker([{"id": "x", "displayName": "a b c d"}, {"id": "y", "displayName": "b c e"}])
+    assert spans(linker.link("a b c e")) == [("y", "b c e", 2, 7)]
+
+
+def test_snapshot_save_load_and_analyzer(tmp_path):
+    snapshot = tmp_path / "entities.json"
+    snapshot.write_text(json.dumps({"entities": ENTITIES}))
+    linker = EntityLinker.from_snapshot(str(snapshot))
+    linker.save(str(tmp_path / "linker.pkl"))
+    loaded = EntityLinker.load(str(tmp_path / "linker.pkl"))
+    text = "<p>Acme Dental</p><p>SmileKit 2</p>"
+    result = ContentAnalyzer(linker=loaded).analyze(text)
+    assert [m["entity_id"] for m in result["entities"]] == ["b2", "p1"]
+    analyzer = ContentAnalyzer(linker=linker)
+    assert analyzer.analyze_many([text, "acme"], workers=2) == [analyzer.analyze(text), analyzer.analyze("acme")]
+
+
+def test_fetch_entities_pages_through_graph_service():
+    import httpx
+
+    entities = [{"id": str(i), "displayName": f"brand {i}"} for i in range(450)]
+
+    def handler(request):
+        offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+        return httpx.Response(200, json={"entities": entities[offset:offset + limit]})
+
+    client = httpx.Client(base_url="http://graph", transport=httpx.MockTransport(handler))
+    assert fetch_entities("http://graph", client=client) == entities
@@ -1,5 +1,9 @@
 import json
+import numpy as np
+from aether.core.accumulator import GeoScoreAccumulator
 from aether.core.geo import compute_geo_score
+from aether.core.interning import CategoryTable
+from aether.core.metrics import entropy
 
 
 def test_geo_score():
@@ -11,6 +15,65 @@ def test_geo_score():
     print(score)
 
 
+def test_entropy_from_interned_codes():
+    table = CategoryTable("persona")
+    values = ["consumer", "clinician", "consumer", "press"] * 5
+    codes = table.encode(values)
+    assert len(table) == 3
+    assert table.encode(values).tolist() == codes.tolist()
+    assert np.isclose(entropy(codes), entropy(values))
+    assert np.isclose(entropy(codes), 1.5, atol=1e-6)
+    # Sparse code ranges take the sort path
+    assert np.isclose(entropy(np.array([0, 10**9])), 1.0, atol=1e-6)
+    assert entropy([]) == 0.0
+
+
+def test_unhashable_categories_count_by_string_form():
+    mentions = [
+        {"source": "a", "surface_area": ["faq", ["x"]], "persona": ["consumer", "press"], "ontology": {"k": 1}},
+        {"source": "b", "surface_area": [["x"]], "persona": "clinician", "ontology": "none"},
+        {"source": "c", "surface_area": ["faq"], "persona": ["consumer", "press"], "ontology": {"k": 1}},
+    ]
+    score = compute_geo_score({"brand": "acme", "mentions": mentions})
+    stringified = [
+        {**m, "persona": str(m["persona"]), "ontology": str(m["ontology"]),
+         "surface_area": [s if isinstance(s, str) else str(s) for s in m["surface_area"]]}
+        for m in mentions
+    ]
+    assert np.isclose(score["diversity"], compute_geo_score({"brand": "acme", "mentions": stringified})["diversity"])
+    assert 0 <= score["geo_score"] <= 1
+    acc = GeoScoreAccumulator("acme", mentions)
+    assert np.isclose(acc.score()["diversity"], score["diversity"])
+    acc.remove(mentions[0])
+
+    table = CategoryTable("persona")
+    assert table.encode([["a", "b"], "x", ["a", "b"]]).tolist() == [0, 1, 0]
+    assert table.code(["a", "b"]) == table.code("['a', 'b']") == 0
+
+
+
+def test_full_shared_tables_fall_back_to_private_ones(monkeypatch):
+    from datetime import datetime
+    from aether.core import interning
+    from aether.core.batch import compute_geo_scores_batch
+    from aether.core.metrics import compute_diversity_score
+    from benchmarks.synthetic import make_brands
+
+    brands = make_brands(3, mean_mentions=20, seed=12)
+    for i, brand in enumerate(brands):
+        for j, m in enumerate(brand["mentions"]):
+            m["persona"] = f"shared-table-test-{i}-{j}"
+    as_of = datetime(2026, 1, 1)
+    expected = compute_geo_scores_batch(brands, as_of=as_of)
+
+    sizes = {name: len(table) for name, table in interning.__dict__.items() if isinstance(table, CategoryTable)}
+    monkeypatch.setattr(interning, "SHARED_TABLE_LIMIT", 0)
+    brands = [{**b, "mentions": [{**m, "persona": "other-" + m["persona"]} for m in b["mentions"]]} for b in brands]
+    assert compute_geo_scores_batch(brands, as_of=as_of) == expected
+    assert compute_geo_score(brands[0], as_of=as_of) == expected[0]
+    assert np.isclose(compute_diversity_score(brands[1]), expected[1]["diversity"])
+    assert {name: len(table) for name, table in interning.__dict__.items() if isinstance(table, CategoryTable)} == sizes
+
 if __name__ == "__main__":
     with open("tests/demo_data.json", "r") as f:
         data = json.load(f)
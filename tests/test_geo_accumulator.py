@@ -0,0 +1,76 @@
+import random
+import numpy as np
+import pytest
+from datetime import datetime
+from aether.core.accumulator import GeoScoreAccumulator
+from aether.core.geo import compute_geo_score
+from benchmarks.synthetic import make_brand
+
+AS_OF = datetime(2026, 1, 1)
+
+
+def assert_scores_close(got, expected):
+    for key in ("presence", "quality", "diversity", "geo_score"):
+        assert np.isclose(got[key], expected[key], atol=1e-8), key
+
+
+def test_accumulator_matches_full_recompute():
+    brand = make_brand(random.Random(3), 0, 60)
+    acc = GeoScoreAccumulator(brand["brand"])
+    for i, m in enumerate(brand["mentions"]):
+        acc.add(m)
+        partial = {"brand": brand["brand"], "mentions": brand["mentions"][: i + 1]}
+        assert_scores_close(acc.score(AS_OF), compute_geo_score(partial, as_of=AS_OF))
+
+
+def test_accumulator_remove_restores_previous_score():
+    brand = make_brand(random.Random(4), 0, 30)
+    acc = GeoScoreAccumulator.from_payload(brand)
+    removed = brand["mentions"][:10]
+    for m in removed:
+        acc.remove(m)
+    rest = {"brand": brand["brand"], "mentions": brand["mentions"][10:]}
+    assert_scores_close(acc.score(AS_OF), compute_geo_score(rest, as_of=AS_OF))
+
+    with pytest.raises(KeyError):
+        GeoScoreAccumulator().remove(removed[0])
+
+
+@pytest.mark.parametrize("as_of", [
+    datetime(2025, 6, 10, 12, 0),
+    datetime(2025, 6, 10, 3, 0),
+    datetime(2025, 6, 10, 2, 59, 59, 999999),
+    datetime(2025, 6, 10, 23, 59, 59),
+])
+def test_accumulator_matches_full_recompute_at_any_time_of_day(as_of):
+    times = ["2025-06-01T03:00:00", "2025-06-01T03:00:00.000001", "2025-06-05T12:00:00", "2025-06-09T23:30:00"]
+    mentions = [
+        {"source": f"s{i}", "surface_area": ["faq"], "persona": "p", "ontology": "o", "last_seen": t}
+        for i, t in enumerate(times)
+    ]
+    acc = GeoScoreAccumulator("acme", mentions)
+    assert_scores_close(acc.score(as_of), compute_geo_score({"brand": "acme", "mentions": mentions}, as_of=as_of))
+    acc.remove(mentions[2])
+    rest = {"brand": "acme", "mentions": mentions[:2] + mentions[3:]}
+    assert_scores_close(acc.score(as_of), compute_geo_score(rest, as_of=as_of))
+
+
+def test_accumulator_matches_full_recompute_at_random_times():
+    brand = make_brand(random.Random(5), 0, 80)
+    acc = GeoScoreAccumulator.from_payload(brand)
+    rng = random.Random(6)
+    for _ in range(20):
+        as_of = datetime(2026, 1, 1, rng.randrange(24), rng.randrange(60), rng.randrange(60))
+        assert_scores_close(acc.score(as_of), compute_geo_score(brand, as_of=as_of))
+
+
+def test_accumulator_handles_widely_spaced_dates():
+    brand = make_brand(random.Random(5), 0, 6)
+    dates = ["1970-01-01T00:00:00", "2025-03-01T10:00:00", "1990-05-05T05:00:00", "2025-12-30T00:00:00"]
+    for order in (dates, dates[::-1]):
+        mentions = [{**m, "last_seen": d} for m, d in zip(brand["mentions"], order)]
+        acc = GeoScoreAccumulator(brand["brand"], mentions)
+        assert_scores_close(acc.score(AS_OF), compute_geo_score({**brand, "mentions": mentions}, as_of=AS_OF))
+        acc.remove(mentions[1])
+        rest = [m for m in mentions if m is not mentions[1]]
+        assert_scores_close(acc.score(AS_OF), compute_geo_score({**brand, "mentions": rest}, as_of=AS_OF))
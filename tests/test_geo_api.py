@@ -0,0 +1,172 @@
+import asyncio
+import threading
+from datetime import datetime, time, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from aether.api import main
+from aether.api.executor import Overloaded, ScoringExecutor
+from benchmarks.synthetic import make_brands
+
+AS_OF = "2026-01-01T00:00:00"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    scoring = ScoringExecutor("process", workers=1)
+    monkeypatch.setattr(main, "scoring", scoring)
+    with TestClient(main.app) as client:
+        yield client
+    scoring.shutdown()
+
+
+def test_score_and_batch_endpoints(client):
+    brands = make_brands(5, mean_mentions=8, seed=2)
+    single = client.post("/geo/score", json={"data": brands[0], "as_of": AS_OF})
+    assert single.status_code == 200
+
+    batch = client.post("/geo/score:batch", json={"data": brands, "as_of": AS_OF})
+    assert batch.status_code == 200
+    results = batch.json()["results"]
+    assert [r["brand"] for r in results] == [b["brand"] for b in brands]
+    assert results[0]["geo_score"] == pytest.approx(single.json()["geo_score"], abs=1e-6)
+
+    assert client.post("/geo/score", json={"data": brands[0], "profile": "nope"}).status_code == 400
+    assert client.post("/geo/score:batch", json={"data": {}}).status_code == 400
+    assert client.get("/health").json()["scoring"]["pending"] == 0
+
+
+def test_executor_rejects_when_queue_is_full():
+    scoring = ScoringExecutor("thread", workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(scoring.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(Overloaded):
+            await scoring.run(sum, [1])
+        release.set()
+        assert await first
+        assert await scoring.run(sum, [1, 2]) == 3
+
+    asyncio.run(scenario())
+    assert scoring.stats()["rejected"] == 1
+    scoring.shutdown()
+
+
+def test_overload_maps_to_503(client, monkeypatch):
+    monkeypatch.setattr(main.scoring, "max_pending", 0)
+    r = client.post("/geo/score", json={"data": make_brands(1, seed=1)[0]})
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+
+
+def test_result_cache_and_conditional_requests(client, monkeypatch):
+    monkeypatch.setattr(main, "cache", main.ResultCache(max_bytes=10_000, ttl=60))
+    body = {"data": make_brands(1, mean_mentions=5, seed=9)[0], "as_of": AS_OF}
+
+    first = client.post("/geo/score", json=body)
+    again = client.post("/geo/score", json=body)
+    assert (first.headers["x-cache"], again.headers["x-cache"]) == ("miss", "hit")
+    assert again.json() == first.json()
+    etag = first.headers["etag"]
+    assert again.headers["etag"] == etag
+
+    r = client.post("/geo/score", json=body, headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+    changed = client.post("/geo/score", json={**body, "as_of": "2026-02-01T00:00:00"})
+    assert changed.headers["etag"] != etag
+
+    stats = client.get("/health").json()["cache"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_default_as_of_is_the_start_of_the_utc_day(client, monkeypatch):
+    monkeypatch.setattr(main, "cache", main.ResultCache(max_bytes=10_000, ttl=60))
+    midnight = datetime.combine(datetime.utcnow().date(), time.min)
+    # Seen a second after yesterday's midnight: 0 days old at midnight, 1 day old later on
+    brand = make_brands(1, mean_mentions=5, seed=9)[0]
+    seen = (midnight - timedelta(days=1) + timedelta(seconds=1)).isoformat()
+    brand["mentions"] = [{**m, "last_seen": seen} for m in brand["mentions"]]
+    midnight = midnight.isoformat()
+
+    default = client.post("/geo/score", json={"data": brand})
+    explicit = client.post("/geo/score", json={"data": brand, "as_of": midnight})
+    assert default.json() == explicit.json()
+    assert client.post("/geo/score", json={"data": brand}).headers["etag"] == default.headers["etag"]
+
+    import json
+    ndjson = "".join(json.dumps(m) + "\n" for m in brand["mentions"]).encode()
+    streamed = client.post("/geo/score:stream", params={"brand": brand["brand"]}, content=ndjson).json()
+    for key in ("presence", "quality", "diversity", "geo_score"):
+        assert streamed[key] == pytest.approx(default.json()[key], abs=1e-9)
+
+
+def test_result_cache_evicts_lru_and_expires():
+    cache = main.ResultCache(max_bytes=10, ttl=60)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+    cache.put("c", b"1234")
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.ttl = -1
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_stream_upload_matches_score(client):
+    import gzip
+    import json
+    brand = make_brands(1, mean_mentions=300, seed=5)[0]
+    expected = client.post("/geo/score", json={"data": brand, "as_of": AS_OF}).json()
+
+    ndjson = "".join(json.dumps(m) + "\n" for m in brand["mentions"]).encode()
+    body = gzip.compress(ndjson[:1000]) + gzip.compress(ndjson[1000:])
+    chunks = (body[i:i + 777] for i in range(0, len(body), 777))
+    r = client.post(
+        "/geo/score:stream",
+        params={"brand": brand["brand"], "as_of": AS_OF},
+        content=chunks,
+        headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+    )
+    assert r.status_code == 200
+    got = r.json()
+    assert got["brand"] == brand["brand"]
+    for key in ("presence", "quality", "diversity", "geo_score"):
+        assert got[key] == pytest.approx(expected[key], abs=1e-6)
+
+    assert client.post("/geo/score:stream", content=b'{"source": "x"}\n[1]\n').status_code == 400
+    assert client.post("/geo/score:stream", content=b"x", headers={"Content-Encoding": "gzip"}).status_code == 400
+
+
+@pytest.mark.parametrize("bad", [{"last_seen": "garbage"}, {"authority": "x"}])
+def test_stream_rejects_malformed_mentions_like_score(client, bad):
+    import json
+    mentions = make_brands(1, mean_mentions=30, seed=6)[0]["mentions"]
+    mentions = mentions[:2] + [{**mentions[2], **bad}]
+    assert client.post("/geo/score", json={"data": {"mentions": mentions}}).status_code == 400
+    body = "".join(json.dumps(m) + "\n" for m in mentions).encode()
+    r = client.post("/geo/score:stream", content=body)
+    assert r.status_code == 400 and r.json()["detail"].startswith("mention 3: ")
+
+
+def test_msgpack_negotiation_with_columnar_mentions(client):
+    msgpack = pytest.importorskip("msgpack")
+    brand = make_brands(1, mean_mentions=30, seed=6)[0]
+    expected = client.post("/geo/score", json={"data": brand, "as_of": AS_OF}).json()
+
+    columns = {f: [m[f] for m in brand["mentions"]] for f in brand["mentions"][0]}
+    body = msgpack.packb({"data": {"brand": brand["brand"], "mentions": columns}, "as_of": AS_OF})
+    r = client.post(
+        "/geo/score",
+        content=body,
+        headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"},
+    )
+    assert r.status_code == 200 and r.headers["content-type"] == "application/msgpack"
+    got = msgpack.unpackb(r.content)
+    assert got["geo_score"] == pytest.approx(expected["geo_score"], abs=1e-9)
+
+    bad = msgpack.packb({"data": {"mentions": {"source": ["a"], "accuracy": [0.1, 0.2]}}})
+    r = client.post("/geo/score", content=bad, headers={"Content-Type": "application/msgpack"})
+    assert r.status_code == 400
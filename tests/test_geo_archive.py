@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from aether.core.archive import MentionArchive, score_archive, write_archive
+from aether.core.batch import compute_geo_scores_batch
+from benchmarks.synthetic import make_brands
+
+AS_OF = datetime(2026, 1, 1)
+
+
+def test_archive_roundtrip_and_rescore(tmp_path):
+    brands = make_brands(40, mean_mentions=15, seed=7) + [{"brand": "empty", "mentions": []}]
+    path = str(tmp_path / "mentions.aema")
+    write_archive(path, iter(brands), group_mentions=100)
+
+    archive = MentionArchive(path)
+    assert len(archive) == len(brands)
+    assert archive.n_groups > 1
+    assert archive.brands == [b["brand"] for b in brands]
+
+    view = archive.brand(17)
+    raw = brands[17]["mentions"]
+    assert archive.decode("source", view.source) == [m["source"] for m in raw]
+    assert archive.decode("topic", view.topic) == [tuple(m["surface_area"]) for m in raw]
+    assert isinstance(view.accuracy.base, np.memmap) or isinstance(view.accuracy, np.memmap)
+
+    expected = compute_geo_scores_batch(brands, as_of=AS_OF)
+    got = list(score_archive(archive, as_of=AS_OF, max_brands=7))
+    assert [g["brand"] for g in got] == [e["brand"] for e in expected]
+    for g, e in zip(got, expected):
+        for key in ("presence", "quality", "diversity", "geo_score"):
+            assert np.isclose(g[key], e[key], atol=1e-9, equal_nan=True), key
+
+
+def test_archive_rejects_other_files(tmp_path):
+    path = tmp_path / "not-an-archive"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        MentionArchive(str(path))
+
+
+def test_failed_write_leaves_no_archive(tmp_path):
+    path = str(tmp_path / "mentions.aema")
+    write_archive(path, make_brands(3, mean_mentions=5, seed=1))
+
+    def payloads():
+        yield from make_brands(5, mean_mentions=15, seed=2)
+        raise RuntimeError("input truncated")
+
+    with pytest.raises(RuntimeError):
+        write_archive(path, payloads(), group_mentions=10)
+    assert len(MentionArchive(path)) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mentions.aema"]
@@ -0,0 +1,37 @@
+import json
+import numpy as np
+from aether.core.batch import compute_geo_scores_batch
+from aether.core.geo import compute_geo_score
+from benchmarks.synthetic import make_brands
+
+
+def test_batch_matches_per_brand():
+    with open("tests/demo_data.json", "r") as f:
+        demo = json.load(f)
+    brands = [demo] + make_brands(50, mean_mentions=8, seed=1)
+
+    batch = compute_geo_scores_batch(brands)
+    assert len(batch) == len(brands)
+    for raw, got in zip(brands, batch):
+        expected = compute_geo_score(raw)
+        assert got["brand"] == expected["brand"]
+        for key in ("presence", "quality", "diversity", "geo_score"):
+            assert np.isclose(got[key], expected[key], atol=1e-9), key
+
+
+def test_batch_empty():
+    assert compute_geo_scores_batch([]) == []
+
+
+def test_series_matches_per_date_scores():
+    from datetime import datetime, timedelta
+    from aether.core.geo import compute_geo_score_series
+
+    brand = make_brands(1, mean_mentions=40, seed=2)[0]
+    dates = [datetime(2025, 6, 1) + timedelta(days=i, hours=7 * i) for i in range(0, 400, 13)]
+    series = compute_geo_score_series(brand, dates)
+    assert [s["as_of"] for s in series] == [d.isoformat() for d in dates]
+    for d, got in zip(dates, series):
+        expected = compute_geo_score(brand, as_of=d)
+        for key in ("presence", "quality", "diversity", "geo_score"):
+            assert np.isclose(got[key], expected[key], atol=1e-9), key
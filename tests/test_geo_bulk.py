@@ -0,0 +1,82 @@
+import json
+import numpy as np
+from datetime import datetime
+from aether.core.batch import compute_geo_scores_batch
+from aether.core.bulk import bulk_score
+from benchmarks.synthetic import make_brands
+
+AS_OF = datetime(2026, 1, 1)
+
+
+def _write_input(path, brands):
+    with open(path, "w") as f:
+        for raw in brands:
+            f.write(json.dumps(raw) + "\n")
+        f.write("\n{not json\n")
+
+
+def test_bulk_score_in_order_with_resume(tmp_path):
+    brands = make_brands(30, mean_mentions=10, seed=3)
+    src, out = str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl")
+    _write_input(src, brands)
+
+    # Simulate a run interrupted after 12 records, mid-way through the 13th
+    bulk_score(src, out, workers=2, chunk_size=4, as_of=AS_OF, progress=None)
+    lines = open(out).read().splitlines(keepends=True)
+    with open(out, "w") as f:
+        f.writelines(lines[:12] + [lines[12][:10]])
+
+    n = bulk_score(src, out, workers=2, chunk_size=4, resume=True, as_of=AS_OF, progress=None)
+    assert n == len(brands) + 1 - 12
+
+    got = [json.loads(line) for line in open(out)]
+    expected = compute_geo_scores_batch(brands, as_of=AS_OF)
+    assert [g["brand"] for g in got[:-1]] == [b["brand"] for b in brands]
+    assert "invalid JSON" in got[-1]["error"]
+    for g, e in zip(got, expected):
+        assert np.isclose(g["geo_score"], e["geo_score"], atol=1e-12, equal_nan=True)
+
+
+def test_bulk_score_csv(tmp_path):
+    brands = make_brands(5, mean_mentions=5, seed=4)
+    src, out = str(tmp_path / "in.jsonl"), str(tmp_path / "out.csv")
+    _write_input(src, brands)
+    with open(out, "w") as f:
+        f.write("stale,output,of,an,earlier,run\n")
+    assert bulk_score(src, out, workers=1, offset=2, as_of=AS_OF, progress=None) == 4
+    rows = open(out).read().splitlines()
+    assert len(rows) == 5
+    assert rows[0] == "brand,presence,quality,diversity,geo_score,error"
+    assert rows[1].startswith(brands[2]["brand"] + ",")
+
+
+def test_bulk_score_reports_unscorable_payloads(tmp_path):
+    brands = make_brands(6, mean_mentions=4, seed=5)
+    bad = {"brand": "broken", "mentions": [{"source": "s", "last_seen": "garbage"}]}
+    src, out = str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl")
+    _write_input(src, brands[:3] + [bad, [1, 2]] + brands[3:])
+
+    assert bulk_score(src, out, workers=1, chunk_size=100, as_of=AS_OF, progress=None) == len(brands) + 3
+    got = [json.loads(line) for line in open(out)]
+    assert [g["brand"] for g in got[:3] + got[5:8]] == [b["brand"] for b in brands]
+    assert got[3]["brand"] == "broken" and "invalid payload" in got[3]["error"]
+    assert got[4]["brand"] is None and "invalid payload" in got[4]["error"]
+    expected = compute_geo_scores_batch(brands, as_of=AS_OF)
+    for g, e in zip(got[:3] + got[5:8], expected):
+        assert np.isclose(g["geo_score"], e["geo_score"], atol=1e-12, equal_nan=True)
+
+
+def test_bulk_score_resumes_csv_by_records_after_offset(tmp_path):
+    brands = make_brands(10, mean_mentions=4, seed=6)
+    brands[3]["brand"] = "Acme\nDental, \"Inc\""
+    src, out, full = str(tmp_path / "in.jsonl"), str(tmp_path / "out.csv"), str(tmp_path / "full.csv")
+    _write_input(src, brands)
+    bulk_score(src, full, workers=1, offset=2, as_of=AS_OF, progress=None)
+
+    # Interrupted after 4 records (one of them spanning two lines), mid-way through the 5th
+    text = open(full, newline="").read()
+    cut = text.index(brands[6]["brand"]) + 3
+    with open(out, "w", newline="") as f:
+        f.write(text[:cut])
+    bulk_score(src, out, workers=1, offset=2, resume=True, as_of=AS_OF, progress=None)
+    assert open(out, newline="").read() == text
@@ -0,0 +1,48 @@
+import numpy as np
+from datetime import datetime
+from aether.core.metrics import (
+    compute_presence_score,
+    compute_quality_score,
+    compute_diversity_score,
+)
+from aether.core.normalizers import normalize_frame, normalize_frames, normalize_input
+from benchmarks.synthetic import make_brands
+
+AS_OF = datetime(2026, 1, 1)
+
+
+def test_metrics_accept_mention_frames():
+    brand = make_brands(1, mean_mentions=50, seed=5)[0]
+    frame = normalize_frame(brand)
+    data = normalize_input(brand)
+    assert frame.text is None
+    assert np.isclose(
+        compute_presence_score(frame, as_of=AS_OF), compute_presence_score(data, as_of=AS_OF)
+    )
+    assert np.isclose(compute_quality_score(frame), compute_quality_score(data), atol=1e-6)
+    assert np.isclose(compute_diversity_score(frame), compute_diversity_score(data))
+
+
+def test_frame_brand_views():
+    brands = make_brands(5, mean_mentions=10, seed=6)
+    frame = normalize_frames(brands, keep_text=True)
+    assert frame.n_brands == 5
+    for i, raw in enumerate(brands):
+        view = frame.brand(i)
+        assert view.brands == [raw["brand"]]
+        assert len(view) == len(raw["mentions"])
+        assert view.text == [m["text"] for m in raw["mentions"]]
+        assert len(view.surface) == sum(len(m["surface_area"]) for m in raw["mentions"])
+        assert np.shares_memory(view.accuracy, frame.accuracy) or len(view) == 0
+
+    empty = normalize_frame({})
+    assert len(empty) == 0 and empty.brands == ["UNKNOWN"]
+
+
+def test_columnar_mentions_match_rows():
+    brand = make_brands(1, mean_mentions=40, seed=9)[0]
+    fields = [f for f in brand["mentions"][0] if f != "text"]
+    columns = {f: [m[f] for m in brand["mentions"]] for f in fields}
+    rows, cols = normalize_frame(brand), normalize_frame({"brand": "b", "mentions": columns})
+    for name in rows.COLUMNS:
+        assert np.array_equal(getattr(rows, name), getattr(cols, name)), name
@@ -0,0 +1,66 @@
+import json
+import os
+import pytest
+from aether.core.geo import compute_geo_score, load_weights
+from aether.core.profiles import ProfileError, ProfileRegistry, VECTOR_KEYS
+
+WEIGHTS = """
+presence: 0.4
+quality: 0.35
+diversity: 0.25
+presence_weights: {frequency: 0.4, systems: 0.3, surfaces: 0.2, recency: 0.1}
+quality_weights: {accuracy: 0.35, authority: 0.35, completeness: 0.25, redundancy: -0.05}
+diversity_weights: {topics: 0.4, personas: 0.35, ontologies: 0.25}
+profiles:
+  quality_only: {presence: 0, quality: 1, diversity: 0}
+"""
+
+
+def write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_registry_compiles_named_profiles(tmp_path):
+    path = tmp_path / "weights.yaml"
+    write(path, WEIGHTS, 1_000_000_000)
+    registry = ProfileRegistry(str(path), check_interval=0)
+
+    assert registry.names() == ["default", "quality_only"]
+    default = registry.get()
+    assert len(default.vector) == len(VECTOR_KEYS)
+    assert registry.get("quality_only").components["quality"] == 1.0
+    assert registry.get("quality_only").quality_weights == default.quality_weights
+
+    with open("tests/demo_data.json", "r") as f:
+        data = json.load(f)
+    score = compute_geo_score(data, profile=registry.get("quality_only"))
+    assert score["geo_score"] == pytest.approx(score["quality"])
+
+
+def test_registry_reloads_on_mtime_change(tmp_path):
+    path = tmp_path / "weights.yaml"
+    write(path, WEIGHTS, 1_000_000_000)
+    registry = ProfileRegistry(str(path), check_interval=0)
+    first = registry.get()
+    fingerprint = registry.fingerprint()
+
+    assert registry.get() is first
+    write(path, WEIGHTS.replace("presence: 0.4", "presence: 0.5"), 2_000_000_000)
+    assert registry.get().components["presence"] == 0.5
+    assert registry.fingerprint() != fingerprint
+
+    # A broken edit keeps the last good profiles
+    write(path, WEIGHTS.replace("recency: 0.1", "recency: high"), 3_000_000_000)
+    assert registry.get().components["presence"] == 0.5
+
+
+def test_invalid_profile_rejected(tmp_path):
+    path = tmp_path / "weights.yaml"
+    write(path, WEIGHTS.replace("systems: 0.3, ", ""), 1_000_000_000)
+    with pytest.raises(ProfileError):
+        ProfileRegistry(str(path)).get()
+
+
+def test_load_weights_matches_file():
+    assert load_weights()["presence_weights"]["frequency"] == 0.4
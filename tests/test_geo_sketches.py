@@ -0,0 +1,53 @@
+import json
+import pytest
+from datetime import datetime
+from aether.core.geo import compute_geo_score
+from aether.core.sketches import HyperLogLog, SpaceSaving
+
+AS_OF = datetime(2026, 1, 1)
+
+
+def test_sketch_mode_is_exact_for_small_brands():
+    with open("tests/demo_data.json", "r") as f:
+        data = json.load(f)
+    exact = compute_geo_score(data, as_of=AS_OF)
+    approx = compute_geo_score(data, as_of=AS_OF, sketch=True)
+    for key in ("presence", "quality", "diversity", "geo_score"):
+        assert approx[key] == pytest.approx(exact[key], abs=1e-6)
+
+
+def test_hyperloglog_error_bound():
+    hll = HyperLogLog(precision=12)
+    for i in range(50_000):
+        hll.add(f"value-{i}")
+    assert hll.estimate() == pytest.approx(50_000, rel=0.05)
+
+
+def test_space_saving_keeps_heavy_hitters():
+    ss = SpaceSaving(capacity=16)
+    for i in range(10_000):
+        ss.add("hot" if i % 3 == 0 else f"cold-{i}")
+    value, count = ss.top(1)[0]
+    assert value == "hot"
+    assert count - ss.errors["hot"] <= 3334 <= count
+
+
+def test_sketch_mode_matches_exact_mode_on_unusual_values():
+    with open("tests/demo_data.json", "r") as f:
+        data = json.load(f)
+    mentions = data["mentions"]
+    odd = [
+        {**mentions[0], "source": 1, "persona": ["dentist", "buyer"], "last_seen": "2025-11-03T10:00:00Z"},
+        {**mentions[0], "source": "1", "surface_area": [["nested"], "faq"], "last_seen": "2025-12-31T23:30:00+02:00"},
+        {**mentions[0], "source": 1.0, "ontology": {"kind": "product"}},
+    ]
+    data = {**data, "mentions": mentions + odd}
+    exact = compute_geo_score(data, as_of=AS_OF)
+    approx = compute_geo_score(data, as_of=AS_OF, sketch=True)
+    for key in ("presence", "quality", "diversity", "geo_score"):
+        assert approx[key] == pytest.approx(exact[key], abs=1e-6), key
+
+    hll = HyperLogLog()
+    for value in (1, "1", 1.0, True, "x"):
+        hll.add(value)
+    assert hll.estimate() == 3
@@ -0,0 +1,34 @@
+import numpy as np
+from datetime import datetime
+from aether.core.geo import compute_geo_score
+from aether.core.stream import StreamingScorer
+from benchmarks.synthetic import make_brands
+
+AS_OF = datetime(2026, 1, 1, 13, 5)
+
+
+def test_streaming_scorer_matches_full_recompute():
+    for raw in make_brands(4, mean_mentions=60, seed=8) + [{"brand": "empty", "mentions": []}]:
+        expected = compute_geo_score(raw, as_of=AS_OF)
+        for chunk_size in (1, 7, 10_000):
+            scorer = StreamingScorer(raw["brand"], as_of=AS_OF, chunk_size=chunk_size)
+            scorer.extend(raw["mentions"])
+            got = scorer.score()
+            for key in ("presence", "quality", "diversity", "geo_score"):
+                assert np.isclose(got[key], expected[key], atol=1e-9, equal_nan=True), key
+
+
+def test_streaming_scorer_memory_is_independent_of_interned_categories(monkeypatch):
+    from aether.core.interning import CategoryTable
+    from aether.core.normalizers import DEFAULT_TABLES
+
+    # A crowded shared persona table, swapped in for this test only
+    personas = CategoryTable("persona")
+    personas.encode(f"stream-test-persona-{i}" for i in range(50_000))
+    monkeypatch.setitem(DEFAULT_TABLES, "persona", personas)
+    before = len(personas)
+    scorer = StreamingScorer("acme", as_of=AS_OF)
+    scorer.extend([{"source": "s", "surface_area": ["faq"], "persona": "never-seen-before"}] * 3)
+    assert scorer.score()["brand"] == "acme"
+    assert all(counts.size <= 1 for counts in scorer.counts.values())
+    assert len(personas) == before
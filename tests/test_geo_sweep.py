@@ -0,0 +1,35 @@
+import numpy as np
+from datetime import datetime
+from aether.core.batch import compute_geo_scores_batch
+from aether.core.profiles import ProfileRegistry
+from aether.core.sweep import ComponentMatrix, simplex_grid, sweep
+from benchmarks.synthetic import make_brands
+
+AS_OF = datetime(2026, 1, 1)
+
+
+def test_sweep_matches_rescoring(tmp_path):
+    brands = make_brands(60, mean_mentions=12, seed=11) + [{"brand": "empty", "mentions": []}]
+    matrix = ComponentMatrix.from_payloads(brands, as_of=AS_OF, chunk_size=25)
+    path = str(tmp_path / "components.npz")
+    matrix.save(path)
+    matrix = ComponentMatrix.load(path)
+    assert matrix.brands == [b["brand"] for b in brands]
+
+    grid = simplex_grid(0.25)
+    assert len(grid) == 15 and np.allclose(grid.sum(axis=1), 1)
+    weights = np.vstack([matrix.baseline, grid])
+    result = sweep(matrix, weights, top_k=5, block_size=4)
+
+    assert result["rank_corr"][0] == 1.0 and result["top_overlap"][0] == 1.0
+    assert np.all(result["rank_corr"] <= 1.0)
+
+    # Candidate 7 must rank brands exactly like a full rescore with its weights;
+    # a private registry keeps the profile out of the shared one
+    w = dict(zip(("presence", "quality", "diversity"), weights[7]))
+    profile = ProfileRegistry().register("sweep-test", w)
+    rescored = compute_geo_scores_batch(brands, as_of=AS_OF, profile=profile)
+    scores = np.array([r["geo_score"] for r in rescored])
+    best = np.argsort(-np.nan_to_num(scores, nan=-np.inf))[:5]
+    assert np.allclose(scores[result["top"][7]], scores[best])
+    assert len(brands) - 1 not in result["top"]
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from knowledge_graph_builder import cooccurrence
+from knowledge_graph_builder.agent import KnowledgeGraphBuilder
+from knowledge_graph_builder.cooccurrence import CooccurrenceGraph, window_pairs
+
+
+def test_build_graph_links_adjacent_entities_by_default():
+    graph = KnowledgeGraphBuilder().build_graph(["a", "b", "c", "a"])
+    assert graph == {"a": {"b", "c"}, "b": {"a", "c"}, "c": {"a", "b"}}
+    assert KnowledgeGraphBuilder().build_graph(["solo"]) == {"solo": set()}
+    assert KnowledgeGraphBuilder().build_graph([]) == {}
+
+
+def test_window_pairs_matches_brute_force():
+    positions = np.array([0, 1, 1, 4, 9, 10, 12])
+    left, right = window_pairs(positions, 3)
+    expected = [(i, j) for i in range(7) for j in range(i + 1, 7) if positions[j] - positions[i] <= 3]
+    assert list(zip(left.tolist(), right.tolist())) == expected
+
+
+def test_window_counts_weighted_cooccurrences():
+    graph = CooccurrenceGraph()
+    graph.add_document(["acme", "kit", "acme", "brush"], positions=[0, 2, 5, 30], window=3)
+    assert graph.neighbors("acme") == {"kit": 2.0}
+    assert graph.neighbors("brush") == {}
+    assert graph.weight("kit", "acme") == 2.0 and graph.weight("acme", "brush") == 0.0
+    graph.add_document(["acme", "kit"], weight=0.5)
+    assert graph.weight("acme", "kit") == 2.5
+    assert graph.num_edges == 1 and list(graph.edges()) == [("acme", "kit", 2.5)]
+
+
+def test_unsorted_positions_are_sorted_with_their_entities():
+    graph = CooccurrenceGraph()
+    graph.add_document(["far", "b", "a"], positions=[100, 6, 5], window=1)
+    assert graph.to_dict() == {"far": set(), "b": {"a"}, "a": {"b"}}
+
+
+def test_merge_sums_weights_across_id_spaces():
+    first, second = KnowledgeGraphBuilder(window=2), KnowledgeGraphBuilder(window=2)
+    first.add_document(["a", "b", "c"])
+    second.add_document(["d", "c", "b"])
+    first.merge(second)
+    graph = first.graph
+    assert graph.weight("b", "c") == 2.0
+    assert graph.weight("a", "c") == 1.0 and graph.weight("d", "b") == 1.0
+    assert graph.weight("a", "d") == 0.0
+    assert len(graph) == 4 and graph.num_edges == 5
+
+
+def test_buffer_compacts_automatically(monkeypatch):
+    monkeypatch.setattr(cooccurrence, "COMPACT_EVERY", 10)
+    graph = CooccurrenceGraph()
+    for _ in range(20):
+        graph.add_document(["a", "b", "c"], window=2)
+    assert graph._buffered < 10
+    assert graph.weight("a", "c") == 20.0
+
+
+def test_matches_dict_of_sets_on_random_documents():
+    rng = np.random.default_rng(0)
+    builder = KnowledgeGraphBuilder(window=3)
+    expected = {}
+    for _ in range(50):
+        doc = [f"e{i}" for i in rng.integers(0, 40, size=30)]
+        builder.add_document(doc)
+        for i, a in enumerate(doc):
+            expected.setdefault(a, set())
+            for b in doc[i + 1:i + 4]:
+                expected[a].add(b)
+                expected.setdefault(b, set()).add(a)
+    assert builder.graph.to_dict() == expected
+
+
+def test_save_and_load(tmp_path):
+    builder = KnowledgeGraphBuilder(window=2)
+    builder.add_document(["a", "b", "c", "b"])
+    builder.graph.intern("isolated")
+    path = str(tmp_path / "graph.npz")
+    builder.save(path)
+    loaded = KnowledgeGraphBuilder.load(path, window=2)
+    assert loaded.graph.to_dict() == builder.graph.to_dict()
+    assert loaded.graph.weight("b", "c") == builder.graph.weight("b", "c") == 2.0
+    loaded.add_document(["c", "isolated"])
+    assert loaded.graph.neighbors("isolated") == {"c": 1.0}
+
+
+def test_save_and_load_tuple_ids(tmp_path):
+    graph = CooccurrenceGraph()
+    graph.add_document([("acme", 3), ("kit", 1), ("nested", ("a", 1)), ("acme", 3)], window=2)
+    path = str(tmp_path / "graph.npz")
+    graph.save(path)
+    loaded = CooccurrenceGraph.load(path)
+    assert loaded.ids == graph.ids and loaded.to_dict() == graph.to_dict()
+    assert loaded.weight(("acme", 3), ("kit", 1)) == 2.0
+
+    graph.intern(frozenset({"x"}))
+    with pytest.raises(TypeError):
+        graph.save(str(tmp_path / "bad.npz"))
+    assert not (tmp_path / "bad.npz").exists()
+
+
+def test_repeated_adjacent_entities_keep_self_loops():
+    # As the original dict-of-sets build_graph did
+    assert KnowledgeGraphBuilder().build_graph(["a", "a", "b"]) == {"a": {"a", "b"}, "b": {"a"}}
+    graph = CooccurrenceGraph()
+    graph.add_document(["a", "a", "b", "a"], window=3)
+    assert graph.weight("a", "a") == 3.0 and graph.weight("a", "b") == 3.0
+    assert graph.num_edges == 2 and list(graph.edges()) == [("a", "a", 3.0), ("a", "b", 3.0)]
+    merged = CooccurrenceGraph()
+    merged.merge(graph)
+    merged.merge(graph)
+    assert merged.weight("a", "a") == 6.0 and merged.num_edges == 2
+
+
+@pytest.mark.parametrize("entities", [[], ["x"]])
+def test_degenerate_documents(entities):
+    graph = CooccurrenceGraph()
+    graph.add_document(entities, window=5)
+    assert graph.num_edges == 0 and graph.to_dict() == {e: set() for e in entities}